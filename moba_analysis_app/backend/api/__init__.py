@@ -5,6 +5,8 @@ from .riot_api import router as riot_router
 from .champ_select import router as champ_select_router
 from .game_state import router as game_state_router
 from .pipeline import router as pipeline_router
+from .health import router as health_router
+from .events import router as events_router
 
 api_router = APIRouter()
 api_router.include_router(db_router)
@@ -12,4 +14,6 @@ api_router.include_router(video_router)
 api_router.include_router(riot_router)
 api_router.include_router(champ_select_router)
 api_router.include_router(game_state_router)
-api_router.include_router(pipeline_router)
\ No newline at end of file
+api_router.include_router(pipeline_router)
+api_router.include_router(health_router)
+api_router.include_router(events_router)
\ No newline at end of file
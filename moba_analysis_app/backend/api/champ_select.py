@@ -9,6 +9,8 @@
 # • GET  /api/champselect/wrappers      – list every available wrapper function
 # • POST /api/champselect/process       – run a *specific* wrapper
 # • POST /api/champselect/process/best  – opinionated “one-click” route
+# • POST /api/champselect/process/batch – run a wrapper over many screenshots
+#                                         and/or YouTube timestamps
 #
 # The heavy lifting is delegated to *services.live_game_analysis.champion_select
 # .champion_matcher* which dynamically exposes many wrappers named
@@ -25,10 +27,11 @@
 
 from __future__ import annotations
 
+import asyncio
 import cv2
 import numpy as np
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional
 
 from fastapi import (
     APIRouter,
@@ -39,6 +42,7 @@ from fastapi import (
 )
 
 from services.live_game_analysis.champion_select import champion_matcher as tm
+from services.video.frame_extractor import async_extract_frame
 
 router = APIRouter(prefix="/api/champselect", tags=["champ-select"])
 
@@ -46,6 +50,7 @@ router = APIRouter(prefix="/api/champselect", tags=["champ-select"])
 # Constants & shared helpers
 # ---------------------------------------------------------------------------–
 _MAX_SIZE = 10 * 1_024 * 1_024  # 10 MiB – hard limit for an uploaded screenshot
+_MAX_BATCH = 64                 # screenshots + timestamps accepted per batch
 
 RESULTS_DIR: Path = Path(__file__).resolve().parent / "results"
 RESULTS_DIR.mkdir(parents=True, exist_ok=True)
@@ -69,6 +74,17 @@ def _load_image(data: bytes) -> np.ndarray:
     return img
 
 
+def _parse_timestamps(raw: str) -> List[float]:
+    """``"12.5, 30,61"`` → ``[12.5, 30.0, 61.0]`` (raises `ValueError`)."""
+    try:
+        out = [float(t) for t in raw.replace(";", ",").split(",") if t.strip()]
+    except ValueError:
+        raise ValueError("timestamps must be comma-separated seconds.") from None
+    if any(t < 0 for t in out):
+        raise ValueError("timestamps must be non-negative.")
+    return out
+
+
 def _get_wrapper(name: str):
     """
     Return the *callable* matching `name` or raise `KeyError`.
@@ -122,6 +138,12 @@ async def process_champ_select(
         False,
         description="Store every visual evidence produced by the wrapper",
     ),
+    shortlist_k: int = Form(
+        0,
+        ge=0,
+        description="Colour-histogram pre-filter: feature-match only the K closest "
+        "champions per slot (0 = disabled, match against every champion)",
+    ),
 ):
     try:
         frame = _load_image(await file.read())
@@ -129,7 +151,10 @@ async def process_champ_select(
         roi_tpl = tm.load_roi_template(roi_name)
 
         kwargs = dict(save_root=RESULTS_DIR, tag=wrapper) if store_evidence else {}
-        result = fn(frame, roi_template=roi_tpl, ref_src=ref_src, **kwargs)
+        result = fn(
+            frame, roi_template=roi_tpl, ref_src=ref_src,
+            shortlist_k=shortlist_k or None, **kwargs,
+        )
 
     except KeyError as exc:
         raise HTTPException(status_code=404, detail=str(exc))
@@ -143,6 +168,7 @@ async def process_champ_select(
         "ref_src": ref_src.value,
         "roi": roi_name,
         "stored": store_evidence,
+        "shortlist_k": shortlist_k or None,
         "result": result,
         "status": "ok",
     }
@@ -193,3 +219,91 @@ async def process_best_champ_select(
         "result": result,
         "status": "ok",
     }
+
+
+@router.post(
+    "/process/batch",
+    summary="Run a wrapper over many frames",
+    description=(
+        "Execute the chosen *champ-select* wrapper over several uploaded "
+        "screenshots and/or frames extracted from **youtube_url** at the "
+        "given **timestamps** (comma-separated seconds).  Every frame reuses "
+        "the same in-memory reference index; one failing frame does not "
+        "abort the batch."
+    ),
+)
+async def process_champ_select_batch(
+    files: List[UploadFile] = File(
+        default=[], description="Champion-select screenshots (PNG / JPEG)"
+    ),
+    wrapper: str = Form(..., description="Exact wrapper name obtained from `/wrappers`"),
+    youtube_url: Optional[str] = Form(
+        None, description="Video to extract frames from (requires `timestamps`)"
+    ),
+    timestamps: str = Form(
+        "", description="Comma-separated video positions in seconds, e.g. `95,97.5,100`"
+    ),
+    ref_src: tm.ReferenceSource = Form(
+        tm.ReferenceSource.ICONS,
+        description="Image source used by the matcher (icons / splash arts / loading screens)",
+    ),
+    roi_name: str = Form(
+        "champ_select_rois",
+        description="ROI template without the .json extension",
+    ),
+    shortlist_k: int = Form(
+        0,
+        ge=0,
+        description="Colour-histogram pre-filter (0 = disabled), see `/process`",
+    ),
+):
+    try:
+        fn = _get_wrapper(wrapper)
+        roi_tpl = tm.load_roi_template(roi_name)
+        times = _parse_timestamps(timestamps)
+        if times and not youtube_url:
+            raise ValueError("timestamps require youtube_url.")
+        if not files and not times:
+            raise ValueError("Provide at least one screenshot or timestamp.")
+        if len(files) + len(times) > _MAX_BATCH:
+            raise ValueError(f"At most {_MAX_BATCH} frames per batch.")
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    except (ValueError, FileNotFoundError) as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    def _run(frame: np.ndarray) -> Dict[str, List[str]]:
+        return fn(frame, roi_template=roi_tpl, ref_src=ref_src, shortlist_k=shortlist_k or None)
+
+    results: List[Dict[str, Any]] = []
+
+    for up in files:
+        entry: Dict[str, Any] = {"source": up.filename}
+        try:
+            frame = _load_image(await up.read())
+            entry.update(result=await asyncio.to_thread(_run, frame), status="ok")
+        except Exception as exc:
+            entry.update(result=None, status="error", detail=str(exc))
+        results.append(entry)
+
+    for t in times:
+        entry = {"source": t}
+        try:
+            fpath = await async_extract_frame(youtube_url, t)
+            frame = cv2.imread(str(fpath))
+            if frame is None:
+                raise RuntimeError("Could not read the extracted frame")
+            entry.update(result=await asyncio.to_thread(_run, frame), status="ok")
+        except Exception as exc:
+            entry.update(result=None, status="error", detail=str(exc))
+        results.append(entry)
+
+    return {
+        "wrapper": wrapper,
+        "ref_src": ref_src.value,
+        "roi": roi_name,
+        "shortlist_k": shortlist_k or None,
+        "frames": len(results),
+        "results": results,
+        "status": "ok",
+    }
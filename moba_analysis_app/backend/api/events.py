@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# api/events.py
+# ---------------------------------------------------------------------------–
+# Live event stream (Server-Sent Events).
+#
+# End-points
+# ----------
+# • **GET /api/events/stream[?match=<title|slug>]** → `text/event-stream`
+#   of every write as it happens:
+#
+#     event: start     – match created (draft, revision)
+#     event: snapshot  – snapshot merged  {timer, revision, data}
+#     event: end       – match finished   {winner, last_timer, revision}
+#     event: job       – worker job status {status, time, …}
+#     event: resync    – events were lost: re-read the match
+#
+#   Without `match` every match is streamed.  Reconnecting browsers send
+#   `Last-Event-ID` and receive what they missed (`resync` when the id
+#   came from another server process).
+# • **GET /api/events/stats** → subscriber / event counters
+#
+# Fan-out happens in `core.events`: one encode per event, whatever the
+# number of viewers.
+# ---------------------------------------------------------------------------–
+
+from __future__ import annotations
+
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Header, Query, Request
+from fastapi.responses import StreamingResponse
+
+from core import events
+from services.live_game_analysis.game_state.game_state_service import match_slug
+
+router = APIRouter(prefix="/api/events", tags=["events"])
+
+_HEARTBEAT = 15.0                     # s – keeps proxies from closing idle streams
+
+# ---------------------------------------------------------------------------–
+# Routes
+# ---------------------------------------------------------------------------–
+@router.get("/stream", summary="Live snapshots, job status and end-of-game events (SSE)")
+async def stream(
+    request: Request,
+    match: str | None = Query(None, description="Match title or slug; every match if omitted"),
+    last_event_id: str | None = Header(None, alias="Last-Event-ID"),
+) -> StreamingResponse:
+    slug = match_slug(match) if match else None
+
+    async def body() -> AsyncIterator[bytes]:
+        async with events.subscribe(slug, last_event_id) as sub:
+            yield b"retry: 3000\n\n"
+            while not await request.is_disconnected():
+                frame = await sub.get(_HEARTBEAT)
+                yield frame if frame is not None else b": ping\n\n"
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/stats", summary="Live-stream counters")
+async def stream_stats() -> dict:
+    return events.stats()
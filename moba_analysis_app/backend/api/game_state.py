@@ -17,18 +17,25 @@
 from __future__ import annotations
 
 import traceback
+from email.utils import formatdate, parsedate_to_datetime
 from pathlib import Path
 from typing import Any, Dict, List
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, ConfigDict, Field
 
 # ─────────────────────── Game-state low-level service ──────────────────────
+from services.live_game_analysis.game_state.encoded import ENCODINGS, negotiate
 from services.live_game_analysis.game_state.game_state_service import (
     add_or_update_snapshot,
     end_game,
-    get_all_game_states,
     get_game_state,
+    get_game_state_body,
+    get_resampled,
+    get_revision,
+    get_snapshots_since,
+    list_matches,
     start_game,
 )
 # ─────────────────────── Visualisation high-level service ──────────────────
@@ -121,6 +128,45 @@ def _match_folder(title: str) -> Path:
     """
     return _MATCHES_ROOT / title
 
+
+def _encoded_etag(etag: str, encoding: str) -> str:
+    """ETag of one content coding of a revision: `"<tag>"`, `"<tag>-gzip"`, `"<tag>-br"`."""
+    return etag if encoding == "identity" else f'{etag[:-1]}-{encoding}"'
+
+
+def _not_modified(request: Request, etag: str, modified: float) -> str | None:
+    """
+    Conditional-GET check (`If-None-Match` wins over `If-Modified-Since`).
+    Any coding of *etag* matches; returns the ETag the 304 should carry
+    (the one the client holds), *None* when the body must be sent.
+    """
+    inm = request.headers.get("if-none-match")
+    if inm is not None:
+        if inm.strip() == "*":
+            return etag
+        variants = {_encoded_etag(etag, enc) for enc in ENCODINGS}
+        held = (t.strip().removeprefix("W/") for t in inm.split(","))
+        return next((t for t in held if t in variants), None)
+    ims = request.headers.get("if-modified-since")
+    if ims:
+        try:
+            if int(modified) <= parsedate_to_datetime(ims).timestamp():
+                return etag
+        except (TypeError, ValueError):
+            pass
+    return None
+
+
+def _metric_modes(items: List[str]) -> Dict[str, str]:
+    """``["health_pct:linear", …]`` → ``{"health_pct": "linear", …}``."""
+    out: Dict[str, str] = {}
+    for item in items:
+        metric, sep, mode = item.partition(":")
+        if not sep:
+            raise ValueError(f"Expected 'metric:mode', got '{item}'.")
+        out[metric.strip()] = mode.strip()
+    return out
+
 # =============================================================================
 # 2. Game-state CRUD routes
 # =============================================================================
@@ -173,31 +219,122 @@ async def end_endpoint(p: EndReq):
     }
 
 
-@router.get("/all", summary="List every stored match")
-async def get_all_matches_endpoint():
+@router.get("/all", summary="List stored matches (paginated summaries)")
+async def get_all_matches_endpoint(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=500),
+    full: bool = Query(False, description="Embed every full game-state of the page"),
+):
     """
-    Return all `game_state.json` files found under *matches_history/*.
+    Return one page of match summaries, keyed by slug – teams, draft,
+    snapshot count, last timer, winner, modification time / size – read
+    from the match manifest.  Full timelines are fetched per match through
+    `GET /{match_title}` (or embedded with `full=true`).
     """
     try:
-        return {"matches": get_all_game_states()}
+        total, items = list_matches((page - 1) * page_size, page_size)
+        matches: Dict[str, Any] = {m["slug"]: m for m in items}
+        if full:
+            matches = {slug: get_game_state(slug) for slug in matches}
+        return {"matches": matches, "page": page, "page_size": page_size, "total": total}
     except Exception as exc:                       # pragma: no cover
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
 
 @router.get("/{match_title}", summary="Fetch the game-state of one match")
-async def get_match_endpoint(match_title: str):
+async def get_match_endpoint(
+    match_title: str,
+    request: Request,
+    since: str | None = Query(None, pattern=r"^\d{1,3}:\d{2}$", description="Only frames after this timer"),
+    since_revision: str | None = Query(None, description="Only frames written after this revision"),
+):
     """
     Fetch a single game-state; 404 if the match folder does not exist.
+
+    Responses carry an `ETag` (the match revision, suffixed with the
+    content coding – `"…-gzip"`, `"…-br"` – for compressed bodies) and
+    `Last-Modified`; a matching `If-None-Match` / `If-Modified-Since`
+    gets an empty 304.
+    With `since` or `since_revision` only the new or changed
+    `live_game_info` entries are returned (`"partial": true`); an unknown
+    revision falls back to the full state.  Full states are served from
+    bytes cached per revision, gzip / brotli-compressed when the client
+    accepts it (`Accept-Encoding`).
     """
     try:
-        state = get_game_state(match_title)
+        rev = get_revision(match_title)                # before reading: never newer than the data
+        headers = {
+            "ETag": rev.etag,
+            "Last-Modified": formatdate(rev.modified, usegmt=True),
+            "Cache-Control": "no-cache",
+        }
+        held = _not_modified(request, rev.etag, rev.modified)
+        if held is not None:
+            headers.update({"ETag": held, "Vary": "Accept-Encoding"})
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        delta = None
+        if since is not None or since_revision is not None:
+            delta = get_snapshots_since(match_title, since=since, since_revision=since_revision)
+        if delta is None:
+            # full read: cached bytes of this revision, no parse / re-encode
+            rev, content, encoding = get_game_state_body(
+                match_title, negotiate(request.headers.get("accept-encoding")),
+            )
+            # one strong ETag per coding: the bodies differ byte for byte
+            headers.update({"ETag": _encoded_etag(rev.etag, encoding),
+                            "Last-Modified": formatdate(rev.modified, usegmt=True),
+                            "Vary": "Accept-Encoding"})
+            if encoding != "identity":
+                headers["Content-Encoding"] = encoding
+            return Response(content, media_type="application/json", headers=headers)
+        body = {"match": match_title, "revision": rev.tag, "partial": True, "live_game_info": delta}
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Match not found")
+    except Exception as exc:                       # pragma: no cover
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    return JSONResponse(body, headers=headers)
+
+@router.get("/{match_title}/resampled", summary="Timeline on a fixed time grid")
+async def get_resampled_endpoint(
+    match_title: str,
+    request: Request,
+    step: int = Query(10, ge=1, le=600, description="Grid step in seconds"),
+    how: str = Query("ffill", pattern=r"^(ffill|linear)$", description="Gap filling for every metric"),
+    per_metric: List[str] = Query([], description="Overrides such as `health_pct:linear`"),
+    start: int | None = Query(None, ge=0, description="First grid second (default: first snapshot)"),
+    end: int | None = Query(None, ge=0, description="Last grid second (default: last snapshot)"),
+    layout: str = Query("columns", pattern=r"^(columns|frames)$"),
+):
+    """
+    Resample the snapshots – reported at irregular timers, wherever OCR
+    succeeded – to one value every `step` seconds, forward-filled or
+    linearly interpolated per metric.  `layout=columns` returns
+    `{"seconds": [...], "data": {metric: {team: {role: [...]}}}}` (`null`
+    for gaps), `layout=frames` regular `MM:SS` frames.  Cached per match
+    revision; the same `ETag` / 304 handling as `GET /{match_title}`.
+    """
+    try:
+        rev = get_revision(match_title)
+        headers = {"ETag": rev.etag, "Cache-Control": "no-cache"}
+        if _not_modified(request, rev.etag, rev.modified) is not None:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        body = get_resampled(
+            match_title, step, how=how,
+            per_metric=_metric_modes(per_metric),
+            start=start, end=end, layout=layout,
+        )
+        headers["ETag"] = f'"{body["revision"]}"'
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Match not found")
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     except Exception as exc:                       # pragma: no cover
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(exc)) from exc
-    return {"match": match_title, "game_state": state}
+    return JSONResponse(body, headers=headers)
 
 # =============================================================================
 # 3. Visualisation routes
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# api/health.py
+# ---------------------------------------------------------------------------–
+# Liveness / readiness probes.
+#
+# End-points
+# ----------
+# • **GET /health/live**   → 200 as soon as the process serves HTTP
+# • **GET /health/ready**  → 200 once the background warm-up has finished,
+#                            503 (with the per-step progress) before that
+#
+# A warm-up step that failed does not block readiness – the affected cache
+# is then initialised lazily by the first request – but it is reported as
+# ``"degraded": true``.
+# ---------------------------------------------------------------------------–
+
+from __future__ import annotations
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from core.warmup import readiness
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+# ---------------------------------------------------------------------------–
+# Routes
+# ---------------------------------------------------------------------------–
+@router.get("/live", summary="Liveness probe")
+async def live() -> dict:
+    return {"alive": True}
+
+
+@router.get(
+    "/ready",
+    summary="Readiness probe",
+    response_description="Warm-up progress; HTTP 503 until every step has run.",
+)
+async def ready() -> JSONResponse:
+    body = readiness()
+    return JSONResponse(body, status_code=200 if body["ready"] else 503)
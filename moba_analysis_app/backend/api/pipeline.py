@@ -4,10 +4,13 @@
 # High–level “pipeline” endpoints that orchestrate *both* phases of live-game
 # analysis:
 #
-#   1.  **/startChampionSelect** – grab one YouTube frame, detect the five
-#       champions per side, and create the initial *game_state.json*.
+#   1.  **/startChampionSelect** – grab one YouTube frame (or scan a window of
+#       frames until the draft is stable), detect the five champions per
+#       side, and create the initial *game_state.json*.
 #   2.  **/processMainGame**     – enqueue a frame-processing job that runs
 #       health / mana / OCR detection in the background worker.
+#   3.  **/metrics**             – per-match worker counters (processed
+#       frames, errors and frames skipped by the HUD gate, by reason).
 #
 # The heavy CV / OCR work is delegated to specialised services; this file is
 # a thin FastAPI façade in charge of request validation, short I/O and queue
@@ -16,7 +19,7 @@
 from __future__ import annotations
 
 import asyncio, hashlib, re, traceback
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import cv2
 from fastapi import APIRouter, HTTPException, status
@@ -28,11 +31,14 @@ from services.live_game_analysis.champion_select.champion_matcher import (
     process_champion_select_ORB_resize_none as detect_champs,
     ReferenceSource,
 )
+from services.live_game_analysis.champion_select.champion_select_tracker import (
+    ChampionSelectTracker,
+)
 from services.live_game_analysis.game_state.game_state_service import (
     Role,
     start_game,
 )
-from core.worker import ensure_worker_started, queue
+from core.worker import enqueue, ensure_worker_started, worker_metrics
 
 router = APIRouter(prefix="/api/pipeline", tags=["pipeline"])
 
@@ -93,6 +99,17 @@ class StartCSReq(BaseModel):
         return self.minute * 60 + self.second
 
 
+class StartChampionSelectReq(StartCSReq):
+    """
+    *StartCSReq* plus an optional scan window: with ``scan_seconds > 0`` the
+    draft is tracked from ``minute:second`` onwards, one frame every
+    ``scan_step`` seconds, until every slot is stable.
+    """
+    scan_seconds: float = Field(0, ge=0, le=300, description="Scan window length – seconds (0 = single frame)")
+    scan_step: float = Field(2.0, gt=0, le=30, description="Distance between scanned frames – seconds")
+    stable_frames: int = Field(3, ge=1, le=20, description="Identical matches needed to lock a slot")
+
+
 class StartCSResp(BaseModel):
     """
     Successful response for **POST /startChampionSelect**.
@@ -101,6 +118,8 @@ class StartCSResp(BaseModel):
     match_title: str
     frame_file: str
     champions: Dict[str, List[str]]
+    frames_scanned: int = 1
+    locked_at: Optional[float] = None          # video second the draft locked (scan only)
 
 
 class ProcessMainGameResp(BaseModel):
@@ -120,30 +139,52 @@ class ProcessMainGameResp(BaseModel):
     status_code=status.HTTP_201_CREATED,
     summary="Detect champions and create the initial game-state",
 )
-async def start_champion_select_ep(p: StartCSReq):
+async def start_champion_select_ep(p: StartChampionSelectReq):
     """
     * Blocking   : **yes** (frame download + CV matching)  
     * Side-effect: creates ``game_state.json`` with a *startGame* snapshot.
 
     Workflow
     --------
-    1.  Extract one frame at the requested timestamp.
+    1.  Extract one frame at the requested timestamp – or, with a scan
+        window, feed successive frames to a :class:`ChampionSelectTracker`
+        until all ten slots are locked (best guess if the window ends first).
     2.  Run champion-select detection (ORB, no resizing).
     3.  Derive team names from the video title.
     4.  Call :pyfunc:`services.live_game_analysis.game_state.start_game`.
     """
     try:
-        # 1) download frame
-        fpath = await async_extract_frame(str(p.youtube_url), p.time_pos)
-
-        # 2) detection must run in a thread – OpenCV is CPU-bound
-        def _detect() -> Dict[str, List[str]]:
-            frame = cv2.imread(str(fpath))
+        # 1 + 2) download frame(s); detection runs in a thread – OpenCV is CPU-bound
+        def _read(path):
+            frame = cv2.imread(str(path))
             if frame is None:
                 raise RuntimeError("Could not read the extracted frame")
-            return detect_champs(frame, ref_src=ReferenceSource.SPLASH_ARTS)
-
-        champs = await asyncio.to_thread(_detect)
+            return frame
+
+        frames_scanned, locked_at = 1, None
+        if p.scan_seconds > 0:
+            tracker = ChampionSelectTracker(
+                "process_champion_select_ORB_resize_none",
+                stable_frames=p.stable_frames,
+                ref_src=ReferenceSource.SPLASH_ARTS,
+            )
+            t, end = p.time_pos, p.time_pos + p.scan_seconds
+            while True:
+                fpath = await async_extract_frame(str(p.youtube_url), t)
+                frame = _read(fpath)
+                await asyncio.to_thread(tracker.update, frame)
+                if tracker.complete:
+                    locked_at = t
+                    break
+                if t + p.scan_step > end:
+                    break
+                t += p.scan_step
+            champs, frames_scanned = tracker.draft, tracker.frames_seen
+        else:
+            fpath = await async_extract_frame(str(p.youtube_url), p.time_pos)
+            champs = await asyncio.to_thread(
+                lambda: detect_champs(_read(fpath), ref_src=ReferenceSource.SPLASH_ARTS)
+            )
 
         # 3) team names
         blue_name, red_name = _default_team_names(p.match_title)
@@ -164,6 +205,8 @@ async def start_champion_select_ep(p: StartCSReq):
         match_title=p.match_title,
         frame_file=fpath.name,
         champions=champs,
+        frames_scanned=frames_scanned,
+        locked_at=locked_at,
     )
 
 
@@ -181,7 +224,7 @@ async def process_main_game_ep(p: StartCSReq):
     try:
         await ensure_worker_started()  # starts the worker lazily
         frame_hash = hashlib.md5(f"{p.youtube_url}|{p.time_pos:.3f}".encode()).hexdigest()
-        await queue.put({"url": str(p.youtube_url), "time": p.time_pos, "match": p.match_title})
+        await enqueue({"url": str(p.youtube_url), "time": p.time_pos, "match": p.match_title})
     except Exception as exc:                               # pragma: no cover
         traceback.print_exc()
         raise HTTPException(500, detail=str(exc)) from exc
@@ -191,3 +234,13 @@ async def process_main_game_ep(p: StartCSReq):
         match_title=p.match_title,
         frame_file=f"{frame_hash}.jpg",
     )
+
+
+@router.get(
+    "/metrics",
+    summary="Per-match worker counters",
+    response_description="``{match: {processed, errors, skipped: {reason: n}}}``",
+)
+async def worker_metrics_ep() -> Dict[str, Dict[str, object]]:
+    """Frames processed, failed and skipped (by reason) since the server started."""
+    return worker_metrics()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+core/events.py
+==============
+
+In-process **publish / subscribe** hub behind the live event stream
+(``GET /api/events/stream``).
+
+Producers – the game-state service (match started, snapshot accepted,
+match ended) and the main-game worker (job status) – call
+:func:`publish`.  Each event is serialised to its Server-Sent-Events frame
+**once**; fan-out then only hands the same ``bytes`` object to every
+subscriber's bounded queue, so hundreds of viewers cost one encode plus
+one ``put_nowait`` each.
+
+Subscribers follow one match (by slug) or every match.  A viewer that
+falls more than ``EVENTS_QUEUE`` events behind is not allowed to slow the
+others down: its backlog is dropped and replaced by a single ``resync``
+event (clients then re-read the match, e.g. with ``since_revision``).
+The last ``EVENTS_REPLAY`` events are kept so a reconnecting client
+(``Last-Event-ID``) receives what it missed, or ``resync`` if that is too
+far back.
+
+Event ids are ``<epoch>-<n>``: *n* counts up within this process and
+*epoch* is drawn once at start-up.  An id from another process – a
+restarted server, or another worker behind the same load balancer – means
+nothing here, so it is answered with ``resync`` instead of a replay that
+would skip or repeat events.
+
+Environment
+-----------
+EVENTS_QUEUE    – per-subscriber backlog (default 256)
+EVENTS_REPLAY   – events kept for reconnections (default 512)
+
+Public helpers
+--------------
+publish(kind, match, data)   – thread-safe; fan-out is skipped without viewers
+subscribe(match=None, last_event_id=None)
+                             – async context manager yielding a Subscription;
+                               *last_event_id* is the raw header value
+stats()                      – subscriber / event counters
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Set
+
+from services.live_game_analysis.game_state.game_state_service import add_listener
+
+# Configuration -------------------------------------------------------------
+_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE", 256))
+_REPLAY     = int(os.getenv("EVENTS_REPLAY", 512))
+
+# Types ---------------------------------------------------------------------
+class Event:
+    """One published event and its pre-encoded SSE frame."""
+
+    __slots__ = ("id", "kind", "match", "frame")
+
+    def __init__(self, id: int, kind: str, match: str | None, data: Dict[str, Any]) -> None:
+        self.id, self.kind, self.match = id, kind, match          # id: sequence within _EPOCH
+        body = json.dumps({"match": match, **data}, ensure_ascii=False, separators=(",", ":"))
+        self.frame = f"id: {_EPOCH}-{id}\nevent: {kind}\ndata: {body}\n\n".encode()
+
+
+class Subscription:
+    """Bounded queue of SSE frames for one viewer."""
+
+    __slots__ = ("match", "queue")
+
+    def __init__(self, match: str | None) -> None:
+        self.match = match
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue(_QUEUE_SIZE)
+
+    def push(self, frame: bytes) -> None:
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            # too slow: drop the backlog, tell the client to re-read the match
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(_resync_frame())
+
+    async def get(self, timeout: float) -> bytes | None:
+        """Next frame, or *None* after *timeout* seconds (heartbeat time)."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+# Globals -------------------------------------------------------------------
+_EPOCH = f"{os.getpid():x}{time.time_ns():x}"  # this process' id namespace
+_ids = itertools.count(1)
+_lock = threading.Lock()                       # publish() may run off-loop
+_loop: asyncio.AbstractEventLoop | None = None
+_subs: Dict[str | None, Set[Subscription]] = {}    # match slug (None = all) → viewers
+_recent: Deque[Event] = deque(maxlen=_REPLAY)
+_published = 0
+
+
+# Internal helpers ----------------------------------------------------------
+def _resync_frame() -> bytes:
+    return f"event: resync\ndata: {json.dumps({'at': time.time()})}\n\n".encode()
+
+
+def _sequence(last_event_id: str) -> int | None:
+    """*n* of an ``<epoch>-<n>`` id issued by this process; *None* otherwise."""
+    epoch, _, n = last_event_id.strip().partition("-")
+    return int(n) if epoch == _EPOCH and n.isdigit() else None
+
+
+def _dispatch(ev: Event) -> None:
+    # runs on the event loop: asyncio.Queue is not thread-safe
+    for sub in (*_subs.get(ev.match, ()), *_subs.get(None, ())):
+        sub.push(ev.frame)
+
+
+# Public API ----------------------------------------------------------------
+def publish(kind: str, match: str | None, data: Dict[str, Any]) -> None:
+    """Broadcast ``kind`` for *match* (a slug) to its viewers; callable from any thread."""
+    global _published
+    with _lock:
+        ev = Event(next(_ids), kind, match, data)
+        _recent.append(ev)
+        _published += 1
+        loop = _loop
+    if loop is None or loop.is_closed() or not (_subs.get(match) or _subs.get(None)):
+        return
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        _dispatch(ev)
+    else:
+        loop.call_soon_threadsafe(_dispatch, ev)
+
+
+@asynccontextmanager
+async def subscribe(
+    match: str | None = None,
+    last_event_id: str | None = None,
+) -> AsyncIterator[Subscription]:
+    """Register a viewer of *match* (every match when *None*) for the block's duration."""
+    global _loop
+    _loop = asyncio.get_running_loop()
+    sub = Subscription(match)
+    with _lock:
+        if last_event_id is not None:
+            last = _sequence(last_event_id)
+            if last is None:
+                sub.push(_resync_frame())          # another process' id (or garbage)
+            else:
+                missed = [e for e in _recent if e.id > last and match in (None, e.match)]
+                if _recent and _recent[0].id > last + 1:
+                    sub.push(_resync_frame())      # part of the gap is gone
+                for e in missed:
+                    sub.push(e.frame)
+        _subs.setdefault(match, set()).add(sub)
+    try:
+        yield sub
+    finally:
+        with _lock:
+            viewers = _subs.get(match)
+            if viewers is not None:
+                viewers.discard(sub)
+                if not viewers:
+                    del _subs[match]
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        "subscribers": sum(len(s) for s in _subs.values()),
+        "matches": sorted(k for k in _subs if k is not None),
+        "published": _published,
+        "epoch": _EPOCH,
+    }
+
+
+# game-state writes (start / snapshot / end) go straight to the stream
+add_listener(publish)
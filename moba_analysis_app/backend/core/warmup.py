@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+core/warmup.py
+==============
+
+Background **warm-start** of the analysis caches.
+
+The first `/startChampionSelect` or `/processMainGame` after a restart
+used to pay for every one-off initialisation: reading the ROI templates,
+spawning Tesseract, decoding (or downloading) the reference artwork,
+building the descriptor index and training the per-thread detectors /
+FLANN matchers.  :func:`start_warmup` runs those steps once, in a worker
+thread, right after the server has bound its socket; requests arriving in
+the meantime are served normally and simply initialise what they need on
+their own (all caches involved are thread-safe).
+
+Progress is exposed through :func:`readiness` (see ``GET /health/ready``).
+
+Environment
+-----------
+WARMUP=0              – disable the warm-up (the server is reported ready)
+WARMUP_CHAMP_SELECT   – comma-separated ``<wrapper>:<source>`` pairs to
+                        prepare (default: the pipeline's ORB / splash arts);
+                        only the detectors of those wrappers get built
+
+Public helpers
+--------------
+start_warmup()   – idempotently launches the background task
+stop_warmup()    – cancels it (shutdown / tests)
+readiness()      – JSON-able progress report
+is_ready()       – *True* once every step has finished (successfully or not)
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+# Configuration -------------------------------------------------------------
+_FRAME_SIZE = (1920, 1080)            # broadcast resolution the ROI plans are compiled for
+_CHAMP_SELECT_DEFAULT = "process_champion_select_ORB_resize_none:splash_arts"
+
+# Globals -------------------------------------------------------------------
+_task: asyncio.Task[None] | None = None
+_state: Dict[str, Any] = {"enabled": True, "started": None, "finished": None, "steps": {}}
+
+# Steps ---------------------------------------------------------------------
+def _warm_roi_templates() -> str:
+    from services.live_game_analysis.roi_compiler import ROI_ROOT, get_roi_plan, load_template
+
+    names = sorted(p.stem for p in ROI_ROOT.glob("*.json"))
+    for name in names:
+        load_template(name)
+    for name in ("main_overlay_rois", "ocr_main_hud_rois"):
+        get_roi_plan(name, *_FRAME_SIZE)
+    return f"{len(names)} template(s)"
+
+
+def _warm_ocr() -> str:
+    # spawning the binary once makes a missing install show up here, not mid-match
+    import pytesseract
+
+    return f"tesseract {pytesseract.get_tesseract_version()}"
+
+
+def _champion_select_targets() -> List[Tuple[str, str]]:
+    spec = os.getenv("WARMUP_CHAMP_SELECT", _CHAMP_SELECT_DEFAULT)
+    out: List[Tuple[str, str]] = []
+    for item in filter(None, (s.strip() for s in spec.split(","))):
+        wrapper, _, source = item.partition(":")
+        out.append((wrapper, source or "icons"))
+    return out
+
+
+def _warm_champion_select() -> str:
+    from services.live_game_analysis.champion_select.champion_matcher import (
+        ReferenceSource,
+        warm_up,
+    )
+
+    done = [
+        f"{wrapper}/{source}: {warm_up(wrapper, ReferenceSource(source))} champions"
+        for wrapper, source in _champion_select_targets()
+    ]
+    return "; ".join(done) or "nothing to prepare"
+
+
+_STEPS: List[Tuple[str, Callable[[], str]]] = [
+    ("roi_templates",   _warm_roi_templates),
+    ("ocr",             _warm_ocr),
+    ("champion_select", _warm_champion_select),
+]
+
+# Internal helpers ----------------------------------------------------------
+async def _run() -> None:
+    _state["started"] = time.time()
+    for name, step in _STEPS:
+        entry = _state["steps"][name]
+        entry["status"] = "running"
+        t0 = time.perf_counter()
+        try:
+            entry["detail"] = await asyncio.to_thread(step)
+            entry["status"] = "ok"
+        except Exception as exc:
+            entry["status"], entry["detail"] = "failed", f"{type(exc).__name__}: {exc}"
+            print(f"⚠️  Warm-up step '{name}' failed: {exc}")
+        entry["seconds"] = round(time.perf_counter() - t0, 3)
+    _state["finished"] = time.time()
+    print(f"✔ Warm-up finished in {_state['finished'] - _state['started']:.1f}s")
+
+# Public API ----------------------------------------------------------------
+def start_warmup() -> asyncio.Task[None] | None:
+    """Launch the warm-up on the running loop (no-op if already started or disabled)."""
+    global _task
+    if _task is not None:
+        return _task
+
+    _state["steps"] = {name: {"status": "pending"} for name, _ in _STEPS}
+    if os.getenv("WARMUP", "1") == "0":
+        _state["enabled"] = False
+        _state["started"] = _state["finished"] = time.time()
+        for entry in _state["steps"].values():
+            entry["status"] = "skipped"
+        return None
+
+    _task = asyncio.get_running_loop().create_task(_run())
+    return _task
+
+
+async def stop_warmup() -> None:
+    global _task
+    if _task is not None:
+        _task.cancel()
+        await asyncio.gather(_task, return_exceptions=True)
+        _task = None
+
+
+def is_ready() -> bool:
+    return _state["finished"] is not None
+
+
+def readiness() -> Dict[str, Any]:
+    """Snapshot of the warm-up progress, suitable as a JSON response."""
+    steps = {k: dict(v) for k, v in _state["steps"].items()}
+    return {
+        "ready": is_ready(),
+        "degraded": any(s["status"] == "failed" for s in steps.values()),
+        "enabled": _state["enabled"],
+        "elapsed": (
+            round((_state["finished"] or time.time()) - _state["started"], 3)
+            if _state["started"] else None
+        ),
+        "steps": steps,
+    }
@@ -7,33 +7,63 @@ Asynchronous worker in charge of **Main-Game** analysis.
 
 The worker receives extraction jobs through an `asyncio.Queue`, downloads the requested video frame, applies several computer‑vision analyses and merges the results into *game_state.json*.
 
+The game timer is OCR-ed only until a per-match `GameTimerMapper` has locked
+onto the video → game-time relation; afterwards snapshot keys are predicted
+from the video position and the HUD clock is just re-verified periodically.
+Resource bars are measured against a per-match `BarCalibration` (player
+slots + full-bar width) learnt from the match's own frames.  Both are
+dropped when the match ends (or is started again), so a long-running
+worker does not keep one per match ever processed.
+
+Every frame first goes through the cheap HUD-presence gate
+(`detect_hud`): replays, caster desk, drafts and ads are dropped before
+bar detection and OCR, and the skip reason is counted per match
+(`worker_metrics()`).  A skipped frame also marks a cut for the timer
+mapper, so the clock is OCR-verified again when the game feed returns.
+Set ``HUD_GATE=0`` to disable the gate.
+
+Job status changes (queued → processing → processed / skipped / error)
+are published as ``job`` events on the live stream (see `core.events`).
+
 Public helpers
 --------------
 ensure_worker_started() – idempotently launches the background task(s)
 queue                  – shared `asyncio.Queue[Job]`
+enqueue(job)           – put a job on the queue and announce it
 shutdown_workers()     – cancels the tasks (mainly for tests)
+worker_metrics()       – per-match processed / skipped-by-reason counters
 """
 from __future__ import annotations
 
 import asyncio
 import hashlib
 import os
+from collections import Counter, OrderedDict
 from pathlib import Path
-from typing import Any, List, TypedDict
+from typing import Any, Collection, Dict, List, TypedDict
 
 import cv2
 
 from services.video.frame_extractor import async_extract_frame
-from services.live_game_analysis.main_game.resources_tracker.bars.health_detection_service import (
-    detect_health_bars,
-)
-from services.live_game_analysis.main_game.resources_tracker.bars.mana_detection_service import (
-    detect_mana_bars,
+from services.live_game_analysis.main_game.hud_presence_service import detect_hud
+from services.live_game_analysis.main_game.resources_tracker.bars.resource_bars_detection_service import (
+    BarCalibration,
+    detect_resource_bars,
 )
 from services.live_game_analysis.main_game.resources_tracker.stats.extract_stats_ocr_service import (
     process_main_hud_stats,
 )
-from services.live_game_analysis.game_state.game_state_service import update_game
+from services.live_game_analysis.main_game.resources_tracker.stats.timer_mapping_service import (
+    GameTimerMapper,
+    format_timer,
+    parse_timer,
+)
+from services.live_game_analysis.game_state.game_state_service import (
+    add_listener,
+    match_slug,
+    update_game,
+)
+from core import events
 
 # Paths ---------------------------------------------------------------------
 BASE_DIR = Path(__file__).resolve().parents[1]
@@ -49,15 +79,56 @@ class Job(TypedDict):
 # Globals -------------------------------------------------------------------
 queue: "asyncio.Queue[Job]" = asyncio.Queue()
 _worker_tasks: List[asyncio.Task[Any]] = []
+_timer_mappers: Dict[str, GameTimerMapper] = {}
+_bar_calibrations: Dict[str, BarCalibration] = {}
+_metrics: Dict[str, Counter[str]] = {}
+_finished: "OrderedDict[str, Counter[str]]" = OrderedDict()    # counters of ended matches
+
+_FINISHED_KEEP = int(os.getenv("WORKER_FINISHED_METRICS", 32))
+
+_HUD_GATE = os.getenv("HUD_GATE", "1") != "0"
 
 _DEFAULT_CONC = max(1, (os.cpu_count() or 2) - 1)
 
 # Internal helpers ----------------------------------------------------------
-async def _run_detectors(frame):
-    h_t = asyncio.to_thread(detect_health_bars, frame)
-    m_t = asyncio.to_thread(detect_mana_bars, frame)
-    s_t = asyncio.to_thread(process_main_hud_stats, frame)
-    return await asyncio.gather(h_t, m_t, s_t)
+def _job_event(job: Job, status: str, **extra: Any) -> None:
+    events.publish("job", match_slug(job["match"]), {"status": status, "time": job["time"], **extra})
+
+def _forget_match(kind: str, slug: str, _payload: Dict[str, Any]) -> None:
+    """Drop the per-match state once a match ends (or is re-created)."""
+    if kind not in ("start", "end"):
+        return
+    for match in [m for m in {*_timer_mappers, *_bar_calibrations, *_metrics} if match_slug(m) == slug]:
+        _timer_mappers.pop(match, None)
+        _bar_calibrations.pop(match, None)
+        counts = _metrics.pop(match, None)
+        if counts is not None and kind == "end":
+            _finished[match] = counts
+            while len(_finished) > _FINISHED_KEEP:
+                _finished.popitem(last=False)
+
+async def _run_detectors(frame, calibration: BarCalibration, skip: Collection[str] = ()):
+    b_t = asyncio.to_thread(detect_resource_bars, frame, None, calibration)
+    s_t = asyncio.to_thread(process_main_hud_stats, frame, None, skip)
+    bars, stats = await asyncio.gather(b_t, s_t)
+    return bars["health"], bars["mana"], stats
+
+def _resolve_timer(idx: int, mapper: GameTimerMapper, t: float, stats: dict, read_clock: bool) -> None:
+    """Normalise the OCR-ed clock (feeding the mapper) or fill it from the mapper."""
+    if read_clock:
+        secs = parse_timer(stats.get("time", {}).get("parsed"))
+        if secs is None:
+            return
+        if not mapper.observe(t, secs):
+            print(f"[{idx}] ✂ timer discontinuity @ {t:.2f}s")
+        stats["time"]["parsed"] = format_timer(secs)
+    else:
+        secs = mapper.predict(t)
+        stats["time"] = {
+            "raw": "",
+            "parsed": format_timer(secs) if secs is not None else None,
+            "source": "mapper",
+        }
 
 async def _worker_loop(idx: int) -> None:
     while True:
@@ -66,21 +137,46 @@ async def _worker_loop(idx: int) -> None:
 
         frame_hash = hashlib.md5(f"{url}|{t:.3f}".encode()).hexdigest()
         print(f"[{idx}] ▶ {match} @ {t:.2f}s → {frame_hash}.jpg")
+        _job_event(job, "processing")
         try:
             frame_path: Path = await async_extract_frame(url, t)
             frame = cv2.imread(str(frame_path))
             if frame is None:
                 raise RuntimeError("failed to read extracted frame")
 
-            health, mana, stats = await _run_detectors(frame)
+            counts = _metrics.setdefault(match, Counter())
+            if _HUD_GATE:
+                hud = await asyncio.to_thread(detect_hud, frame)
+                if not hud.present:
+                    mapper = _timer_mappers.get(match)
+                    if mapper is not None:
+                        mapper.mark_cut()          # a replay may rewind the clock: re-verify it
+                    counts[f"skipped:{hud.reason}"] += 1
+                    _job_event(job, "skipped", reason=hud.reason)
+                    print(f"[{idx}] ⏩ frame skipped ({hud.reason}, minimap={hud.minimap:.2f})")
+                    continue
+
+            mapper = _timer_mappers.setdefault(match, GameTimerMapper())
+            read_clock = mapper.needs_ocr(t)
+            calibration = _bar_calibrations.setdefault(match, BarCalibration())
+            health, mana, stats = await _run_detectors(
+                frame, calibration, () if read_clock else ("time",)
+            )
+            _resolve_timer(idx, mapper, t, stats, read_clock)
 
             if update_game(match, health, mana, stats):
+                counts["processed"] += 1
                 ts = stats.get("time", {}).get("parsed")
                 print(f"[{idx}] ✔ snapshot added → {match} @ {ts}")
+                _job_event(job, "processed", timer=ts)
             else:
+                counts["skipped:invalid_timer"] += 1
+                _job_event(job, "skipped", reason="invalid_timer")
                 print(f"[{idx}] ⏩ snapshot skipped (invalid timer)")
         except Exception as exc:  # pragma: no cover
+            _metrics.setdefault(match, Counter())["errors"] += 1
             print(f"[{idx}] ❌ Worker error ({match}): {exc}")
+            _job_event(job, "error", detail=str(exc))
         finally:
             queue.task_done()
 
@@ -94,8 +190,29 @@ async def ensure_worker_started(concurrency: int | None = None) -> None:
     _worker_tasks.extend(loop.create_task(_worker_loop(i)) for i in range(n))
     print(f"Started {n} worker(s)")
 
+async def enqueue(job: Job) -> None:
+    await queue.put(job)
+    _job_event(job, "queued", pending=queue.qsize())
+
+def worker_metrics() -> Dict[str, Dict[str, Any]]:
+    """
+    ``{match: {"processed": n, "errors": n, "skipped": {reason: n}}}`` for
+    live matches and the last ``WORKER_FINISHED_METRICS`` ended ones.
+    """
+    out: Dict[str, Dict[str, Any]] = {}
+    for match, c in (*_finished.items(), *_metrics.items()):
+        out[match] = {
+            "processed": c["processed"],
+            "errors": c["errors"],
+            "skipped": {k.split(":", 1)[1]: v for k, v in c.items() if k.startswith("skipped:")},
+        }
+    return out
+
 async def shutdown_workers() -> None:
     for t in _worker_tasks:
         t.cancel()
     await asyncio.gather(*_worker_tasks, return_exceptions=True)
     _worker_tasks.clear()
+
+# per-match mappers / calibrations / counters are released when the match ends
+add_listener(_forget_match)
@@ -6,14 +6,16 @@ Launch it with:
 
     python main.py --reload
 
-The module does four things:
+The module does five things:
 
 1.  Cleans the temporary *frames/* directory created by the worker.
 2.  Builds and configures a :class:`fastapi.FastAPI` application.
-3.  Exposes the REST API defined in *api/* and serves every
+3.  Warms the analysis caches in the background once the server is up
+    (see :mod:`core.warmup`; progress at ``GET /health/ready``).
+4.  Exposes the REST API defined in *api/* and serves every
     image/video asset that the analysis pipeline leaves under
     *matches_history/<match>/results/*.
-4.  Starts an **uvicorn** server if the file is executed directly.
+5.  Starts an **uvicorn** server if the file is executed directly.
 
 The code purposefully keeps all framework-specific wiring in one place
 so that the rest of the project can stay framework-agnostic.
@@ -21,6 +23,7 @@ so that the rest of the project can stay framework-agnostic.
 from __future__ import annotations
 
 import argparse
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 import uvicorn
@@ -30,6 +33,7 @@ from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
 from api import api_router
+from core.warmup import start_warmup, stop_warmup
 from utils.cleanup import cleanup_frames
 
 
@@ -45,7 +49,15 @@ print(f"[startup] removed {deleted} old frame(s)")
 # FastAPI application
 # ---------------------------------------------------------------------------
 
-app = FastAPI(title="TFG – MOBA Analysis")
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # warm-up runs as a task: the server binds and answers immediately
+    start_warmup()
+    yield
+    await stop_warmup()
+
+
+app = FastAPI(title="TFG – MOBA Analysis", lifespan=lifespan)
 
 # CORS: the Flutter front-end runs on a different origin during development
 app.add_middleware(
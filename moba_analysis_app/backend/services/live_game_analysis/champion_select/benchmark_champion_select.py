@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Champion-Select Benchmark
+=========================
+
+Reproducible benchmark of the auto-generated
+``process_champion_select_<DETECTOR>_<STRATEGY>`` wrappers, replacing the
+hard-coded single-screenshot run of *matching_technique_test.py* and the
+log scraping of *parse_ranking_log_to_excel.py*.
+
+Fixtures
+--------
+A directory holding draft frames plus a *labels.json*::
+
+    {"frames": [{"file": "draft_01.png",
+                 "blue": ["yorick", …], "red": ["ambessa", …]}, …]}
+
+``file`` is relative to the fixtures directory.  The default fixtures
+(*benchmark_fixtures/*) are the historical *screenshot.png* plus four drafts
+built from it: slot artwork shuffled within and across teams, re-encoded as
+JPEG, rescaled to 720p / 900p and darkened.
+
+Measured per (wrapper × reference source)
+-----------------------------------------
+* ``top1`` / ``top5``  – slot accuracy over every fixture frame, read from
+  the ranked candidates of the timed calls themselves;
+* ``cold_ms``          – first call with empty in-process caches (descriptor
+  index, atlas, matchers); add ``--cold-from-scratch`` to also ignore the
+  persisted ``.npz`` indexes so the cold figure includes the index build;
+* ``warm_ms``          – median per-frame latency over ``--repeat`` passes;
+* ``peak_alloc_mib``   – peak traced allocation during the run
+  (:mod:`tracemalloc`; NumPy buffers included, OpenCV internals not);
+* ``max_rss_mib``      – process high-water mark after the run, where the
+  platform exposes it.
+
+Results are written as JSON (``--out``).  ``--thresholds`` points to a JSON
+file of regression limits, keyed by ``"<wrapper>|<source>"`` or ``"*"``::
+
+    {"*": {"top1_min": 0.6},
+     "process_champion_select_ORB_resize_none|splash_arts":
+         {"top1_min": 0.9, "warm_ms_max": 400}}
+
+Supported limits: ``top1_min``, ``top5_min``, ``warm_ms_max``,
+``cold_ms_max``, ``peak_alloc_mib_max``.  The script exits with status 1
+when any limit is violated.
+
+Usage::
+
+    python -m services.live_game_analysis.champion_select.benchmark_champion_select \\
+        --wrappers "*ORB*" --sources splash_arts icons --repeat 3 \\
+        --out results/benchmark.json --thresholds thresholds.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+from services.live_game_analysis.champion_select import (
+    champion_matcher as cm,
+    descriptor_index,
+    reference_atlas,
+)
+
+# --------------------------------------------------------------------------- #
+# Configuration                                                               #
+# --------------------------------------------------------------------------- #
+BASE_DIR     = Path(__file__).parent
+FIXTURES_DIR = BASE_DIR / "benchmark_fixtures"
+
+_LIMITS = {
+    "top1_min":           ("top1", min),
+    "top5_min":           ("top5", min),
+    "warm_ms_max":        ("warm_ms", max),
+    "cold_ms_max":        ("cold_ms", max),
+    "peak_alloc_mib_max": ("peak_alloc_mib", max),
+}
+
+Fixture = Tuple[str, np.ndarray, List[str]]          # (name, frame, 10 labels)
+
+# --------------------------------------------------------------------------- #
+# Fixtures                                                                    #
+# --------------------------------------------------------------------------- #
+def load_fixtures(folder: Path) -> List[Fixture]:
+    """Read *labels.json* of *folder* and decode every referenced frame."""
+    spec = json.loads((folder / "labels.json").read_text(encoding="utf-8"))
+    out: List[Fixture] = []
+    for item in spec["frames"]:
+        path  = (folder / item["file"]).resolve()
+        frame = cv2.imread(str(path))
+        if frame is None:
+            raise FileNotFoundError(f"Fixture frame not readable: {path}")
+        labels = [c.lower() for c in item["blue"]] + [c.lower() for c in item["red"]]
+        if len(labels) != 10:
+            raise ValueError(f"{item['file']}: expected 5 + 5 labels, got {len(labels)}")
+        out.append((item["file"], frame, labels))
+    if not out:
+        raise ValueError(f"No fixtures listed in {folder / 'labels.json'}")
+    return out
+
+# --------------------------------------------------------------------------- #
+# Measurement                                                                 #
+# --------------------------------------------------------------------------- #
+def _max_rss_mib() -> float | None:
+    try:
+        import resource
+    except ImportError:                                   # Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+
+def _clear_caches() -> None:
+    """Forget every in-process cache the matcher relies on."""
+    descriptor_index._indexes.clear()
+    reference_atlas._atlases.clear()
+
+
+def run_combination(
+    wrapper: str,
+    source: cm.ReferenceSource,
+    fixtures: List[Fixture],
+    *,
+    repeat: int,
+    shortlist_k: int | None,
+) -> Dict[str, Any]:
+    """
+    Benchmark one wrapper on one reference source.
+
+    Every call goes through :func:`champion_matcher.match_slots` – the exact
+    work behind the wrapper – so accuracy is scored on the ranking of the
+    very runs whose latency is recorded.
+    """
+    getattr(cm, wrapper)                                  # unknown wrapper → AttributeError
+    kwargs = dict(ref_src=source, shortlist_k=shortlist_k)
+
+    _clear_caches()
+    tracemalloc.start()
+    try:
+        # cold: first frame, empty caches
+        t0 = time.perf_counter()
+        cm.match_slots(wrapper, fixtures[0][1], **kwargs)
+        cold_ms = (time.perf_counter() - t0) * 1000
+
+        # warm: every frame, `repeat` passes
+        warm: List[float] = []
+        ranked: Dict[str, Dict[int, List[Tuple[str, int]]]] = {}
+        for _ in range(repeat):
+            for name, frame, _ in fixtures:
+                t0 = time.perf_counter()
+                ranked[name] = cm.match_slots(wrapper, frame, **kwargs)
+                warm.append((time.perf_counter() - t0) * 1000)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    n_slots = 10 * len(fixtures)
+    top1 = top5 = 0
+    misses: List[Dict[str, Any]] = []
+    for name, _, labels in fixtures:
+        for slot, truth in enumerate(labels):
+            cands = [c for c, _ in ranked[name][slot]]
+            got   = cands[0] if cands else "?"              # the wrapper's top-1
+            top1 += got == truth
+            top5 += truth in cands[:5]
+            if got != truth:
+                misses.append({"frame": name, "slot": slot, "expected": truth, "got": got})
+
+    return {
+        "wrapper": wrapper,
+        "source": source.value,
+        "frames": len(fixtures),
+        "top1": round(top1 / n_slots, 4),
+        "top5": round(top5 / n_slots, 4),
+        "cold_ms": round(cold_ms, 1),
+        "warm_ms": round(statistics.median(warm), 1),
+        "peak_alloc_mib": round(peak / 2**20, 1),
+        "max_rss_mib": _max_rss_mib(),
+        "misses": misses,
+    }
+
+# --------------------------------------------------------------------------- #
+# Thresholds                                                                  #
+# --------------------------------------------------------------------------- #
+def check_thresholds(results: List[Dict[str, Any]], limits: Dict[str, Dict[str, float]]) -> List[str]:
+    """Return a human-readable line for every violated limit."""
+    failures: List[str] = []
+    for res in results:
+        key  = f"{res['wrapper']}|{res['source']}"
+        rule = {**limits.get("*", {}), **limits.get(key, {})}
+        for name, bound in rule.items():
+            if name not in _LIMITS:
+                raise ValueError(f"Unknown threshold '{name}' for {key}")
+            metric, kind = _LIMITS[name]
+            value = res[metric]
+            if (kind is min and value < bound) or (kind is max and value > bound):
+                failures.append(f"{key}: {metric}={value} violates {name}={bound}")
+    return failures
+
+# --------------------------------------------------------------------------- #
+# Entry-point                                                                 #
+# --------------------------------------------------------------------------- #
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark champion-select wrappers.")
+    ap.add_argument("--fixtures", type=Path, default=FIXTURES_DIR,
+                    help="directory with labels.json and the draft frames")
+    ap.add_argument("--wrappers", nargs="+", default=["*"],
+                    help="wrapper names or glob patterns (default: all)")
+    ap.add_argument("--sources", nargs="+", default=[s.value for s in cm.ReferenceSource],
+                    choices=[s.value for s in cm.ReferenceSource])
+    ap.add_argument("--repeat", type=int, default=3, help="warm passes over the fixtures")
+    ap.add_argument("--shortlist-k", type=int, default=0, help="colour pre-filter K (0 = off)")
+    ap.add_argument("--cold-from-scratch", action="store_true",
+                    help="ignore persisted descriptor indexes (cold runs rebuild them)")
+    ap.add_argument("--out", type=Path, default=BASE_DIR / "results" / "benchmark.json")
+    ap.add_argument("--thresholds", type=Path, help="JSON file with regression limits")
+    args = ap.parse_args(argv)
+
+    fixtures = load_fixtures(args.fixtures)
+    names = sorted(n for n in dir(cm) if n.startswith("process_champion_select_"))
+    wrappers = [n for n in names if any(fnmatch.fnmatch(n, f"*{p}*") for p in args.wrappers)]
+    if not wrappers:
+        ap.error(f"No wrapper matches {args.wrappers}")
+
+    scratch = tempfile.TemporaryDirectory() if args.cold_from_scratch else None
+    if scratch is not None:
+        descriptor_index.INDEX_DIR = Path(scratch.name)
+
+    results: List[Dict[str, Any]] = []
+    try:
+        for src in args.sources:
+            for wrapper in wrappers:
+                res = run_combination(
+                    wrapper, cm.ReferenceSource(src), fixtures,
+                    repeat=max(1, args.repeat), shortlist_k=args.shortlist_k or None,
+                )
+                results.append(res)
+                print(f"{src:<15} {wrapper:<48} top1={res['top1']:.2f} top5={res['top5']:.2f} "
+                      f"cold={res['cold_ms']:8.1f}ms warm={res['warm_ms']:8.1f}ms "
+                      f"peak={res['peak_alloc_mib']:6.1f}MiB")
+    finally:
+        if scratch is not None:
+            scratch.cleanup()
+
+    failures: List[str] = []
+    if args.thresholds:
+        limits = json.loads(args.thresholds.read_text(encoding="utf-8"))
+        failures = check_thresholds(results, limits)
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps({
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "opencv": cv2.__version__,
+        "fixtures": [name for name, _, _ in fixtures],
+        "repeat": args.repeat,
+        "shortlist_k": args.shortlist_k or None,
+        "results": results,
+        "failures": failures,
+    }, indent=2), encoding="utf-8")
+    print(f"\n✔ Results saved to {args.out}")
+
+    for line in failures:
+        print(f"✘ {line}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,13 +7,17 @@ Champion-Select Recognition
 A thin wrapper around OpenCV feature detectors that identifies the five
 champions shown for each team during the draft phase (*champ-select*).
 
-Four public helpers are generated on-the-fly for **every** detector
-available in the local OpenCV build (SIFT, ORB, …) combined with four
-pre-defined resize strategies:
+Four public helpers exist for **every** detector available in the local
+OpenCV build (SIFT, ORB, …) combined with four pre-defined resize
+strategies.  They are generated lazily on first attribute access (module
+``__getattr__``; ``dir()`` still lists them all) and each detector is only
+instantiated, per thread, the first time it is used – importing this
+module builds nothing:
 
     process_champion_select_<DETECTOR>_<STRATEGY>(frame, /, *,
         roi_template: dict | None = None,
-        ref_src: ReferenceSource = ReferenceSource.ICONS) -> {
+        ref_src: ReferenceSource = ReferenceSource.ICONS,
+        shortlist_k: int | None = None) -> {
             "blue": [c_top, c_jng, c_mid, c_bot, c_sup],
             "red" : [c_top, c_jng, c_mid, c_bot, c_sup],
         }
@@ -26,7 +30,20 @@ pre-defined resize strategies:
     • resize_both         – resize both query and references
 
 The reference images are downloaded automatically from Data-Dragon on
-first use and cached under *assets/images/*.
+first use and cached under *assets/images/*.  Their descriptors are
+extracted once per (version, source, detector, reference resize) and
+reused from :mod:`descriptor_index`, so a draft frame only pays for the
+ten query extractions plus matching.  Passing ``shortlist_k`` restricts
+feature matching to the K champions with the closest colour histogram.
+
+:func:`match_slots` exposes the same machinery per slot (ranked
+``(champion, votes)`` candidates for a subset of the ten slots, see
+:mod:`champion_select_tracker`); :func:`slot_boxes` returns the slot boxes.
+
+The ten slots of a frame are matched concurrently on a shared thread pool
+(``CHAMP_SELECT_THREADS``, default ``min(10, cpu_count)``); every pool
+thread owns its detector and FLANN matcher instances.  :func:`warm_up`
+prepares all of that for one wrapper before the first frame arrives.
 
 Only the raw predictions are returned – all former “evidence saving”
 logic has been dropped to keep the API side-effect free.
@@ -35,11 +52,13 @@ logic has been dropped to keep the API side-effect free.
 from __future__ import annotations
 
 import glob
-import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Sequence, Tuple
 
 import cv2
 import numpy as np
@@ -47,14 +66,20 @@ import numpy as np
 # --------------------------------------------------------------------------- #
 # Riot assets                                                                 #
 # --------------------------------------------------------------------------- #
-from services.riot_api.riot_versions import get_latest_version
 from services.riot_api.riot_champions_images import (
-    download_all_images,
     get_icons_path,
     get_splash_arts_path,
     get_loading_screens_path,
 )
 
+from services.live_game_analysis.champion_select.descriptor_index import (
+    DescriptorIndex,
+    colour_histogram,
+    get_descriptor_index,
+)
+from services.live_game_analysis.champion_select.reference_atlas import open_atlas
+from services.live_game_analysis.roi_compiler import load_template
+
 # --------------------------------------------------------------------------- #
 # Configuration / paths                                                       #
 # --------------------------------------------------------------------------- #
@@ -121,8 +146,11 @@ def subdivide_roi(box: Tuple[int, int, int, int], n: int = 5) -> List[Tuple[int,
     ]
 
 def load_roi_template(name: str = "champ_select_rois") -> Template:
-    """Load the given template from *roi_templates/*.json*."""
-    return json.loads((ROI_ROOT / f"{name}.json").read_text(encoding="utf-8"))
+    """
+    Load the given template from *roi_templates/*.json* (parsed once and
+    re-read only when the file changes; treat it as read-only).
+    """
+    return load_template(ROI_ROOT / f"{name}.json")
 
 # --------------------------------------------------------------------------- #
 # Reference images & detectors                                                #
@@ -132,12 +160,25 @@ def _ensure_refs_ready(src: ReferenceSource) -> Path:
     folder = Path(_SRC_TO_PATH_FN[src]())
     if not any(folder.iterdir()):
         print(f"↻ No local artwork found ({src.value}); downloading …")
+        from services.riot_api.riot_champions_images import download_all_images
+        from services.riot_api.riot_versions import get_latest_version
+
         download_all_images(get_latest_version())
     return folder
 
 def load_reference_images(src: ReferenceSource) -> Dict[str, np.ndarray]:
-    """Return {champion_key → BGR image} for the chosen source."""
+    """
+    Return {champion_key → BGR image} for the chosen source.
+
+    Images come from the memory-mapped :mod:`reference_atlas` (read-only,
+    pre-resized views) when one is built and up to date; otherwise every
+    file is decoded.
+    """
     folder = _ensure_refs_ready(src)
+    atlas  = open_atlas(src.value)
+    if atlas is not None:
+        return atlas.as_dict()
+
     out: Dict[str, np.ndarray] = {}
     for fp in glob.glob(os.path.join(folder, "*")):
         if fp.lower().endswith((".png", ".jpg", ".jpeg")):
@@ -147,86 +188,266 @@ def load_reference_images(src: ReferenceSource) -> Dict[str, np.ndarray]:
                 out[name] = img
     return out
 
-def _create_detectors() -> Dict[str, cv2.Feature2D]:
-    """Create every detector available in the current OpenCV build."""
-    det: Dict[str, cv2.Feature2D] = {}
-    if hasattr(cv2, "SIFT_create"):  det["SIFT"]  = cv2.SIFT_create()
-    if hasattr(cv2, "ORB_create"):   det["ORB"]   = cv2.ORB_create()
-    if hasattr(cv2, "AKAZE_create"): det["AKAZE"] = cv2.AKAZE_create()
-    if hasattr(cv2, "BRISK_create"): det["BRISK"] = cv2.BRISK_create()
-    if hasattr(cv2, "KAZE_create"):  det["KAZE"]  = cv2.KAZE_create()
-    try: det["SURF"] = cv2.xfeatures2d.SURF_create()            # type: ignore[attr-defined]
-    except Exception: pass
+# Detectors are looked up and instantiated on first use only: a process that
+# never matches a draft never touches SIFT / KAZE / the SURF probe.
+_DETECTOR_CTORS: Dict[str, str] = {
+    "SIFT":  "SIFT_create",
+    "ORB":   "ORB_create",
+    "AKAZE": "AKAZE_create",
+    "BRISK": "BRISK_create",
+    "KAZE":  "KAZE_create",
+    "SURF":  "xfeatures2d.SURF_create",
+}
+
+@lru_cache(maxsize=None)
+def _detector_factory(det_name: str) -> Callable[[], cv2.Feature2D] | None:
+    """Constructor of *det_name* in the current OpenCV build (*None* if absent)."""
+    make = cv2
+    for attr in _DETECTOR_CTORS.get(det_name, "").split("."):
+        make = getattr(make, attr, None) if attr else None
+        if make is None:
+            return None
+    if det_name == "SURF":
+        try:
+            make()                              # non-free: may exist yet refuse to build
+        except Exception:
+            return None
+    return make
+
+def _available_detectors() -> List[str]:
+    return [name for name in _DETECTOR_CTORS if _detector_factory(name) is not None]
+
+_tls = threading.local()
+
+def _get_detector(det_name: str) -> cv2.Feature2D:
+    """
+    Per-thread detector instance, created the first time *det_name* is
+    used on this thread – Feature2D objects are not re-entrant.
+    """
+    cache = getattr(_tls, "detectors", None)
+    if cache is None:
+        cache = _tls.detectors = {}
+    det = cache.get(det_name)
+    if det is None:
+        make = _detector_factory(det_name)
+        if make is None:
+            raise ValueError(f"Detector '{det_name}' is not available.")
+        det = cache[det_name] = make()
     return det
 
-_DETECTORS = _create_detectors()
+# --------------------------------------------------------------------------- #
+# Slot thread pool                                                            #
+# --------------------------------------------------------------------------- #
+_SLOT_WORKERS = max(1, int(os.getenv("CHAMP_SELECT_THREADS", min(10, os.cpu_count() or 1))))
+
+_pool: ThreadPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+def _slot_pool() -> ThreadPoolExecutor:
+    """Process-wide pool matching the ten slots of a frame concurrently."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(_SLOT_WORKERS, thread_name_prefix="champ-slot")
+    return _pool
 
 # --------------------------------------------------------------------------- #
 # Matching                                                                    #
 # --------------------------------------------------------------------------- #
+_KNN   = 4        # neighbours fetched per query descriptor
+_RATIO = 0.75     # Lowe ratio against the best *other* champion
+
 def _extract_and_match(
     det_name: str,
     detector: cv2.Feature2D,
     query: np.ndarray,
-    targets: Dict[str, np.ndarray],
+    index: DescriptorIndex,
     *,
-    top_k: int = 5
+    top_k: int = 5,
+    candidates: np.ndarray | None = None,
 ) -> List[Tuple[str, int]]:
-    """Return up to *top_k* matches sorted by number of good correspondences."""
+    """
+    Return up to *top_k* champions sorted by number of votes.
+
+    Every query descriptor runs one k-NN search over the whole stacked
+    reference set; its nearest neighbour votes for its champion when it
+    passes the ratio test against the nearest neighbour belonging to a
+    *different* champion (or when all *k* neighbours agree).
+
+    With *candidates* (champion ids) only their descriptors are searched,
+    exhaustively, instead of the full FLANN index.
+    """
     kp_q, des_q = detector.detectAndCompute(query, None)
-    if des_q is None or not kp_q:
+    if des_q is None or not kp_q or not len(index.descriptors):
         return []
 
-    norm = cv2.NORM_L2 if det_name in ("SIFT", "SURF", "KAZE") else cv2.NORM_HAMMING
-    matcher = cv2.BFMatcher(norm)
-
-    scores: List[Tuple[str, int]] = []
-    for name, img in targets.items():
-        kp_t, des_t = detector.detectAndCompute(img, None)
-        if des_t is None or not kp_t:
+    des_q = des_q.astype(index.descriptors.dtype, copy=False)
+    if candidates is None:
+        labels = index.labels
+        pairs  = index.matcher().knnMatch(des_q, k=_KNN)
+    else:
+        rows = np.concatenate(
+            [np.arange(index.offsets[i], index.offsets[i + 1]) for i in candidates]
+        )
+        if not rows.size:
+            return []
+        labels = index.labels[rows]
+        norm   = cv2.NORM_HAMMING if index.is_binary else cv2.NORM_L2
+        pairs  = cv2.BFMatcher(norm).knnMatch(des_q, index.descriptors[rows], k=_KNN)
+
+    votes = np.zeros(len(index), np.int32)
+    for cand in pairs:
+        if not cand:
             continue
-        pairs = matcher.knnMatch(des_q, des_t, k=2)
-        good  = [m for m, n in (p for p in pairs if len(p) == 2) if m.distance < 0.75 * n.distance]
-        if good:
-            scores.append((name, len(good)))
-
-    return sorted(scores, key=lambda x: x[1], reverse=True)[:top_k]
+        best  = cand[0]
+        champ = labels[best.trainIdx]
+        rival = next((m for m in cand[1:] if labels[m.trainIdx] != champ), None)
+        if rival is None or best.distance < _RATIO * rival.distance:
+            votes[champ] += 1
+
+    ranked = np.argsort(-votes, kind="stable")[:top_k]
+    return [(index.names[i], int(votes[i])) for i in ranked if votes[i] > 0]
+
+def _shortlist(index: DescriptorIndex, patch: np.ndarray, k: int) -> np.ndarray:
+    """Ids of the *k* champions whose colour signature is closest to *patch*."""
+    sims = index.histograms @ colour_histogram(patch)
+    k    = min(k, sims.size)
+    top  = np.argpartition(-sims, k - 1)[:k]
+    return top[np.argsort(-sims[top])]
 
 # --------------------------------------------------------------------------- #
 # Core routine                                                                #
 # --------------------------------------------------------------------------- #
-def _process_champion_select(
+def _reference_index(det_name: str, ref_src: ReferenceSource, resize_db: bool) -> DescriptorIndex:
+    """Descriptor index of *ref_src* for *det_name* (atlas-backed when built)."""
+    atlas = open_atlas(ref_src.value)
+    return get_descriptor_index(
+        det_name, _get_detector(det_name), _ensure_refs_ready(ref_src), resize_db,
+        lambda: load_reference_images(ref_src),
+        variant=f"atlas{atlas.max_side}" if atlas is not None else "",
+    )
+
+def slot_boxes(frame: np.ndarray, roi_template: Template | None = None) -> List[Tuple[int, int, int, int]]:
+    """The ten champion boxes of *frame*: blue TOP→SUP, then red TOP→SUP."""
+    tpl   = roi_template or load_roi_template()
+    H, W  = frame.shape[:2]
+    blue, red = get_scaled_rois(tpl, W, H)
+    return subdivide_roi(blue, 5) + subdivide_roi(red, 5)
+
+def _match_slots(
     det_name: str,
     resize_bbox: bool,
     resize_db: bool,
     frame: np.ndarray,
+    slots: Sequence[int],
     roi_template: Template | None = None,
     ref_src: ReferenceSource = ReferenceSource.ICONS,
-) -> Dict[str, List[str]]:
-    """Shared implementation behind every auto-generated helper."""
-    if det_name not in _DETECTORS:
+    shortlist_k: int | None = None,
+) -> Dict[int, List[Tuple[str, int]]]:
+    """Ranked ``(champion, votes)`` candidates for each requested slot (0-9)."""
+    if _detector_factory(det_name) is None:
         raise ValueError(f"Detector '{det_name}' is not available.")
 
-    tpl   = roi_template or load_roi_template()
-    H, W  = frame.shape[:2]
-    boxes = subdivide_roi(get_scaled_rois(tpl, W, H)[0], 5) + \
-            subdivide_roi(get_scaled_rois(tpl, W, H)[1], 5)
+    boxes = slot_boxes(frame, roi_template)
+    index = _reference_index(det_name, ref_src, resize_db)
+
+    use_shortlist = bool(shortlist_k) and shortlist_k < len(index)
 
     resize = (lambda im, f: cv2.resize(im, (100, 100)) if f else im)
-    refs   = {
-        k: resize(v, resize_db)
-        for k, v in load_reference_images(ref_src).items()
-    }
-    det = _DETECTORS[det_name]
-
-    preds: List[str] = []
-    for x1, y1, x2, y2 in boxes:
-        patch   = resize(frame[y1:y2, x1:x2], resize_bbox)
-        matches = _extract_and_match(det_name, det, patch, refs)
-        preds.append(matches[0][0] if matches else "?")
 
+    def _match_slot(slot: int) -> List[Tuple[str, int]]:
+        x1, y1, x2, y2 = boxes[slot]
+        patch = resize(frame[y1:y2, x1:x2], resize_bbox)
+        cands = _shortlist(index, patch, shortlist_k) if use_shortlist else None
+        return _extract_and_match(
+            det_name, _get_detector(det_name), patch, index, candidates=cands,
+        )
+
+    # OpenCV releases the GIL during extraction and matching
+    if _SLOT_WORKERS > 1 and len(slots) > 1:
+        ranked = list(_slot_pool().map(_match_slot, slots))
+    else:
+        ranked = [_match_slot(s) for s in slots]
+    return dict(zip(slots, ranked))
+
+def _process_champion_select(
+    det_name: str,
+    resize_bbox: bool,
+    resize_db: bool,
+    frame: np.ndarray,
+    roi_template: Template | None = None,
+    ref_src: ReferenceSource = ReferenceSource.ICONS,
+    shortlist_k: int | None = None,
+) -> Dict[str, List[str]]:
+    """
+    Shared implementation behind every auto-generated helper.
+
+    *shortlist_k* enables the two-stage cascade: each patch is first
+    compared with every reference by colour histogram (one matrix–vector
+    product) and feature matching only runs on the *shortlist_k* closest
+    champions.  *None* / ``0`` matches against the full index.
+    """
+    ranked = _match_slots(
+        det_name, resize_bbox, resize_db, frame, range(10),
+        roi_template, ref_src, shortlist_k,
+    )
+    preds = [ranked[i][0][0] if ranked[i] else "?" for i in range(10)]
     return {"blue": preds[:5], "red": preds[5:]}
 
+def match_slots(
+    wrapper: str,
+    frame: np.ndarray,
+    slots: Sequence[int] = range(10),
+    *,
+    roi_template: Template | None = None,
+    ref_src: ReferenceSource = ReferenceSource.ICONS,
+    shortlist_k: int | None = None,
+) -> Dict[int, List[Tuple[str, int]]]:
+    """
+    Slot-level entry point: run the detector / strategy of *wrapper*
+    (``process_champion_select_<DET>_<STRAT>``) on the given *slots* only
+    and return their ranked ``(champion, votes)`` candidates.
+    """
+    spec = _wrapper_spec(wrapper)
+    if spec is None:
+        raise KeyError(f"Wrapper '{wrapper}' not found.")
+    det_name, rb, rd = spec
+    return _match_slots(det_name, rb, rd, frame, list(slots), roi_template, ref_src, shortlist_k)
+
+def warm_up(
+    wrapper: str,
+    ref_src: ReferenceSource = ReferenceSource.ICONS,
+    roi_template: str = "champ_select_rois",
+) -> int:
+    """
+    Pay every one-off cost of *wrapper* on *ref_src* ahead of the first
+    draft frame: reference artwork (download / decode), the descriptor
+    index, the ROI template and, on every slot-pool thread, the detector
+    and trained FLANN matcher.  Returns the number of reference champions.
+    """
+    spec = _wrapper_spec(wrapper)
+    if spec is None:
+        raise KeyError(f"Wrapper '{wrapper}' not found.")
+    det_name, _, resize_db = spec
+
+    load_roi_template(roi_template)
+    index = _reference_index(det_name, ref_src, resize_db)
+
+    def _prime(barrier: threading.Barrier | None) -> None:
+        _get_detector(det_name)
+        if len(index.descriptors):
+            index.matcher()
+        if barrier is not None:             # hold the thread so every worker gets a task
+            barrier.wait(timeout=30)
+
+    _prime(None)
+    if _SLOT_WORKERS > 1:
+        barrier = threading.Barrier(_SLOT_WORKERS)
+        for fut in [_slot_pool().submit(_prime, barrier) for _ in range(_SLOT_WORKERS)]:
+            fut.result()
+    return len(index)
+
 # --------------------------------------------------------------------------- #
 # Public helpers (auto-generated)                                             #
 # --------------------------------------------------------------------------- #
@@ -237,21 +458,37 @@ _STRATS = {
     "resize_both":       (True,  True),
 }
 
-for _det_name in _DETECTORS:
-    for _strat, (_rb, _rd) in _STRATS.items():
-        _fname = f"process_champion_select_{_det_name}_{_strat}"
-
-        def _factory(det=_det_name, rb=_rb, rd=_rd):
-            return lambda frame, roi_template=None, ref_src=ReferenceSource.ICONS: (
-                _process_champion_select(det, rb, rd, frame, roi_template, ref_src)
-            )
-
-        globals()[_fname] = _factory()
-        globals()[_fname].__name__ = _fname
-        globals()[_fname].__doc__  = (
-            f"Champion-select detection using **{_det_name}** ({_strat}). "
-            "Returns ``{'blue': […], 'red': […]}``."
-        )
-
-# clean temporary loop variables
-del _factory, _fname, _det_name, _strat, _rb, _rd
+_PREFIX = "process_champion_select_"
+
+def _wrapper_spec(name: str) -> Tuple[str, bool, bool] | None:
+    """``process_champion_select_<DET>_<STRAT>`` → (detector, resize_bbox, resize_db)."""
+    if not name.startswith(_PREFIX):
+        return None
+    det_name, _, strat = name[len(_PREFIX):].partition("_")
+    if strat not in _STRATS or _detector_factory(det_name) is None:
+        return None
+    return (det_name, *_STRATS[strat])
+
+def _make_wrapper(name: str, det_name: str, rb: bool, rd: bool) -> Callable[..., Dict[str, List[str]]]:
+    def wrapper(frame, roi_template=None, ref_src=ReferenceSource.ICONS, shortlist_k=None):
+        return _process_champion_select(det_name, rb, rd, frame, roi_template, ref_src, shortlist_k)
+
+    wrapper.__name__ = wrapper.__qualname__ = name
+    wrapper.__doc__ = (
+        f"Champion-select detection using **{det_name}** ({name[len(_PREFIX) + len(det_name) + 1:]}). "
+        "Returns ``{'blue': […], 'red': […]}``."
+    )
+    return wrapper
+
+def __getattr__(name: str):
+    # wrappers are built on first access and then cached as real globals,
+    # so later lookups never come back here
+    spec = _wrapper_spec(name)
+    if spec is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    fn = globals()[name] = _make_wrapper(name, *spec)
+    return fn
+
+def __dir__() -> List[str]:
+    wrappers = {f"{_PREFIX}{det}_{strat}" for det in _available_detectors() for strat in _STRATS}
+    return sorted(set(globals()) | wrappers)
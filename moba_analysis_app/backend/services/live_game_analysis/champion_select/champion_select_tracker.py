@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Incremental champion-select tracking
+====================================
+
+Picks appear one by one over roughly a minute of draft, so matching all
+ten slots of every frame from scratch wastes most of the work and forces
+the caller to guess *the* timestamp where the draft is complete.
+
+:class:`ChampionSelectTracker` consumes a sequence of frames instead:
+
+* every **open** slot is feature-matched; once its top champion has been
+  the same for ``stable_frames`` consecutive frames the slot is **locked**;
+* a locked slot is only re-checked through a 64-bit difference hash of its
+  patch – if the patch changes by more than ``hash_tolerance`` bits (swap,
+  trade, overlay) the slot re-opens and is matched again;
+* as soon as all ten slots are locked :attr:`ChampionSelectTracker.complete`
+  turns *True* and :attr:`ChampionSelectTracker.draft` holds the result.
+
+Public API
+----------
+``ChampionSelectTracker(wrapper, *, stable_frames=3, hash_tolerance=6, …)``
+``ChampionSelectTracker.update(frame) -> Dict[str, List[str]]``
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import cv2
+import numpy as np
+
+from services.live_game_analysis.champion_select.champion_matcher import (
+    ReferenceSource,
+    Template,
+    match_slots,
+    slot_boxes,
+)
+
+# --------------------------------------------------------------------------- #
+# Tunables                                                                    #
+# --------------------------------------------------------------------------- #
+_STABLE_FRAMES  = 3       # identical top matches needed to lock a slot
+_HASH_TOLERANCE = 6       # differing dHash bits before a locked slot re-opens
+_N_SLOTS        = 10
+
+# --------------------------------------------------------------------------- #
+# Helpers                                                                     #
+# --------------------------------------------------------------------------- #
+def _dhash(patch: np.ndarray) -> int:
+    """64-bit difference hash: sign of horizontal gradients on a 9×8 thumbnail."""
+    gray  = cv2.cvtColor(patch, cv2.COLOR_BGR2GRAY) if patch.ndim == 3 else patch
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits  = (small[:, 1:] > small[:, :-1]).ravel()
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+@dataclass
+class _Slot:
+    best: str = "?"
+    streak: int = 0
+    locked: bool = False
+    hash: Optional[int] = None
+
+
+# --------------------------------------------------------------------------- #
+# Tracker                                                                     #
+# --------------------------------------------------------------------------- #
+@dataclass
+class ChampionSelectTracker:
+    """Stateful, frame-by-frame draft recogniser (one instance per draft)."""
+
+    wrapper: str = "process_champion_select_ORB_resize_none"
+    stable_frames: int = _STABLE_FRAMES
+    hash_tolerance: int = _HASH_TOLERANCE
+    roi_template: Optional[Template] = None
+    ref_src: ReferenceSource = ReferenceSource.SPLASH_ARTS
+    shortlist_k: Optional[int] = None
+
+    frames_seen: int = field(default=0, init=False)
+    matched_slots: int = field(default=0, init=False)       # feature-matching runs
+    _slots: List[_Slot] = field(
+        default_factory=lambda: [_Slot() for _ in range(_N_SLOTS)], init=False, repr=False,
+    )
+
+    # ------------------------------------------------------------------ #
+    # State                                                              #
+    # ------------------------------------------------------------------ #
+    @property
+    def locked(self) -> List[bool]:
+        return [s.locked for s in self._slots]
+
+    @property
+    def complete(self) -> bool:
+        """*True* once all ten slots are locked."""
+        return all(s.locked for s in self._slots)
+
+    @property
+    def draft(self) -> Dict[str, List[str]]:
+        """Current best guess per slot, ``{'blue': […], 'red': […]}``."""
+        picks = [s.best for s in self._slots]
+        return {"blue": picks[:5], "red": picks[5:]}
+
+    # ------------------------------------------------------------------ #
+    # Update                                                             #
+    # ------------------------------------------------------------------ #
+    def update(self, frame: np.ndarray) -> Dict[str, List[str]]:
+        """Feed one draft frame and return the updated :attr:`draft`."""
+        self.frames_seen += 1
+        boxes = slot_boxes(frame, self.roi_template)
+        hashes = [_dhash(frame[y1:y2, x1:x2]) for x1, y1, x2, y2 in boxes]
+
+        # cheap re-check of locked slots
+        for slot, h in zip(self._slots, hashes):
+            if slot.locked and bin(slot.hash ^ h).count("1") > self.hash_tolerance:
+                slot.locked, slot.streak = False, 0
+
+        todo = [i for i, s in enumerate(self._slots) if not s.locked]
+        if not todo:
+            return self.draft
+
+        ranked = match_slots(
+            self.wrapper, frame, todo,
+            roi_template=self.roi_template,
+            ref_src=self.ref_src,
+            shortlist_k=self.shortlist_k,
+        )
+        self.matched_slots += len(todo)
+
+        for i in todo:
+            slot = self._slots[i]
+            top  = ranked[i][0][0] if ranked[i] else "?"
+            slot.streak = slot.streak + 1 if top == slot.best and top != "?" else 1 if top != "?" else 0
+            slot.best   = top
+            if slot.streak >= self.stable_frames:
+                slot.locked, slot.hash = True, hashes[i]
+
+        return self.draft
+
+    def reset(self) -> None:
+        self.frames_seen = self.matched_slots = 0
+        self._slots = [_Slot() for _ in range(_N_SLOTS)]
+
+
+__all__ = ["ChampionSelectTracker"]
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Reference descriptor index
+==========================
+
+Champion-select matching compares ten query patches against ~170 reference
+artworks.  Extracting the reference features is by far the expensive part
+and never changes between draft frames, so it is done **once** per
+
+    (Data-Dragon version, reference source, detector, reference resize)
+
+and kept as a :class:`DescriptorIndex`:
+
+* ``descriptors`` – every reference descriptor stacked in one ``(M, D)``
+  array (``float32`` for SIFT/SURF/KAZE, ``uint8`` for binary detectors);
+* ``labels``      – ``(M,)`` champion id of each row;
+* ``offsets``     – ``(C + 1,)`` row range of each champion
+  (rows are grouped by champion);
+* ``names``       – champion keys, indexed by id;
+* ``histograms``  – ``(C, B)`` colour signature of each champion (see
+  :func:`colour_histogram`), used to shortlist candidates cheaply.
+
+:meth:`DescriptorIndex.matcher` wraps the stacked matrix in one trained
+FLANN matcher – a KD-tree forest for float descriptors, LSH tables for
+binary ones – so a query patch needs a single k-NN search instead of one
+brute-force match per champion.
+
+Indexes live in memory for the life of the process and are persisted as
+``.npz`` files under *assets/descriptor_index/*, so a restart only costs
+one ``np.load``.  A persisted index is rebuilt when the reference folder
+changes (its modification time is stored next to the arrays).
+
+The version is read from the local DB (no network; remembered until the
+DB file changes, so a lookup is one ``stat``); when none has been stored
+yet the index is tagged ``"local"``.
+
+Public API
+----------
+``get_descriptor_index(det_name, detector, folder, resize_db, load_images, variant="")``
+``colour_histogram(img) -> np.ndarray``
+``DescriptorIndex``
+``INDEX_DIR``
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+from services.riot_api.riot_versions import get_cached_latest_version
+
+# --------------------------------------------------------------------------- #
+# Paths / constants                                                           #
+# --------------------------------------------------------------------------- #
+BASE_DIR  = Path(__file__).resolve().parents[3]                # …/backend
+INDEX_DIR = BASE_DIR / "assets" / "descriptor_index"
+
+_FLOAT_DETECTORS = ("SIFT", "SURF", "KAZE")
+_DB_SIZE = (100, 100)                  # reference size of the resize_db strategies
+
+# FLANN parameters
+_FLANN_KDTREE = dict(algorithm=1, trees=5)                                  # float
+_FLANN_LSH    = dict(algorithm=6, table_number=6, key_size=12, multi_probe_level=1)  # binary
+_FLANN_SEARCH = dict(checks=50)
+
+_HIST_BINS = (18, 8)                   # hue × saturation bins of the colour signature
+
+IndexKey = Tuple[str, str, str, bool]  # (version, source [+ variant], detector, resize_db)
+
+# --------------------------------------------------------------------------- #
+# Index object                                                                #
+# --------------------------------------------------------------------------- #
+@dataclass(frozen=True)
+class DescriptorIndex:
+    """Stacked reference descriptors of one (version, source, detector, resize)."""
+
+    names: Tuple[str, ...]
+    descriptors: np.ndarray
+    labels: np.ndarray
+    offsets: np.ndarray
+    histograms: np.ndarray
+    stamp: int                         # reference folder mtime at build time
+    _local: threading.local = field(
+        default_factory=threading.local, init=False, repr=False, compare=False,
+    )
+
+    @property
+    def is_binary(self) -> bool:
+        return self.descriptors.dtype == np.uint8
+
+    def matcher(self) -> cv2.FlannBasedMatcher:
+        """
+        FLANN matcher trained on every reference descriptor.  ``trainIdx``
+        of its matches indexes ``labels``.
+
+        OpenCV matchers are not safe to query from several threads, so each
+        thread lazily trains and keeps its own instance.
+        """
+        m = getattr(self._local, "flann", None)
+        if m is None:
+            params = _FLANN_LSH if self.is_binary else _FLANN_KDTREE
+            m = cv2.FlannBasedMatcher(params, _FLANN_SEARCH)
+            m.add([self.descriptors])
+            m.train()
+            self._local.flann = m
+        return m
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def champion(self, i: int) -> np.ndarray:
+        """Descriptors of champion *i* (may be empty)."""
+        return self.descriptors[self.offsets[i]:self.offsets[i + 1]]
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.stem + ".tmp.npz")
+        np.savez(
+            tmp,
+            names=np.array(self.names, dtype=str),
+            descriptors=self.descriptors,
+            labels=self.labels,
+            offsets=self.offsets,
+            histograms=self.histograms,
+            stamp=np.int64(self.stamp),
+        )
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "DescriptorIndex":
+        with np.load(path, allow_pickle=False) as z:
+            return cls(
+                names=tuple(str(n) for n in z["names"]),
+                descriptors=z["descriptors"],
+                labels=z["labels"],
+                offsets=z["offsets"],
+                histograms=z["histograms"],
+                stamp=int(z["stamp"]),
+            )
+
+
+# --------------------------------------------------------------------------- #
+# Build                                                                       #
+# --------------------------------------------------------------------------- #
+def colour_histogram(img: np.ndarray) -> np.ndarray:
+    """
+    Hue × saturation histogram of a BGR image, square-rooted and
+    L2-normalised: the dot product of two signatures is their
+    Bhattacharyya coefficient (1 = identical colour distribution).
+    """
+    hsv  = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
+    hist = cv2.calcHist([hsv], [0, 1], None, list(_HIST_BINS), [0, 180, 0, 256]).ravel()
+    hist = np.sqrt(hist / max(hist.sum(), 1.0))
+    return (hist / max(np.linalg.norm(hist), 1e-12)).astype(np.float32)
+
+
+def _build(
+    det_name: str,
+    detector: cv2.Feature2D,
+    images: Dict[str, np.ndarray],
+    resize_db: bool,
+    stamp: int,
+) -> DescriptorIndex:
+    dim   = detector.descriptorSize()
+    dtype = np.float32 if det_name in _FLOAT_DETECTORS else np.uint8
+
+    names: List[str] = sorted(images)
+    blocks: List[np.ndarray] = []
+    offsets = [0]
+    for name in names:
+        img = images[name]
+        if resize_db:
+            img = cv2.resize(img, _DB_SIZE)
+        _, des = detector.detectAndCompute(img, None)
+        des = np.empty((0, dim), dtype) if des is None else des.astype(dtype, copy=False)
+        blocks.append(des)
+        offsets.append(offsets[-1] + len(des))
+
+    counts = np.diff(offsets)
+    return DescriptorIndex(
+        names=tuple(names),
+        descriptors=np.concatenate(blocks) if blocks else np.empty((0, dim), dtype),
+        labels=np.repeat(np.arange(len(names), dtype=np.int32), counts),
+        offsets=np.asarray(offsets, dtype=np.int64),
+        histograms=(
+            np.stack([colour_histogram(images[n]) for n in names])
+            if names else np.empty((0, _HIST_BINS[0] * _HIST_BINS[1]), np.float32)
+        ),
+        stamp=stamp,
+    )
+
+
+# --------------------------------------------------------------------------- #
+# Cache                                                                       #
+# --------------------------------------------------------------------------- #
+_lock = threading.Lock()
+_indexes: Dict[IndexKey, DescriptorIndex] = {}
+
+
+def _file_for(key: IndexKey) -> Path:
+    version, source, det_name, resize_db = key
+    return INDEX_DIR / f"{version}_{source}_{det_name}_{'db100' if resize_db else 'raw'}.npz"
+
+
+def get_descriptor_index(
+    det_name: str,
+    detector: cv2.Feature2D,
+    folder: Path,
+    resize_db: bool,
+    load_images: Callable[[], Dict[str, np.ndarray]],
+    variant: str = "",
+) -> DescriptorIndex:
+    """
+    Return the index of *folder*'s artwork for *det_name*, building it on
+    the first request (*load_images* is only called then).  *variant*
+    tags indexes built from a transformed copy of the folder (e.g. the
+    pre-resized reference atlas) so they never mix with the originals.
+
+    Lookup order: memory → ``.npz`` on disk → build (and persist).
+    """
+    folder = Path(folder)
+    source = f"{folder.name}-{variant}" if variant else folder.name
+    key: IndexKey = (get_cached_latest_version() or "local", source, det_name, resize_db)
+    stamp = folder.stat().st_mtime_ns
+
+    idx = _indexes.get(key)
+    if idx is not None and idx.stamp == stamp:
+        return idx
+
+    with _lock:
+        idx = _indexes.get(key)
+        if idx is not None and idx.stamp == stamp:
+            return idx
+
+        path = _file_for(key)
+        if path.exists():
+            try:
+                idx = DescriptorIndex.load(path)
+            except (OSError, ValueError, KeyError) as exc:
+                print(f"⚠️  Ignoring unreadable descriptor index {path.name}: {exc}")
+                idx = None
+        if idx is None or idx.stamp != stamp:
+            print(f"↻ Building {det_name} descriptor index ({key[0]}, {source}) …")
+            idx = _build(det_name, detector, load_images(), resize_db, stamp)
+            try:
+                idx.save(path)
+            except OSError as exc:
+                print(f"⚠️  Could not persist descriptor index: {exc}")
+
+        _indexes[key] = idx
+        return idx
+
+
+__all__ = ["DescriptorIndex", "INDEX_DIR", "colour_histogram", "get_descriptor_index"]
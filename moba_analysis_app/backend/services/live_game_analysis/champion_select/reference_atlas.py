@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Reference image atlas
+=====================
+
+Decoding ~170 full-resolution splash arts into a fresh dict on every
+request costs hundreds of MB per worker process.  This module packs one
+reference folder into a single pre-resized ``uint8`` atlas:
+
+* ``<source>.npy``  – ``(C, H, W, 3)`` BGR array; every image is shrunk so
+  its longest side is at most ``max_side`` px (never enlarged) and padded
+  to the common ``H × W`` at the bottom / right;
+* ``<source>.json`` – champion names, the real ``(h, w)`` of every image,
+  ``max_side`` and the source folder's modification time.
+
+Workers open the ``.npy`` with ``np.load(mmap_mode="r")``: pages are shared
+through the OS cache by every process and images are zero-copy views.
+An atlas is ignored (with a warning) once its folder has changed since the
+build, and callers fall back to decoding the files.
+
+Build it after downloading new artwork::
+
+    python -m services.live_game_analysis.champion_select.reference_atlas \\
+        --source splash_arts --max-side 640
+
+Public API
+----------
+``build_atlas(source, max_side=640) -> Path``
+``open_atlas(source) -> ReferenceAtlas | None``
+``ReferenceAtlas``
+``ATLAS_DIR``
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+from services.riot_api.riot_champions_images import ICON_DIR, LOADING_DIR, SPLASH_DIR
+
+# --------------------------------------------------------------------------- #
+# Paths / constants                                                           #
+# --------------------------------------------------------------------------- #
+BASE_DIR  = Path(__file__).resolve().parents[3]                # …/backend
+ATLAS_DIR = BASE_DIR / "assets" / "reference_atlas"
+
+_SOURCES: Dict[str, Path] = {
+    "icons":           ICON_DIR,
+    "splash_arts":     SPLASH_DIR,
+    "loading_screens": LOADING_DIR,
+}
+
+_MAX_SIDE = 640                        # longest side of an atlas image (px)
+
+# --------------------------------------------------------------------------- #
+# Atlas object                                                                #
+# --------------------------------------------------------------------------- #
+@dataclass(frozen=True)
+class ReferenceAtlas:
+    """Read-only, memory-mapped reference images of one source."""
+
+    source: str
+    names: Tuple[str, ...]
+    sizes: np.ndarray                  # (C, 2) real (h, w) of every image
+    pixels: np.ndarray                 # (C, H, W, 3) uint8, memory-mapped
+    max_side: int
+    stamp: int                         # source folder mtime at build time
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def image(self, i: int) -> np.ndarray:
+        """Unpadded view of image *i* (no copy)."""
+        h, w = self.sizes[i]
+        return self.pixels[i, :h, :w]
+
+    def as_dict(self) -> Dict[str, np.ndarray]:
+        """``{champion_key → BGR view}`` – same shape as ``load_reference_images``."""
+        return {name: self.image(i) for i, name in enumerate(self.names)}
+
+
+# --------------------------------------------------------------------------- #
+# Build                                                                       #
+# --------------------------------------------------------------------------- #
+def _folder_for(source: str) -> Path:
+    try:
+        return _SOURCES[source]
+    except KeyError:
+        raise ValueError(f"Unknown reference source '{source}'.") from None
+
+
+def _paths_for(source: str) -> Tuple[Path, Path]:
+    return ATLAS_DIR / f"{source}.npy", ATLAS_DIR / f"{source}.json"
+
+
+def _fit(img: np.ndarray, max_side: int) -> np.ndarray:
+    h, w = img.shape[:2]
+    scale = max_side / max(h, w)
+    if scale >= 1.0:
+        return img
+    return cv2.resize(img, (max(1, round(w * scale)), max(1, round(h * scale))),
+                      interpolation=cv2.INTER_AREA)
+
+
+def build_atlas(source: str, max_side: int = _MAX_SIDE) -> Path:
+    """
+    Decode, resize and pack every image of *source* (``"icons"``,
+    ``"splash_arts"`` or ``"loading_screens"``); return the ``.npy`` path.
+    """
+    folder = _folder_for(source)
+    stamp  = folder.stat().st_mtime_ns
+
+    names: List[str] = []
+    images: List[np.ndarray] = []
+    for fp in sorted(glob.glob(os.path.join(folder, "*"))):
+        if fp.lower().endswith((".png", ".jpg", ".jpeg")):
+            img = cv2.imread(fp)
+            if img is not None:
+                names.append(Path(fp).stem.split("_")[0].lower())
+                images.append(_fit(img, max_side))
+    if not images:
+        raise FileNotFoundError(f"No reference images found in {folder}.")
+
+    sizes = np.array([im.shape[:2] for im in images], dtype=np.int32)
+    H, W  = sizes.max(axis=0)
+    pixels = np.zeros((len(images), H, W, 3), np.uint8)
+    for i, im in enumerate(images):
+        pixels[i, :im.shape[0], :im.shape[1]] = im
+
+    npy, meta = _paths_for(source)
+    npy.parent.mkdir(parents=True, exist_ok=True)
+    tmp_npy  = npy.with_name(npy.stem + ".tmp.npy")
+    tmp_meta = meta.with_name(meta.stem + ".tmp.json")
+    np.save(tmp_npy, pixels)
+    tmp_meta.write_text(json.dumps({
+        "source": source,
+        "names": names,
+        "sizes": sizes.tolist(),
+        "max_side": max_side,
+        "stamp": stamp,
+    }), encoding="utf-8")
+    # invalidate the metadata first so no reader pairs new pixels with old sizes
+    meta.unlink(missing_ok=True)
+    tmp_npy.replace(npy)
+    tmp_meta.replace(meta)
+
+    with _lock:
+        _atlases.pop(source, None)
+    print(f"✔ Atlas {source}: {len(names)} images, {pixels.nbytes / 2**20:.1f} MiB → {npy}")
+    return npy
+
+
+# --------------------------------------------------------------------------- #
+# Open (per-process cache)                                                    #
+# --------------------------------------------------------------------------- #
+_lock = threading.Lock()
+_atlases: Dict[str, ReferenceAtlas] = {}
+_stale_warned: set[Tuple[str, int]] = set()
+
+
+def open_atlas(source: str) -> ReferenceAtlas | None:
+    """
+    Memory-map the atlas of *source*; *None* when it has not been built or
+    the source folder changed since the build.
+    """
+    stamp = _folder_for(source).stat().st_mtime_ns
+    atlas = _atlases.get(source)
+    if atlas is not None and atlas.stamp == stamp:
+        return atlas
+
+    npy, meta_path = _paths_for(source)
+    if not (npy.exists() and meta_path.exists()):
+        return None
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta["stamp"] != stamp:
+            if (source, stamp) not in _stale_warned:
+                _stale_warned.add((source, stamp))
+                print(f"⚠️  Reference atlas '{source}' is stale; rebuild it with build_atlas().")
+            return None
+        atlas = ReferenceAtlas(
+            source=source,
+            names=tuple(meta["names"]),
+            sizes=np.asarray(meta["sizes"], dtype=np.int32),
+            pixels=np.load(npy, mmap_mode="r"),
+            max_side=int(meta["max_side"]),
+            stamp=stamp,
+        )
+    except (OSError, ValueError, KeyError) as exc:
+        print(f"⚠️  Ignoring unreadable reference atlas '{source}': {exc}")
+        return None
+
+    with _lock:
+        _atlases[source] = atlas
+    return atlas
+
+
+# --------------------------------------------------------------------------- #
+# CLI                                                                         #
+# --------------------------------------------------------------------------- #
+def _main() -> None:
+    ap = argparse.ArgumentParser(description="Build memory-mapped reference atlases.")
+    ap.add_argument("--source", choices=sorted(_SOURCES), action="append",
+                    help="reference source to pack (repeatable; default: all)")
+    ap.add_argument("--max-side", type=int, default=_MAX_SIDE,
+                    help=f"longest side of every packed image (default: {_MAX_SIDE})")
+    args = ap.parse_args()
+
+    for source in args.source or sorted(_SOURCES):
+        try:
+            build_atlas(source, args.max_side)
+        except FileNotFoundError as exc:
+            print(f"⚠️  {exc}")
+
+
+__all__ = ["ATLAS_DIR", "ReferenceAtlas", "build_atlas", "open_atlas"]
+
+if __name__ == "__main__":
+    _main()
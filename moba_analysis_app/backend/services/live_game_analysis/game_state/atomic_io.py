@@ -0,0 +1,141 @@
+"""
+services/live_game_analysis/game_state/atomic_io.py
+===================================================
+
+Crash- and concurrency-safe file primitives for the game-state store.
+
+* :func:`atomic_write_text` – write to a unique temporary file in the same
+  directory, ``fsync`` it and ``os.replace`` it over the target: readers
+  see either the old or the new document, never a torn one, and two
+  processes writing at once cannot clobber each other's temporary file.
+* :class:`FileLock` – advisory lock on a side file, exclusive **across
+  processes** (``fcntl.flock`` on POSIX, ``msvcrt.locking`` on Windows) and
+  re-entrant **within** the process (a thread that holds it may take it
+  again).  :func:`lock_for` hands out one shared instance per path.
+
+Advisory locks only protect against writers that take them too; every
+game-state writer goes through :mod:`snapshot_log` (or the SQLite store,
+which has its own locking).
+
+Public API
+----------
+``atomic_write_text(path, text)``
+``FileLock(path)`` / ``lock_for(path) -> FileLock``
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import IO, Any, Dict
+
+try:                                        # POSIX
+    import fcntl
+
+    def _lock_fh(fh: IO[bytes]) -> None:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_fh(fh: IO[bytes]) -> None:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+except ImportError:                         # Windows
+    import msvcrt
+
+    def _lock_fh(fh: IO[bytes]) -> None:
+        fh.seek(0)
+        while True:
+            try:
+                msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+                return
+            except OSError:
+                time.sleep(0.02)
+
+    def _unlock_fh(fh: IO[bytes]) -> None:
+        fh.seek(0)
+        msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+# --------------------------------------------------------------------- #
+# Atomic replace                                                        #
+# --------------------------------------------------------------------- #
+def atomic_write_text(path: Path, text: str, encoding: str = "utf-8") -> None:
+    """Replace *path* with *text* in one step (see module docstring)."""
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding=encoding) as fh:
+            fh.write(text)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+# --------------------------------------------------------------------- #
+# Locks                                                                 #
+# --------------------------------------------------------------------- #
+class FileLock:
+    """Cross-process, thread-re-entrant advisory lock on *path*."""
+
+    __slots__ = ("path", "_rlock", "_depth", "_fh")
+
+    def __init__(self, path: Path) -> None:
+        self.path   = Path(path)
+        self._rlock = threading.RLock()
+        self._depth = 0
+        self._fh: IO[bytes] | None = None
+
+    def acquire(self) -> None:
+        self._rlock.acquire()
+        if self._depth == 0:
+            try:
+                fh = open(self.path, "a+b")
+                try:
+                    _lock_fh(fh)
+                except BaseException:
+                    fh.close()
+                    raise
+            except BaseException:
+                self._rlock.release()
+                raise
+            self._fh = fh
+        self._depth += 1
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0 and self._fh is not None:
+            try:
+                _unlock_fh(self._fh)
+            finally:
+                self._fh.close()
+                self._fh = None
+        self._rlock.release()
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.release()
+
+
+_locks: Dict[Path, FileLock] = {}
+_locks_guard = threading.Lock()
+
+
+def lock_for(path: Path) -> FileLock:
+    """The process-wide :class:`FileLock` of *path*."""
+    path = Path(path).resolve()
+    with _locks_guard:
+        lk = _locks.get(path)
+        if lk is None:
+            lk = _locks[path] = FileLock(path)
+        return lk
+
+
+__all__ = ["FileLock", "atomic_write_text", "lock_for"]
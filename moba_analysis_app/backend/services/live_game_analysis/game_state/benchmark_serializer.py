@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Game-State Serializer Benchmark
+===============================
+
+Micro-benchmark of the domain-model (de)serialisation in
+:mod:`game_state`, against the previous ``dataclasses.asdict`` based
+serializer (kept below as :func:`_reference_to_json_compat`).
+
+Measured per snapshot
+---------------------
+* ``serialize_us``      – median :func:`to_json_compat` time, current vs
+  reference;
+* ``serialize_peak_kib`` – peak traced allocation during one call
+  (:mod:`tracemalloc`, temporaries included), current vs reference;
+* ``deserialize_us``    – median :func:`snapshot_from_json` time;
+* ``instance_bytes``    – size of one ``PlayerStats`` / ``TeamStats``
+  instance, slotted vs an equivalent ``__dict__`` dataclass.
+
+Usage::
+
+    python -m services.live_game_analysis.game_state.benchmark_serializer \\
+        --repeat 2000 --out results/serializer.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, fields, is_dataclass, make_dataclass
+from datetime import timedelta
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from services.live_game_analysis.game_state.game_state import (
+    GameSnapshot,
+    PlayerStats,
+    Role,
+    TeamStats,
+    snapshot_from_json,
+    to_json_compat,
+)
+
+
+# --------------------------------------------------------------------------- #
+# Reference implementation (before slots / single-pass encoding)              #
+# --------------------------------------------------------------------------- #
+def _reference_to_json_compat(obj: Any) -> Any:
+    if is_dataclass(obj):
+        return {k: _reference_to_json_compat(v) for k, v in asdict(obj).items()}
+    if isinstance(obj, Enum):
+        return obj.name
+    if isinstance(obj, timedelta):
+        return int(obj.total_seconds())
+    if isinstance(obj, dict):
+        return {_reference_to_json_compat(k): _reference_to_json_compat(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_reference_to_json_compat(v) for v in obj]
+    return obj
+
+
+# --------------------------------------------------------------------------- #
+# Fixture                                                                     #
+# --------------------------------------------------------------------------- #
+def _sample_snapshot() -> GameSnapshot:
+    """A fully populated late-game frame."""
+    snap = GameSnapshot()
+    for i, team in enumerate((snap.blue, snap.red)):
+        for j, role in enumerate(Role):
+            p = team.players[role]
+            p.health_pct, p.mana_pct, p.position = 80.5 - j, 42.0 + j, (100 + j, 200 + i)
+            p.kills, p.deaths, p.assists, p.cs, p.gold = j, i, j + i, 150 + 10 * j, 9_000 + j
+        team.stats.total_kills, team.stats.total_gold, team.stats.towers = 12, 48_000, 5
+    snap.global_.baron_timer = timedelta(minutes=4, seconds=12)
+    return snap
+
+
+# --------------------------------------------------------------------------- #
+# Measurements                                                                #
+# --------------------------------------------------------------------------- #
+def _median_us(fn: Callable[[], Any], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return round(statistics.median(samples) * 1e6, 2)
+
+
+def _peak_kib(fn: Callable[[], Any]) -> float:
+    fn()                                                # warm the encoder cache
+    tracemalloc.start()
+    try:
+        fn()
+        return round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+    finally:
+        tracemalloc.stop()
+
+
+def _instance_bytes(cls: type) -> Dict[str, int]:
+    plain = make_dataclass(cls.__name__, [(f.name, Any, None) for f in fields(cls)])()
+    return {
+        "current": sys.getsizeof(cls()),
+        "reference": sys.getsizeof(plain) + sys.getsizeof(plain.__dict__),
+    }
+
+
+def run(repeat: int) -> Dict[str, Any]:
+    snap = _sample_snapshot()
+    doc = to_json_compat(snap)
+    if doc != _reference_to_json_compat(snap):
+        raise AssertionError("serializer output differs from the reference")
+
+    return {
+        "serialize_us": {
+            "current": _median_us(lambda: to_json_compat(snap), repeat),
+            "reference": _median_us(lambda: _reference_to_json_compat(snap), repeat),
+        },
+        "serialize_peak_kib": {
+            "current": _peak_kib(lambda: to_json_compat(snap)),
+            "reference": _peak_kib(lambda: _reference_to_json_compat(snap)),
+        },
+        "deserialize_us": {"current": _median_us(lambda: snapshot_from_json(doc), repeat)},
+        "instance_bytes": {
+            "PlayerStats": _instance_bytes(PlayerStats),
+            "TeamStats": _instance_bytes(TeamStats),
+        },
+    }
+
+
+# --------------------------------------------------------------------------- #
+# CLI                                                                         #
+# --------------------------------------------------------------------------- #
+def main(argv: List[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark game-state (de)serialisation.")
+    ap.add_argument("--repeat", type=int, default=2000, help="timed calls per measurement")
+    ap.add_argument("--out", type=Path, help="write the results as JSON")
+    args = ap.parse_args(argv)
+
+    results = run(args.repeat)
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(text, encoding="utf-8")
+        print(f"✔ Results written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
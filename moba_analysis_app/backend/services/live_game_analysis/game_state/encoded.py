@@ -0,0 +1,119 @@
+"""
+services/live_game_analysis/game_state/encoded.py
+=================================================
+
+Pre-serialised, pre-compressed response bodies.
+
+Reading a match used to load the document into Python objects and let the
+web layer encode it again on every request.  An :class:`Encoded` holds
+the UTF-8 JSON bytes of one revision once, plus each compressed variant
+the first time a client asks for it – ``gzip`` always, ``br`` when the
+optional :mod:`brotli` package is installed.  Callers keep one per match
+and revision and return its bytes as they are.
+
+Bodies smaller than ``GAME_STATE_COMPRESS_MIN`` bytes (default 1024) are
+never compressed: the framing would outweigh the savings.
+
+Environment
+-----------
+GAME_STATE_COMPRESS_MIN   – smallest body worth compressing (bytes)
+GAME_STATE_GZIP_LEVEL     – 1-9, default 6
+GAME_STATE_BROTLI_QUALITY – 0-11, default 5
+
+Public API
+----------
+``Encoded(raw)``                 – ``.get(encoding) -> (body, encoding)``
+``dumps(obj) -> bytes``          – compact UTF-8 JSON
+``negotiate(accept_encoding) -> str``
+``ENCODINGS``                    – content codings available here
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import threading
+from typing import Any, Dict, Tuple
+
+try:                                        # optional: pip install brotli
+    import brotli
+except ImportError:                         # pragma: no cover
+    brotli = None
+
+# --------------------------------------------------------------------- #
+# Configuration                                                         #
+# --------------------------------------------------------------------- #
+_COMPRESS_MIN   = int(os.getenv("GAME_STATE_COMPRESS_MIN", 1024))     # bytes
+_GZIP_LEVEL     = int(os.getenv("GAME_STATE_GZIP_LEVEL", 6))
+_BROTLI_QUALITY = int(os.getenv("GAME_STATE_BROTLI_QUALITY", 5))
+
+# preferred first
+ENCODINGS: Tuple[str, ...] = (("br",) if brotli is not None else ()) + ("gzip", "identity")
+
+
+def _compress(raw: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(raw, quality=_BROTLI_QUALITY)
+    return gzip.compress(raw, compresslevel=_GZIP_LEVEL, mtime=0)
+
+
+# --------------------------------------------------------------------- #
+# Public API                                                            #
+# --------------------------------------------------------------------- #
+def dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def negotiate(accept_encoding: str | None) -> str:
+    """
+    Best of :data:`ENCODINGS` allowed by an ``Accept-Encoding`` header
+    (q-values honoured, ``*`` understood); ``identity`` otherwise.
+    """
+    if not accept_encoding:
+        return "identity"
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        for p in params.split(";"):
+            key, _, val = p.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(val)
+                except ValueError:
+                    q = 0.0
+        weights[name.strip().lower()] = q
+    star = weights.get("*", 0.0)
+    best, best_q = "identity", 0.0
+    for enc in ENCODINGS[:-1]:
+        q = weights.get(enc, star)
+        if q > best_q:
+            best, best_q = enc, q
+    return best
+
+
+class Encoded:
+    """The JSON bytes of one document and their compressed variants (lazy)."""
+
+    __slots__ = ("raw", "_variants", "_lock")
+
+    def __init__(self, raw: bytes) -> None:
+        self.raw = raw
+        self._variants: Dict[str, bytes] = {"identity": raw}
+        self._lock = threading.Lock()
+
+    def get(self, encoding: str) -> Tuple[bytes, str]:
+        """``(body, encoding actually used)`` – small bodies stay ``identity``."""
+        if encoding not in ENCODINGS or len(self.raw) < _COMPRESS_MIN:
+            encoding = "identity"
+        body = self._variants.get(encoding)
+        if body is None:
+            with self._lock:                        # compress once, even under concurrency
+                body = self._variants.get(encoding)
+                if body is None:
+                    body = self._variants[encoding] = _compress(self.raw, encoding)
+        return body, encoding
+
+
+__all__ = ["ENCODINGS", "Encoded", "dumps", "negotiate"]
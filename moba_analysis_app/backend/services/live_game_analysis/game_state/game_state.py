@@ -12,7 +12,11 @@ network, or external-service code — just plain data-structures that:
 * track the in-game, frame-by-frame evolution
   (``GameSnapshot`` → ``GameTimeline``);
 * can be **losslessly** serialised to / from JSON using
-  :func:`to_json_compat`.
+  :func:`to_json_compat` and rebuilt with :func:`timeline_from_json` /
+  :func:`snapshot_from_json`;
+* can be viewed **column-wise** (:class:`ColumnarTimeline`): one sorted
+  seconds index plus one NumPy array per HUD metric, for vectorised
+  range queries, resampling and diffs.
 
 All numeric fields use raw, game units:
 
@@ -23,12 +27,16 @@ All numeric fields use raw, game units:
 
 from __future__ import annotations
 
+import copy
 import json
-from dataclasses import dataclass, field, asdict, is_dataclass
+import re
+from dataclasses import dataclass, field, fields, is_dataclass
 from datetime import timedelta
 from enum import Enum, auto
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
 
 # ─────────────────────────────── Enums ────────────────────────────────
 class TeamColor(Enum):
@@ -49,7 +57,7 @@ class Role(Enum):
 
 
 # ───────────────────────────── Base entities ──────────────────────────
-@dataclass
+@dataclass(slots=True)
 class PlayerStats:
     """Per-player dynamic numbers captured from the HUD overlay."""
 
@@ -63,7 +71,7 @@ class PlayerStats:
     gold: Optional[int] = None                  # personal gold
 
 
-@dataclass
+@dataclass(slots=True)
 class TeamStats:
     """Aggregated team counters extracted from the top HUD bar."""
 
@@ -74,7 +82,7 @@ class TeamStats:
 
 
 # ───────────────────────────── Global timers ──────────────────────────
-@dataclass
+@dataclass(slots=True)
 class GlobalTimers:
     """Respawn timers for neutral objectives (nil → timer hidden)."""
 
@@ -86,7 +94,7 @@ class GlobalTimers:
 
 
 # ───────────────────────────── Team wrapper ───────────────────────────
-@dataclass
+@dataclass(slots=True)
 class Team:
     """Dynamic team container: five players + rolling counters."""
 
@@ -98,7 +106,7 @@ class Team:
 
 
 # ───────────────────────────── Draft section ──────────────────────────
-@dataclass
+@dataclass(slots=True)
 class StaticTeamInfo:
     """Data decided during champion-select and never changes afterwards."""
 
@@ -109,7 +117,7 @@ class StaticTeamInfo:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class StaticGameInfo:
     """Both sides’ immutable draft information."""
 
@@ -118,7 +126,7 @@ class StaticGameInfo:
 
 
 # ───────────────────────────── Live snapshot ──────────────────────────
-@dataclass
+@dataclass(slots=True)
 class GameSnapshot:
     """All HUD-visible data for a single video frame."""
 
@@ -128,7 +136,7 @@ class GameSnapshot:
 
 
 # ───────────────────────────── Timeline root ──────────────────────────
-@dataclass
+@dataclass(slots=True)
 class GameTimeline:
     """
     Complete match timeline.
@@ -152,7 +160,7 @@ class GameTimeline:
             total = int(ts)
         else:  # already 'MM:SS'
             return ts
-        return f"{total // 60:02d}:{total % 60:02d}"
+        return format_timer(total)
 
     def add_snapshot(self, match_timer: float | timedelta | str, snapshot: GameSnapshot) -> None:
         """Insert / overwrite a snapshot at ``match_timer``."""
@@ -160,6 +168,51 @@ class GameTimeline:
 
 
 # ───────────────────────────── JSON serialiser ─────────────────────────
+# One encoder per concrete type, resolved on first sight and cached: a
+# dataclass is walked field by field in a single pass (``asdict`` used to
+# deep-copy the whole tree first and have it walked a second time).
+_Encoder = Callable[[Any], Any]
+_ENCODERS: Dict[type, _Encoder] = {}
+
+
+def _identity(obj: Any) -> Any:
+    return obj
+
+
+def _encode_dict(obj: Dict[Any, Any]) -> Dict[Any, Any]:
+    return {to_json_compat(k): to_json_compat(v) for k, v in obj.items()}
+
+
+def _encode_seq(obj: Any) -> List[Any]:
+    return [to_json_compat(v) for v in obj]
+
+
+def _dataclass_encoder(cls: type) -> _Encoder:
+    names = tuple(f.name for f in fields(cls))
+
+    def encode(obj: Any) -> Dict[str, Any]:
+        return {n: to_json_compat(getattr(obj, n)) for n in names}
+
+    return encode
+
+
+def _resolve_encoder(cls: type) -> _Encoder:
+    if is_dataclass(cls):
+        enc = _dataclass_encoder(cls)
+    elif issubclass(cls, Enum):
+        enc = lambda obj: obj.name                              # noqa: E731
+    elif issubclass(cls, timedelta):
+        enc = lambda obj: int(obj.total_seconds())              # noqa: E731
+    elif issubclass(cls, dict):
+        enc = _encode_dict
+    elif issubclass(cls, (list, tuple)):
+        enc = _encode_seq
+    else:
+        enc = _identity                                         # primitives
+    _ENCODERS[cls] = enc
+    return enc
+
+
 def to_json_compat(obj: Any) -> Any:
     """
     Recursively convert dataclasses, Enums, timedeltas… into plain
@@ -167,19 +220,346 @@ def to_json_compat(obj: Any) -> Any:
 
     The output is guaranteed to be accepted by :pyfunc:`json.dumps`.
     """
-    if is_dataclass(obj):
-        return {k: to_json_compat(v) for k, v in asdict(obj).items()}
+    enc = _ENCODERS.get(type(obj))
+    return enc(obj) if enc is not None else _resolve_encoder(type(obj))(obj)
+
+
+# ───────────────────────────── JSON deserialiser ───────────────────────
+# The inverse of :func:`to_json_compat` for this model.  Keys that are
+# missing (partial HUD snapshots) keep the dataclass defaults; keys the
+# model does not know are ignored.
+def _player_from_json(d: Dict[str, Any]) -> PlayerStats:
+    pos = d.get("position")
+    return PlayerStats(
+        d.get("health_pct"), d.get("mana_pct"),
+        tuple(pos) if pos is not None else None,
+        d.get("kills"), d.get("deaths"), d.get("assists"), d.get("cs"), d.get("gold"),
+    )
+
+
+def _team_from_json(d: Dict[str, Any], color: TeamColor) -> Team:
+    team = Team(TeamColor[d["color"]] if d.get("color") else color)
+    for role, rec in (d.get("players") or {}).items():
+        if role in Role.__members__ and isinstance(rec, dict):
+            team.players[Role[role]] = _player_from_json(rec)
+    st = d.get("stats") or {}
+    team.stats = TeamStats(st.get("total_kills"), st.get("total_gold"), st.get("towers"), st.get("objectives"))
+    return team
+
+
+def _timers_from_json(d: Dict[str, Any]) -> GlobalTimers:
+    return GlobalTimers(*(
+        timedelta(seconds=v) if v is not None else None
+        for v in (d.get(f.name) for f in fields(GlobalTimers))
+    ))
+
+
+def snapshot_from_json(d: Dict[str, Any]) -> GameSnapshot:
+    """``GameSnapshot`` from one ``live_game_info`` entry."""
+    return GameSnapshot(
+        _team_from_json(d.get("blue") or {}, TeamColor.BLUE),
+        _team_from_json(d.get("red") or {}, TeamColor.RED),
+        _timers_from_json(d.get("global_") or {}),
+    )
+
+
+def _static_team_from_json(d: Dict[str, Any], color: TeamColor) -> StaticTeamInfo:
+    info = StaticTeamInfo(TeamColor[d["color"]] if d.get("color") else color, d.get("team_name", ""))
+    for role, champ in (d.get("champions") or {}).items():
+        if role in Role.__members__:
+            info.champions[Role[role]] = champ
+    return info
+
+
+def timeline_from_json(doc: Dict[str, Any]) -> GameTimeline:
+    """
+    ``GameTimeline`` from a ``game_state.json`` document.  Entries that are
+    not snapshots (the ``"winner"`` marker) are kept as they are.
+    """
+    static = doc.get("static_game_info") or {}
+    tl = GameTimeline(StaticGameInfo(
+        _static_team_from_json(static.get("blue") or {}, TeamColor.BLUE),
+        _static_team_from_json(static.get("red") or {}, TeamColor.RED),
+    ))
+    for key, frame in (doc.get("live_game_info") or {}).items():
+        tl.live_game_info[key] = snapshot_from_json(frame) if isinstance(frame, dict) else frame
+    return tl
+
+
+# ───────────────────────────── Columnar view ───────────────────────────
+_TIMER_RE = re.compile(r"^(\d{1,3}):(\d{2})$")
+
 
-    if isinstance(obj, Enum):
-        return obj.name
+def parse_timer(key: str) -> Optional[int]:
+    """``"MM:SS"`` → seconds; *None* for markers such as ``"startGame"``."""
+    m = _TIMER_RE.match(key)
+    return int(m.group(1)) * 60 + int(m.group(2)) if m else None
 
-    if isinstance(obj, timedelta):
-        return int(obj.total_seconds())
 
-    if isinstance(obj, dict):
-        return {to_json_compat(k): to_json_compat(v) for k, v in obj.items()}
+def format_timer(seconds: int) -> str:
+    """Seconds → ``"MM:SS"`` (the inverse of :func:`parse_timer`)."""
+    return f"{seconds // 60:02d}:{seconds % 60:02d}"
 
-    if isinstance(obj, (list, tuple)):
-        return [to_json_compat(v) for v in obj]
 
-    return obj  # primitives are returned unchanged
+class ColumnarTimeline:
+    """
+    Column-oriented view of ``live_game_info``.
+
+    ``seconds`` is a sorted ``int64`` index (one entry per ``"MM:SS"``
+    frame) and ``data[metric]`` a ``float64`` array of shape
+    ``(len(seconds), 2, 5)`` – axis 1 follows :attr:`TEAMS`, axis 2
+    :class:`Role` order.  A value the HUD did not report (missing key or
+    ``null``) is ``NaN``; counters are kept as floats too so gaps stay
+    representable (exact up to 2**53).
+
+    :meth:`from_json` remembers everything the arrays do not hold – static
+    info, ``startGame`` / ``endGame`` / ``winner``, other fields, key order,
+    whether a number was an ``int`` or a ``float`` – so
+    ``ColumnarTimeline.from_json(doc).to_json() == doc``, byte for byte
+    once dumped.  Timelines derived by :meth:`resample` have no such
+    remainder and serialise to plain ``{team: {"players": …}}`` frames.
+    """
+
+    TEAMS: Tuple[str, ...] = ("blue", "red")
+    ROLES: Tuple[str, ...] = tuple(r.name for r in Role)
+    METRICS: Tuple[str, ...] = ("health_pct", "mana_pct", "kills", "cs", "gold")
+    COUNTERS = frozenset({"kills", "cs", "gold"})
+    RESAMPLING: Tuple[str, ...] = ("ffill", "linear")
+
+    __slots__ = ("seconds", "data", "_keys", "_frames", "_doc")
+
+    def __init__(
+        self,
+        seconds: Iterable[int],
+        data: Optional[Dict[str, np.ndarray]] = None,
+        *,
+        _keys: Optional[List[str]] = None,
+        _frames: Optional[List[Tuple[str, Any]]] = None,
+        _doc: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.seconds = np.asarray(seconds, dtype=np.int64)
+        n = len(self.seconds)
+        if n and np.any(np.diff(self.seconds) < 0):
+            raise ValueError("seconds must be sorted")
+        shape = (n, len(self.TEAMS), len(self.ROLES))
+        self.data: Dict[str, np.ndarray] = {}
+        for metric in self.METRICS:
+            arr = (data or {}).get(metric)
+            arr = np.full(shape, np.nan) if arr is None else np.asarray(arr, dtype=np.float64)
+            if arr.shape != shape:
+                raise ValueError(f"{metric}: expected shape {shape}, got {arr.shape}")
+            self.data[metric] = arr
+        self._keys   = _keys                 # frame key of every row
+        self._frames = _frames               # (key, skeleton) in document order
+        self._doc    = _doc                  # document minus live_game_info
+
+    # ------------------------------------------------------------------ #
+    # JSON ⇄ columns                                                     #
+    # ------------------------------------------------------------------ #
+    @classmethod
+    def from_json(cls, doc: Dict[str, Any]) -> "ColumnarTimeline":
+        """Build the columns from a ``game_state.json`` document."""
+        live = doc.get("live_game_info", {})
+        timed = [(parse_timer(k), k) for k in live]
+        timed = sorted((t, k) for t, k in timed if t is not None)
+        row = {k: i for i, (_, k) in enumerate(timed)}
+
+        shape = (len(timed), len(cls.TEAMS), len(cls.ROLES))
+        data = {m: np.full(shape, np.nan) for m in cls.METRICS}
+        frames: List[Tuple[str, Any]] = []
+        for key, frame in live.items():
+            i = row.get(key)
+            frames.append((key, frame if i is None else cls._extract(frame, data, i)))
+
+        rest = {k: v for k, v in doc.items() if k != "live_game_info"}
+        return cls(
+            [t for t, _ in timed], data,
+            _keys=[k for _, k in timed], _frames=frames, _doc=copy.deepcopy(rest),
+        )
+
+    @classmethod
+    def _extract(cls, frame: Any, data: Dict[str, np.ndarray], i: int) -> Any:
+        """Copy of *frame* whose numeric metrics moved into row *i* (leaf → ``int`` / ``float``)."""
+        skel = copy.deepcopy(frame)
+        if not isinstance(skel, dict):
+            return skel
+        for t, team in enumerate(cls.TEAMS):
+            players = skel.get(team, {}).get("players") if isinstance(skel.get(team), dict) else None
+            if not isinstance(players, dict):
+                continue
+            for r, role in enumerate(cls.ROLES):
+                rec = players.get(role)
+                if not isinstance(rec, dict):
+                    continue
+                for metric in cls.METRICS:
+                    v = rec.get(metric)
+                    if type(v) in (int, float):            # bools / None / text stay put
+                        data[metric][i, t, r] = v
+                        rec[metric] = type(v)              # placeholder, see _fill
+        return skel
+
+    def _fill(self, skel: Any, i: int) -> Any:
+        if not isinstance(skel, dict):
+            return skel
+        for t, team in enumerate(self.TEAMS):
+            players = skel.get(team, {}).get("players") if isinstance(skel.get(team), dict) else None
+            if not isinstance(players, dict):
+                continue
+            for r, role in enumerate(self.ROLES):
+                rec = players.get(role)
+                if not isinstance(rec, dict):
+                    continue
+                for metric in self.METRICS:
+                    cast = rec.get(metric)
+                    if cast is int or cast is float:
+                        rec[metric] = cast(self.data[metric][i, t, r])
+        return skel
+
+    def _plain_frame(self, i: int) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for t, team in enumerate(self.TEAMS):
+            players: Dict[str, Any] = {}
+            for r, role in enumerate(self.ROLES):
+                rec = {}
+                for metric in self.METRICS:
+                    v = float(self.data[metric][i, t, r])
+                    if not np.isnan(v):
+                        rec[metric] = int(v) if metric in self.COUNTERS and v.is_integer() else v
+                if rec:
+                    players[role] = rec
+            out[team] = {"players": players}
+        return out
+
+    def to_json(self) -> Dict[str, Any]:
+        """The ``game_state.json`` document (see the class docstring)."""
+        if self._frames is None:
+            live = {self.frame_key(i): self._plain_frame(i) for i in range(len(self))}
+            return {"live_game_info": live}
+
+        row = {k: i for i, k in enumerate(self._keys or ())}
+        live = {}
+        for key, skel in self._frames:
+            if key in row:
+                live[key] = self._fill(copy.deepcopy(skel), row[key])
+            elif parse_timer(key) is None:
+                live[key] = copy.deepcopy(skel)
+        return {**copy.deepcopy(self._doc or {}), "live_game_info": live}
+
+    # ------------------------------------------------------------------ #
+    # Queries                                                            #
+    # ------------------------------------------------------------------ #
+    def __len__(self) -> int:
+        return len(self.seconds)
+
+    def frame_key(self, i: int) -> str:
+        """Original key of row *i* (``MM:SS`` built from the seconds otherwise)."""
+        if self._keys is not None:
+            return self._keys[i]
+        return format_timer(int(self.seconds[i]))
+
+    def last_key(self) -> Optional[str]:
+        """Key of the latest frame, *None* for an empty timeline."""
+        return self.frame_key(len(self) - 1) if len(self) else None
+
+    def column(self, metric: str, team: str, role: str | Role) -> np.ndarray:
+        """``(len(self),)`` values of one player (a view, not a copy)."""
+        role = role.name if isinstance(role, Role) else role
+        return self.data[metric][:, self.TEAMS.index(team), self.ROLES.index(role)]
+
+    def slice(self, start: Optional[int] = None, end: Optional[int] = None) -> "ColumnarTimeline":
+        """Frames with ``start <= seconds <= end`` (array views; markers are kept)."""
+        lo = 0 if start is None else int(np.searchsorted(self.seconds, start, "left"))
+        hi = len(self) if end is None else int(np.searchsorted(self.seconds, end, "right"))
+        keys = self._keys[lo:hi] if self._keys is not None else None
+        frames = None
+        if self._frames is not None:
+            kept = set(keys or ())
+            frames = [(k, f) for k, f in self._frames if k in kept or parse_timer(k) is None]
+        return ColumnarTimeline(
+            self.seconds[lo:hi], {m: a[lo:hi] for m, a in self.data.items()},
+            _keys=keys, _frames=frames, _doc=self._doc,
+        )
+
+    def resample(
+        self,
+        step: int,
+        *,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        how: str | Mapping[str, str] = "ffill",
+    ) -> "ColumnarTimeline":
+        """
+        Values on a regular ``step``-second grid.
+
+        ``how="ffill"`` carries every player's last reported value forward
+        (gaps in a single frame do not blank the cell); ``how="linear"``
+        interpolates between reports and is NaN outside them.  A mapping
+        chooses per metric (``{"health_pct": "linear"}``); metrics it does
+        not name are forward-filled.
+        """
+        if step <= 0:
+            raise ValueError("step must be positive")
+        modes = {m: how if isinstance(how, str) else how.get(m, "ffill") for m in self.METRICS}
+        for mode in modes.values():
+            if mode not in self.RESAMPLING:
+                raise ValueError(f"Unknown resampling '{mode}'.")
+        if not len(self):
+            return ColumnarTimeline([])
+        start = int(self.seconds[0]) if start is None else int(start)
+        end   = int(self.seconds[-1]) if end is None else int(end)
+        grid  = np.arange(start, end + 1, step, dtype=np.int64)
+
+        out: Dict[str, np.ndarray] = {}
+        for metric, arr in self.data.items():
+            flat  = arr.reshape(len(self), -1)
+            valid = ~np.isnan(flat)
+            if modes[metric] == "ffill":
+                # index of the last valid row per cell, then pick it at each grid point
+                last = np.where(valid, np.arange(len(self))[:, None], -1)
+                np.maximum.accumulate(last, axis=0, out=last)
+                rows = np.searchsorted(self.seconds, grid, "right") - 1
+                src  = np.where(rows[:, None] >= 0, last[np.clip(rows, 0, None)], -1)
+                res  = np.where(src >= 0, flat[np.clip(src, 0, None), np.arange(flat.shape[1])], np.nan)
+            else:
+                res = np.full((len(grid), flat.shape[1]), np.nan)
+                for c in range(flat.shape[1]):
+                    ok = valid[:, c]
+                    if ok.any():
+                        xs, ys = self.seconds[ok], flat[ok, c]
+                        res[:, c] = np.interp(grid, xs, ys, left=np.nan, right=np.nan)
+            out[metric] = res.reshape((len(grid),) + arr.shape[1:])
+        return ColumnarTimeline(grid, out)
+
+    def to_columns(self) -> Dict[str, Any]:
+        """
+        JSON-ready columns: ``{"seconds": […], "data": {metric: {team:
+        {role: […]}}}}``, ``None`` for gaps and whole counters as ``int``.
+        """
+        data: Dict[str, Any] = {}
+        for metric, arr in self.data.items():
+            integral = metric in self.COUNTERS
+            data[metric] = {
+                team: {
+                    role: [
+                        None if v != v else int(v) if integral and v.is_integer() else v
+                        for v in arr[:, t, r].tolist()
+                    ]
+                    for r, role in enumerate(self.ROLES)
+                }
+                for t, team in enumerate(self.TEAMS)
+            }
+        return {"seconds": self.seconds.tolist(), "data": data}
+
+    def diff(self, metric: str, *, per_second: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        ``(seconds[1:], delta)`` of *metric* between consecutive frames –
+        e.g. CS or gold gained per interval; ``per_second`` divides by the
+        elapsed time.
+        """
+        delta = np.diff(self.data[metric], axis=0)
+        if per_second:
+            dt = np.diff(self.seconds).astype(np.float64)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                delta = delta / dt[:, None, None]
+        return self.seconds[1:], delta
+
@@ -11,24 +11,48 @@ It exposes a minimal CRUD-like public surface:
 * :func:`add_or_update_snapshot`   – merge a new HUD snapshot.
 * :func:`end_game`                 – stamp the winner & final frame.
 * :func:`get_game_state`           – load a single file.
+* :func:`get_game_state_body`      – the same, as cached (compressed) JSON bytes.
 * :func:`get_all_game_states`      – aggregate every folder.
+* :func:`list_matches`             – paginated match summaries (manifest).
+* :func:`get_revision`             – current revision (ETag / Last-Modified).
+* :func:`get_snapshots_since`      – only the frames that changed.
+* :func:`get_resampled`            – the timeline on a fixed time grid.
+* :func:`add_listener`             – be told about every write (live stream).
 * :func:`update_game`              – convenience wrapper that turns the raw
   OCR + bar detections produced by the worker into a proper snapshot.
 
 The serializer / deserializer for the nested dataclasses lives in the
 sibling module :pymod:`game_state`.
+
+Snapshots are not written by rewriting ``game_state.json``: they are
+appended as deltas to a per-match JSON-lines log and folded back into the
+canonical file by background compaction (see :pymod:`snapshot_log`).
+Every reader still receives the usual ``game_state.json`` document.
+Writes are atomic and guarded by a per-match cross-process lock, so
+several API processes (``uvicorn --workers N``) can share
+``matches_history`` without losing snapshots.
+
+``GAME_STATE_BACKEND=sqlite`` stores the same documents in an indexed
+SQLite database instead (see :pymod:`sqlite_store`, which also offers
+range queries and cross-match aggregates); the default is ``files``.
+
+Every write also updates the match manifest (see :pymod:`manifest`), so
+listing matches does not have to load them.
 """
 
 from __future__ import annotations
 
-import copy
 import json
+import os
 import re
+import threading
 import unicodedata
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Mapping, Tuple
 
-from .game_state import GameSnapshot, GameTimeline, Role, to_json_compat
+from . import encoded, manifest, revisions, snapshot_log, sqlite_store
+from .game_state import ColumnarTimeline, GameSnapshot, GameTimeline, Role, parse_timer, to_json_compat
 
 # --------------------------------------------------------------------- #
 # Constants & paths                                                     #
@@ -37,6 +61,24 @@ _BASE = Path(__file__).resolve().parents[3]          # …/backend
 _HISTORY = _BASE / "matches_history"
 _HISTORY.mkdir(parents=True, exist_ok=True)
 
+# storage backend – both modules share the same folder-keyed API
+_BACKEND = os.getenv("GAME_STATE_BACKEND", "files").lower()
+_store = sqlite_store if _BACKEND == "sqlite" else snapshot_log
+
+# (kind, match slug, payload) callbacks run after every write, see add_listener
+Listener = Callable[[str, str, Dict[str, Any]], None]
+_listeners: List[Listener] = []
+
+# resampled timelines, keyed by (slug, revision, grid, modes, layout) – LRU
+_RESAMPLE_CACHE = int(os.getenv("GAME_STATE_RESAMPLE_CACHE", 64))
+_resampled: "OrderedDict[Tuple[Any, ...], Dict[str, Any]]" = OrderedDict()
+_columns: Dict[str, Tuple[str, ColumnarTimeline]] = {}    # slug → (revision, columns)
+_cache_lock = threading.Lock()
+
+# serialised full-read bodies of the latest revision, keyed by match title – LRU
+_BODY_CACHE = int(os.getenv("GAME_STATE_BODY_CACHE", 32))
+_bodies: "OrderedDict[str, Tuple[str, encoded.Encoded]]" = OrderedDict()
+
 _ROLE_ORDER: List[Role] = [
     Role.TOP,
     Role.JUNGLE,
@@ -54,43 +96,26 @@ def _slugify(text: str) -> str:
     return re.sub(r"[^a-zA-Z0-9.\-]+", "-", txt).strip("-").lower() or "match"
 
 
-def _path_for(title: str) -> Path:
-    """Absolute path of the ``game_state.json`` belonging to *title*."""
-    return _HISTORY / _slugify(title) / "game_state.json"
-
-
-def _deep_merge(dst: Dict[str, Any], inc: Dict[str, Any]) -> Dict[str, Any]:
-    """Recursive dict merge – *inc* wins on scalar leaves."""
-    for k, v in inc.items():
-        dst[k] = _deep_merge(dst.get(k, {}), v) if isinstance(v, dict) else v
-    return dst
+def _folder_for(title: str) -> Path:
+    """Absolute path of the match folder belonging to *title*."""
+    return _HISTORY / _slugify(title)
 
 
-def _dict_to_timeline(raw: Dict[str, Any]) -> GameTimeline:
-    """De-serialise plain JSON into a :class:`GameTimeline` instance."""
-    tl = GameTimeline()
-    sg = raw.get("static_game_info", {})
-    tl.static_game_info.blue.team_name = sg.get("blue", {}).get("team_name", "")
-    tl.static_game_info.red.team_name = sg.get("red", {}).get("team_name", "")
-    tl.static_game_info.blue.champions = sg.get("blue", {}).get("champions", {})
-    tl.static_game_info.red.champions = sg.get("red", {}).get("champions", {})
-    tl.live_game_info = raw.get("live_game_info", {})
-    return tl
+def _notify(kind: str, slug: str, payload: Dict[str, Any]) -> None:
+    for fn in list(_listeners):
+        try:
+            fn(kind, slug, payload)
+        except Exception as exc:                    # pragma: no cover
+            print(f"⚠️  Game-state listener failed ({kind}, {slug}): {exc}")
 
 
-def _load(title: str) -> GameTimeline:
-    """Read file → timeline object (raises if the match does not exist)."""
-    fp = _path_for(title)
-    if not fp.exists():
-        raise FileNotFoundError(f"Match “{title}” not found.")
-    return _dict_to_timeline(json.loads(fp.read_text(encoding="utf-8")))
+def _resign(folder: Path, before: revisions.Signature, after: revisions.Signature) -> None:
+    # compaction rewrote the files, not the data: keep revision and manifest valid
+    revisions.resign(folder.name, before, after)
+    manifest.resign(_HISTORY, folder.name, before, after)
 
 
-def _save(title: str, tl: GameTimeline) -> None:
-    """Serialise *tl* back to its JSON file."""
-    fp = _path_for(title)
-    fp.parent.mkdir(parents=True, exist_ok=True)
-    fp.write_text(json.dumps(to_json_compat(tl), indent=4, ensure_ascii=False))
+_store.add_compact_listener(_resign)
 
 
 def _normalise_champ_dict(src: Dict[Any, str]) -> Dict[str, str]:
@@ -120,7 +145,16 @@ def start_game(
     tl.static_game_info.blue.champions = _normalise_champ_dict(blue_champions)
     tl.static_game_info.red.champions = _normalise_champ_dict(red_champions)
     tl.live_game_info["startGame"] = to_json_compat(GameSnapshot())
-    _save(match_title, tl)
+    folder, doc = _folder_for(match_title), to_json_compat(tl)
+    folder.mkdir(parents=True, exist_ok=True)       # home of the match lock
+    with _store.lock(folder):
+        before = _store.signature(folder)
+        _store.create(folder, doc)
+        after = _store.signature(folder)
+        rev = revisions.record(folder.name, doc["live_game_info"], before, after, reset=True)
+    manifest.record(_HISTORY, folder.name, doc, _store, title=match_title, signature=after)
+    _notify("start", folder.name, {"title": match_title, "revision": rev.tag,
+                                   "static_game_info": doc["static_game_info"]})
 
 
 def add_or_update_snapshot(
@@ -137,7 +171,9 @@ def add_or_update_snapshot(
     * absolute seconds **int / float**,
     * :class:`datetime.timedelta`.
     """
-    tl = _load(match_title)
+    folder = _folder_for(match_title)
+    if not _store.exists(folder):
+        raise FileNotFoundError(f"Match “{match_title}” not found.")
 
     if isinstance(timer, (int, float)):
         secs = int(timer)
@@ -145,48 +181,248 @@ def add_or_update_snapshot(
     else:
         key = str(timer)
 
-    tl.live_game_info[key] = _deep_merge(tl.live_game_info.get(key, {}), snapshot_dict)
-    _save(match_title, tl)
+    data = to_json_compat(snapshot_dict)
+    with _store.lock(folder):                       # signatures around exactly this write
+        before = _store.signature(folder)
+        _store.append(folder, "merge", key, data)
+        after = _store.signature(folder)
+        rev = revisions.record(folder.name, (key,), before, after)
+    manifest.record_snapshot(_HISTORY, folder.name, key, _store, before, after)
+    _notify("snapshot", folder.name, {"timer": key, "revision": rev.tag, "data": data})
 
 
 def end_game(match_title: str, winner: int) -> None:
     """Copy the last frame into ``endGame`` and register the winning side."""
-    tl = _load(match_title)
-    usable = [k for k in tl.live_game_info if k not in ("startGame", "endGame")]
-    if not usable:
-        raise RuntimeError("No snapshots recorded for that match.")
-    last_key = max(usable, key=lambda k: int(k.split(":")[0]) * 60 + int(k.split(":")[1]))
-    tl.live_game_info["endGame"] = copy.deepcopy(tl.live_game_info[last_key])
-    tl.live_game_info["winner"] = "BLUE" if winner == 0 else "RED"
-    _save(match_title, tl)
+    folder = _folder_for(match_title)
+    if not _store.exists(folder):
+        raise FileNotFoundError(f"Match “{match_title}” not found.")
+    with _store.lock(folder):                       # no snapshot between read and stamp
+        before = _store.signature(folder)
+        live = _store.read(folder).get("live_game_info", {})
+        last_key = ColumnarTimeline.from_json({"live_game_info": live}).last_key()
+        if last_key is None:
+            raise RuntimeError("No snapshots recorded for that match.")
+        _store.append(folder, "set", "endGame", live[last_key])
+        _store.append(folder, "set", "winner", "BLUE" if winner == 0 else "RED")
+        _store.compact(folder)                      # finished: publish right away
+        doc, after = _store.read(folder), _store.signature(folder)
+        rev = revisions.record(folder.name, ("endGame", "winner"), before, after)
+    manifest.record(_HISTORY, folder.name, doc, _store, signature=after)
+    _notify("end", folder.name, {"winner": "BLUE" if winner == 0 else "RED",
+                                 "last_timer": last_key, "revision": rev.tag})
+
+
+def match_slug(match_title: str) -> str:
+    """Folder / stream name of *match_title* (e.g. ``"g2-vs-fnc"``)."""
+    return _folder_for(match_title).name
+
+
+def add_listener(fn: Listener) -> None:
+    """
+    Call ``fn(kind, slug, payload)`` after every successful write – kinds
+    ``"start"``, ``"snapshot"`` and ``"end"``.  Listeners run synchronously
+    in the writer's thread and must be cheap; their errors are logged.
+    """
+    if fn not in _listeners:
+        _listeners.append(fn)
 
 
 def get_game_state(match_title: str) -> Dict[str, Any]:
-    """Return the raw JSON dict for *match_title* (no validation performed)."""
-    return json.loads(_path_for(match_title).read_text(encoding="utf-8"))
+    """
+    Return the raw JSON dict for *match_title* (no validation performed);
+    folders that only hold a legacy ``time_line.json`` are served as is.
+    """
+    folder = _folder_for(match_title)
+    legacy = None if _store.exists(folder) else _legacy_file(match_title)
+    if legacy is not None:
+        return json.loads(legacy.read_text(encoding="utf-8"))
+    return _store.read(folder)
+
+
+def get_game_state_body(
+    match_title: str,
+    encoding: str = "identity",
+) -> Tuple[revisions.Revision, bytes, str]:
+    """
+    ``(revision, body, content_encoding)`` of a full read: the UTF-8 JSON
+    of ``{"match", "revision", "partial": false, "game_state"}``, as served
+    by ``GET /api/game_state/{match}``.
+
+    The bytes are built once per revision and kept, with each compressed
+    variant (see :pymod:`encoded`), so unchanged matches are answered
+    without loading or encoding the document again.
+    """
+    rev = get_revision(match_title)                 # before reading: never newer than the data
+    with _cache_lock:
+        hit = _bodies.get(match_title)
+        if hit is not None and hit[0] == rev.tag:
+            _bodies.move_to_end(match_title)
+            body = hit[1]
+        else:
+            body = None
+    if body is None:
+        body = encoded.Encoded(encoded.dumps({
+            "match": match_title,
+            "revision": rev.tag,
+            "partial": False,
+            "game_state": get_game_state(match_title),
+        }))
+        with _cache_lock:
+            _bodies[match_title] = (rev.tag, body)
+            _bodies.move_to_end(match_title)
+            while len(_bodies) > _BODY_CACHE:
+                _bodies.popitem(last=False)
+    data, used = body.get(encoding)
+    return rev, data, used
+
+
+def _legacy_file(match_title: str) -> Path | None:
+    legacy = _HISTORY / match_title / "time_line.json"
+    if Path(match_title).name == match_title and legacy.is_file():
+        return legacy
+    return None
+
+
+def get_revision(match_title: str) -> revisions.Revision:
+    """Current revision of *match_title*; cheap (no document is read)."""
+    folder = _folder_for(match_title)
+    if _store.exists(folder):
+        return revisions.current(folder.name, lambda: _store.signature(folder))
+    legacy = _legacy_file(match_title)
+    if legacy is None:
+        raise FileNotFoundError(f"Match “{match_title}” not found.")
+    st = legacy.stat()
+    return revisions.current(match_title, lambda: (st.st_mtime, st.st_size))
+
+
+def get_snapshots_since(
+    match_title: str,
+    *,
+    since: str | None = None,
+    since_revision: str | None = None,
+) -> Dict[str, Any] | None:
+    """
+    The ``live_game_info`` entries that are newer than ``since`` (``MM:SS``,
+    plus ``endGame`` / ``winner`` once present) or were written after
+    revision ``since_revision``.  *None* when the revision is unknown here
+    and the caller has to fall back to a full read.
+    """
+    folder = _folder_for(match_title)
+    if since_revision is not None:
+        keys = revisions.changed_since(folder.name, since_revision, lambda: _store.signature(folder))
+        if keys is None:
+            return None
+        if not keys:
+            return {}
+        return _store.read_frames(folder, keys)
+
+    floor = -1
+    if since:
+        floor = parse_timer(since)
+        if floor is None:
+            raise ValueError(f"Invalid timer “{since}” (expected MM:SS).")
+
+    def newer(k: str) -> bool:
+        return k in ("endGame", "winner") or ((t := parse_timer(k)) is not None and t > floor)
+
+    if _store.exists(folder):
+        return _store.read_frames(folder, newer)    # copies the new frames only
+    live = get_game_state(match_title).get("live_game_info", {})   # legacy time_line.json
+    return {k: v for k, v in live.items() if newer(k)}
+
+
+def get_resampled(
+    match_title: str,
+    step: int,
+    *,
+    how: str = "ffill",
+    per_metric: Mapping[str, str] | None = None,
+    start: int | None = None,
+    end: int | None = None,
+    layout: str = "columns",
+) -> Dict[str, Any]:
+    """
+    The snapshots of *match_title* on a regular *step*-second grid (see
+    :meth:`ColumnarTimeline.resample`): ``how`` for every metric, or per
+    metric through ``per_metric``.  ``layout="columns"`` returns one array
+    per metric / team / role, ``"frames"`` the usual ``live_game_info``
+    frames keyed ``MM:SS``.
+
+    Results are cached per (match, revision, parameters), so repeated
+    polls of an unchanged match cost a dictionary lookup; the returned
+    dict is shared and must not be modified.
+    """
+    if layout not in ("columns", "frames"):
+        raise ValueError(f"Unknown layout '{layout}'.")
+    modes = {m: (per_metric or {}).get(m, how) for m in ColumnarTimeline.METRICS}
+    for metric in per_metric or {}:
+        if metric not in modes:
+            raise ValueError(f"Unknown metric '{metric}'.")
+    folder = _folder_for(match_title)
+    slug = folder.name if _store.exists(folder) else match_title    # legacy: raw folder name
+    rev = get_revision(match_title)                 # before reading: never newer than the data
+    key = (slug, rev.tag, step, start, end, tuple(modes.values()), layout)
+    with _cache_lock:
+        hit = _resampled.get(key)
+        if hit is not None:
+            _resampled.move_to_end(key)
+            return hit
+        cached = _columns.get(slug)
+    if cached is not None and cached[0] == rev.tag:
+        tl = cached[1]
+    else:
+        tl = ColumnarTimeline.from_json(get_game_state(match_title))
+    grid = tl.resample(step, start=start, end=end, how=modes)
+
+    out: Dict[str, Any] = {"match": slug, "revision": rev.tag, "step": step, "how": modes}
+    if layout == "columns":
+        out.update(grid.to_columns())
+    else:
+        out["live_game_info"] = grid.to_json()["live_game_info"]
+    with _cache_lock:
+        _columns.pop(slug, None)
+        _columns[slug] = (rev.tag, tl)
+        if len(_columns) > _RESAMPLE_CACHE:
+            del _columns[next(iter(_columns))]
+        _resampled[key] = out
+        while len(_resampled) > _RESAMPLE_CACHE:
+            _resampled.popitem(last=False)
+    return out
 
 
 def get_all_game_states() -> Dict[str, Dict[str, Any]]:
     """
-    Walk every sub-folder under ``matches_history`` and load the first
-    JSON file found (``game_state.json`` preferred over ``time_line.json``).
+    Load every stored match, then every folder under ``matches_history``
+    that only holds a legacy ``time_line.json``.
     """
     out: Dict[str, Dict[str, Any]] = {}
-    for d in _HISTORY.iterdir():
-        if not d.is_dir():
+    for name in _store.matches(_HISTORY):
+        try:
+            out[name] = _store.read(_HISTORY / name)
+        except Exception:
+            # Corrupted file – skip, but keep the worker running.
             continue
-        gs, tl = d / "game_state.json", d / "time_line.json"
-        src = gs if gs.is_file() else tl if tl.is_file() else None
-        if not src:
+    for d in _HISTORY.iterdir():
+        tl = d / "time_line.json"
+        if d.name in out or not tl.is_file():
             continue
         try:
-            out[d.name] = json.loads(src.read_text(encoding="utf-8"))
+            out[d.name] = json.loads(tl.read_text(encoding="utf-8"))
         except Exception:
-            # Corrupted file – skip, but keep the worker running.
             continue
     return out
 
 
+def list_matches(offset: int = 0, limit: int | None = None) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    ``(total, summaries[offset:offset + limit])`` of every match, sorted by
+    slug – served from the manifest, without loading the timelines.
+    """
+    items = manifest.summaries(_HISTORY, _store)
+    end = None if limit is None else offset + limit
+    return len(items), items[offset:end]
+
+
 # --------------------------------------------------------------------- #
 # Worker integration: OCR → snapshot                                    #
 # --------------------------------------------------------------------- #
@@ -272,7 +508,14 @@ __all__: List[str] = [
     "add_or_update_snapshot",
     "end_game",
     "get_game_state",
+    "get_game_state_body",
+    "get_revision",
+    "get_snapshots_since",
+    "get_resampled",
     "get_all_game_states",
+    "list_matches",
+    "match_slug",
+    "add_listener",
     "create_snapshot_from_detection",
     "update_game",
 ]
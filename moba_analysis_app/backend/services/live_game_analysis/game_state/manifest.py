@@ -0,0 +1,286 @@
+"""
+services/live_game_analysis/game_state/manifest.py
+==================================================
+
+Summary index of every match under *matches_history/*.
+
+Listing matches used to JSON-parse every ``game_state.json`` /
+``time_line.json`` on each request.  The manifest keeps one small summary
+per match folder – title, teams, draft, snapshot count, last timer,
+winner and the modification time / size of the stored data – persisted in
+``matches_history/manifest.json``:
+
+* writers update their entry in place (:func:`record`,
+  :func:`record_snapshot`), without re-reading the match;
+* :func:`summaries` validates every entry against a cheap *signature*
+  (``stat`` of the files, or the storage backend's own revision) and
+  rebuilds only those that changed on disk behind our back – copied in,
+  edited by hand, written by another process.
+
+The manifest is a cache: deleting it only costs one rebuild.
+
+Public API
+----------
+``summaries(root, store) -> list``              – validated, sorted by slug
+``record(root, slug, document, store, title=None, signature=None)``
+``record_snapshot(root, slug, key, store, before, after)``
+``resign(root, slug, before, after)``
+``summarize(slug, document) -> dict``
+``MANIFEST_NAME``
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import threading
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, List, Set, Tuple
+
+from .atomic_io import atomic_write_text
+from .game_state import format_timer, parse_timer
+
+# --------------------------------------------------------------------- #
+# Constants                                                             #
+# --------------------------------------------------------------------- #
+MANIFEST_NAME = "manifest.json"
+_LEGACY_NAME  = "time_line.json"            # Riot timelines (analysis input)
+_VERSION      = 1
+
+# --------------------------------------------------------------------- #
+# State                                                                 #
+# --------------------------------------------------------------------- #
+_lock = threading.RLock()
+_entries: Dict[str, Dict[str, Any]] | None = None
+_root: Path | None = None
+_dirty = False
+_seen: Dict[str, Set[str]] = {}             # slug → timer keys (in-process writes)
+
+
+# --------------------------------------------------------------------- #
+# Summaries                                                             #
+# --------------------------------------------------------------------- #
+def summarize(slug: str, document: Dict[str, Any]) -> Dict[str, Any]:
+    """Manifest entry (without signature) of one ``game_state.json`` document."""
+    static = document.get("static_game_info", {})
+    live = document.get("live_game_info", {})
+    timers = [t for t in map(parse_timer, live) if t is not None]
+    winner = live.get("winner")
+    return {
+        "slug": slug,
+        "title": slug,
+        "source": "game_state",
+        "teams": {side: static.get(side, {}).get("team_name") for side in ("blue", "red")},
+        "champions": {side: static.get(side, {}).get("champions", {}) for side in ("blue", "red")},
+        "snapshots": len(timers),
+        "last_timer": format_timer(max(timers)) if timers else None,
+        "winner": winner if isinstance(winner, str) else None,
+    }
+
+
+def _summarize_legacy(slug: str, doc: Dict[str, Any]) -> Dict[str, Any]:
+    frames = doc.get("frames") or []
+    last_ms = frames[-1].get("timestamp") if frames else None
+    winner = None
+    for ev in (frames[-1].get("events", []) if frames else []):
+        if ev.get("type") == "GAME_END":
+            winner = {100: "BLUE", 200: "RED"}.get(ev.get("winningTeam"))
+    return {
+        "slug": slug,
+        "title": slug,
+        "source": "time_line",
+        "teams": {"blue": None, "red": None},
+        "champions": {"blue": {}, "red": {}},
+        "snapshots": len(frames),
+        "last_timer": format_timer(int(last_ms) // 1000) if isinstance(last_ms, (int, float)) else None,
+        "winner": winner,
+    }
+
+
+def _signature(folder: Path, store: ModuleType) -> Dict[str, Any] | None:
+    """``{"mtime", "size"}`` of the stored match, *None* when there is none."""
+    if store.exists(folder):
+        mtime, size = store.signature(folder)
+        return {"mtime": mtime, "size": size}
+    legacy = folder / _LEGACY_NAME
+    if legacy.is_file():
+        st = legacy.stat()
+        return {"mtime": st.st_mtime, "size": st.st_size}
+    return None
+
+
+def _build(folder: Path, store: ModuleType, sig: Dict[str, Any]) -> Dict[str, Any]:
+    if store.exists(folder):
+        entry = summarize(folder.name, store.read(folder))
+    else:
+        doc = json.loads((folder / _LEGACY_NAME).read_text(encoding="utf-8"))
+        entry = _summarize_legacy(folder.name, doc)
+    return {**entry, **sig}
+
+
+# --------------------------------------------------------------------- #
+# Persistence                                                           #
+# --------------------------------------------------------------------- #
+def _load(root: Path) -> Dict[str, Dict[str, Any]]:
+    """The entries of *root*, read from disk on first use."""
+    global _entries, _root
+    if _entries is None or _root != root:
+        try:
+            raw = json.loads((root / MANIFEST_NAME).read_text(encoding="utf-8"))
+            _entries = raw["matches"] if raw.get("version") == _VERSION else {}
+        except (FileNotFoundError, ValueError, KeyError, TypeError):
+            _entries = {}
+        _root = root
+        _seen.clear()
+    return _entries
+
+
+def _save() -> None:
+    global _dirty
+    with _lock:
+        if not _dirty or _root is None or _entries is None:
+            return
+        atomic_write_text(
+            _root / MANIFEST_NAME,
+            json.dumps({"version": _VERSION, "matches": _entries}, ensure_ascii=False),
+        )
+        _dirty = False
+
+
+atexit.register(_save)
+
+
+# --------------------------------------------------------------------- #
+# Public API                                                            #
+# --------------------------------------------------------------------- #
+def summaries(root: Path, store: ModuleType) -> List[Dict[str, Any]]:
+    """
+    Every match summary under *root*, sorted by slug.  Entries whose
+    signature no longer matches the stored data are rebuilt; folders that
+    disappeared are dropped.
+    """
+    global _dirty
+    with _lock:
+        entries = _load(root)
+        present: Set[str] = set()
+        for folder in root.iterdir():
+            if not folder.is_dir():
+                continue
+            sig = _signature(folder, store)
+            if sig is None:
+                continue
+            present.add(folder.name)
+            entry = entries.get(folder.name)
+            if entry is not None and entry["mtime"] == sig["mtime"] and entry["size"] == sig["size"]:
+                continue
+            try:
+                title = entry.get("title") if entry else None
+                entries[folder.name] = _build(folder, store, sig)
+                if title:
+                    entries[folder.name]["title"] = title
+            except Exception as exc:
+                # Corrupted file – skip, but keep listing the others.
+                print(f"⚠️  Manifest: cannot summarise {folder.name}: {exc}")
+                entries.pop(folder.name, None)
+                present.discard(folder.name)
+            _dirty = True
+        for gone in set(entries) - present:
+            del entries[gone]
+            _seen.pop(gone, None)
+            _dirty = True
+        _save()
+        return [dict(entries[k]) for k in sorted(entries)]
+
+
+Signature = Tuple[float, int | None]                # store.signature(folder)
+
+
+def _sig_dict(sig: Signature) -> Dict[str, Any]:
+    return {"mtime": sig[0], "size": sig[1]}
+
+
+def _matches(entry: Dict[str, Any], sig: Signature) -> bool:
+    return (entry.get("mtime"), entry.get("size")) == tuple(sig)
+
+
+def record(
+    root: Path,
+    slug: str,
+    document: Dict[str, Any],
+    store: ModuleType,
+    title: str | None = None,
+    signature: Signature | None = None,
+) -> None:
+    """
+    Replace the entry of *slug* after a whole-document write.  *signature*
+    is the store signature that write left behind (read from disk if
+    omitted).
+    """
+    global _dirty
+    with _lock:
+        entries = _load(root)
+        entry = summarize(slug, document)
+        entry["title"] = title or entries.get(slug, {}).get("title") or slug
+        sig = _sig_dict(signature) if signature is not None else _signature(root / slug, store)
+        entries[slug] = {**entry, **(sig or {"mtime": None, "size": None})}
+        _seen[slug] = {k for k in document.get("live_game_info", {}) if parse_timer(k) is not None}
+        _dirty = True
+
+
+def record_snapshot(
+    root: Path,
+    slug: str,
+    key: str,
+    store: ModuleType,
+    before: Signature,
+    after: Signature,
+) -> None:
+    """
+    Account for the snapshot *key* just merged into *slug*, a write that
+    moved the store signature from *before* to *after*.  When the entry
+    does not stand at *before* – first write of this process, or another
+    process wrote the match meanwhile – it is rebuilt from the store
+    instead of being incremented.
+    """
+    global _dirty
+    with _lock:
+        entries = _load(root)
+        entry = entries.get(slug)
+        seen = _seen.get(slug)
+        if entry is None or seen is None or not _matches(entry, before):
+            folder = root / slug
+            with store.lock(folder):                # document and signature of one state
+                doc, sig = store.read(folder), store.signature(folder)
+            record(root, slug, doc, store, entry.get("title") if entry else None, sig)
+            return
+        t = parse_timer(key)
+        if t is not None and key not in seen:
+            seen.add(key)
+            entry["snapshots"] += 1
+        if t is not None and (entry["last_timer"] is None or t > parse_timer(entry["last_timer"])):
+            entry["last_timer"] = format_timer(t)
+        entry.update(_sig_dict(after))
+        _dirty = True
+
+
+def resign(root: Path, slug: str, before: Signature, after: Signature) -> None:
+    """
+    The store rewrote *slug* without changing its data (compaction).
+    Called with the match lock held, so it never waits for the manifest
+    (whose holders may be waiting for that lock): when busy, the entry is
+    simply rebuilt on its next use.
+    """
+    global _dirty
+    if not _lock.acquire(blocking=False):
+        return
+    try:
+        entry = (_entries or {}).get(slug) if _root == root else None
+        if entry is not None and _matches(entry, before):
+            entry.update(_sig_dict(after))
+            _dirty = True
+    finally:
+        _lock.release()
+
+
+__all__ = ["MANIFEST_NAME", "record", "record_snapshot", "resign", "summaries", "summarize"]
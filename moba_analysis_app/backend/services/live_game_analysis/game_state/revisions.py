@@ -0,0 +1,150 @@
+"""
+services/live_game_analysis/game_state/revisions.py
+===================================================
+
+Per-match **revision counters** for conditional and incremental reads.
+
+Every write made through :mod:`game_state_service` bumps the revision of
+its match and stamps the touched ``live_game_info`` keys with it, so a
+poller can ask for "what changed since revision *n*" and get back only
+those frames, or answer an ``ETag`` / ``Last-Modified`` check without
+loading the match at all.
+
+A revision is ``<base>.<number>``:
+
+* matches written by this process get a fresh *base* (the time the
+  counter started) and a number that grows with every write;
+* matches this process has not written are described by their storage
+  signature (``mtime`` / size), number ``0`` – they still change tag when
+  the data changes on disk, but "changed since" is unknown for them and
+  callers fall back to a full read.
+
+A counter also remembers the storage signature its last write left
+behind and is only trusted while the store still reports it: once another
+process (``uvicorn --workers N``) writes the match, the tag falls back to
+the signature, and this process's next write starts a new base.  Folding
+the log into the canonical file changes the signature without changing
+the data; :func:`resign` carries the counter over.
+
+Counters live in memory: after a restart every base changes, which only
+costs each client one full download.
+
+Public API
+----------
+``Revision``                                  – ``tag`` / ``etag`` / ``modified``
+``current(slug, signature) -> Revision``
+``record(slug, keys, before, after, reset=False) -> Revision``
+``resign(slug, before, after)``
+``changed_since(slug, tag, signature) -> set | None``
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Set, Tuple
+
+Signature = Tuple[float, int | None]                # (mtime, size) of the stored match
+
+
+# --------------------------------------------------------------------- #
+# Types                                                                 #
+# --------------------------------------------------------------------- #
+@dataclass(frozen=True, slots=True)
+class Revision:
+    base: str
+    number: int
+    modified: float                      # epoch seconds of the last write
+
+    @property
+    def tag(self) -> str:
+        return f"{self.base}.{self.number}"
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.tag}"'
+
+
+@dataclass(slots=True)
+class _Track:
+    base: str
+    signature: Signature                             # left by our last write
+    number: int = 0
+    modified: float = field(default_factory=time.time)
+    frames: Dict[str, int] = field(default_factory=dict)   # key → revision of its last write
+
+
+_lock = threading.Lock()
+_tracks: Dict[str, _Track] = {}
+
+
+# --------------------------------------------------------------------- #
+# Public API                                                            #
+# --------------------------------------------------------------------- #
+def current(slug: str, signature: Callable[[], Signature]) -> Revision:
+    """
+    Revision of *slug*.  *signature* (``(mtime, size)`` of the stored match)
+    tells whether the counter of this process still describes the data.
+    """
+    sig = signature()
+    with _lock:
+        t = _tracks.get(slug)
+        if t is not None and t.signature == sig:
+            return Revision(t.base, t.number, t.modified)
+    mtime, size = sig
+    return Revision(f"s{int(mtime * 1e6):x}-{size or 0:x}", 0, mtime)
+
+
+def record(
+    slug: str,
+    keys: Iterable[str],
+    before: Signature,
+    after: Signature,
+    reset: bool = False,
+) -> Revision:
+    """
+    Bump the revision of *slug* after writing *keys*, which moved the
+    storage signature from *before* to *after* (both taken under the
+    match lock).  ``reset=True`` (match re-created), or a *before* that is
+    not where our last write left the match (another process wrote in
+    between), starts a new base, so older tags never match again.
+    """
+    with _lock:
+        t = _tracks.get(slug)
+        if t is None or reset or t.signature != before:
+            t = _tracks[slug] = _Track(f"r{time.time_ns():x}", after)
+        t.number += 1
+        t.modified = time.time()
+        t.signature = after
+        for key in keys:
+            t.frames[key] = t.number
+        return Revision(t.base, t.number, t.modified)
+
+
+def resign(slug: str, before: Signature, after: Signature) -> None:
+    """The store rewrote *slug* without changing its data (compaction)."""
+    with _lock:
+        t = _tracks.get(slug)
+        if t is not None and t.signature == before:
+            t.signature = after
+
+
+def changed_since(slug: str, tag: str, signature: Callable[[], Signature]) -> Set[str] | None:
+    """
+    Keys written after revision *tag*; *None* when that cannot be told
+    (unknown match, other base, malformed tag, written by another process
+    since) and a full read is needed.
+    """
+    base, _, num = tag.strip().strip('"').rpartition(".")
+    sig = signature()
+    with _lock:
+        t = _tracks.get(slug)
+        if (t is None or t.signature != sig or base != t.base
+                or not num.isdigit() or int(num) > t.number):
+            return None
+        since = int(num)
+        return {k for k, n in t.frames.items() if n > since}
+
+
+__all__ = ["Revision", "Signature", "changed_since", "current", "record", "resign"]
@@ -0,0 +1,380 @@
+"""
+services/live_game_analysis/game_state/snapshot_log.py
+======================================================
+
+Append-only persistence for match timelines.
+
+Rewriting the whole ``game_state.json`` (``indent=4``) for every HUD
+snapshot made a late-game snapshot cost as much as the entire match so
+far.  Each match folder now holds two files:
+
+* ``game_state.json``        – the canonical, public document (unchanged
+  format); it is only rewritten by **compaction**;
+* ``game_state.log.jsonl``   – one JSON *delta* per line, appended in O(1):
+
+  ``{"op": "merge", "key": "12:34", "data": {…}}``  deep-merge into
+  ``live_game_info[key]``;
+  ``{"op": "set",   "key": "endGame", "data": …}``  replace that entry.
+
+Within the process every touched match keeps a **materialised view** (the
+canonical document with every delta applied), so readers never replay the
+log twice.  A daemon thread folds the log into ``game_state.json`` every
+``GAME_STATE_COMPACT_INTERVAL`` seconds (default 30), as soon as a log
+reaches ``GAME_STATE_COMPACT_EVERY`` deltas (default 200), and once more at
+interpreter exit.
+
+Several processes (``uvicorn --workers N``) may write the same match.
+Every operation holds the match's cross-process lock
+(``.game_state.lock``, see :mod:`atomic_io`) and first **catches up**: a
+view remembers how many log bytes it has applied and which
+``game_state.json`` it was built from, so it replays only the deltas other
+processes appended since, or reloads when another process compacted or
+re-created the match.  The canonical document is replaced atomically
+(unique temporary file + ``os.replace``).
+
+Both delta kinds are idempotent, so a crash between writing the compacted
+document and truncating the log only replays deltas that are already in
+it.  A torn last line (crash mid-append) is ignored and cut off by the
+next append.
+
+Public API
+----------
+``create(folder, document)``         – write a fresh canonical document
+``append(folder, op, key, data)``    – log + apply one delta
+``read(folder) -> dict``             – materialised document (a copy)
+``read_frames(folder, select) -> dict`` – copies of the selected ``live_game_info`` entries
+``exists(folder) -> bool`` / ``matches(root) -> list``
+``signature(folder) -> (mtime, size)``  – changes with every write
+``compact(folder)`` / ``compact_all()``
+``add_compact_listener(fn)``         – ``fn(folder, before, after)`` signatures
+``lock(folder)``                     – the match's cross-process lock
+``LOG_NAME`` / ``STATE_NAME``
+"""
+
+from __future__ import annotations
+
+import atexit
+import copy
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from .atomic_io import FileLock, atomic_write_text, lock_for
+
+# --------------------------------------------------------------------- #
+# Constants                                                             #
+# --------------------------------------------------------------------- #
+STATE_NAME = "game_state.json"
+LOG_NAME   = "game_state.log.jsonl"
+LOCK_NAME  = ".game_state.lock"
+
+_COMPACT_EVERY    = int(os.getenv("GAME_STATE_COMPACT_EVERY", 200))       # deltas
+_COMPACT_INTERVAL = float(os.getenv("GAME_STATE_COMPACT_INTERVAL", 30))   # seconds
+
+_OPS = ("merge", "set")
+
+
+# --------------------------------------------------------------------- #
+# Document helpers                                                      #
+# --------------------------------------------------------------------- #
+def _deep_merge(dst: Dict[str, Any], inc: Dict[str, Any]) -> Dict[str, Any]:
+    """Recursive dict merge – *inc* wins on scalar leaves."""
+    for k, v in inc.items():
+        dst[k] = _deep_merge(dst.get(k, {}), v) if isinstance(v, dict) else v
+    return dst
+
+
+def _apply(doc: Dict[str, Any], delta: Dict[str, Any]) -> None:
+    live = doc.setdefault("live_game_info", {})
+    key, data = delta["key"], delta["data"]
+    if delta["op"] == "merge":
+        live[key] = _deep_merge(live.get(key, {}), copy.deepcopy(data))
+    else:
+        live[key] = copy.deepcopy(data)
+
+
+def _replay(doc: Dict[str, Any], log: Path, offset: int = 0) -> Tuple[int, int]:
+    """
+    Apply the deltas of *log* from byte *offset* on; return how many were
+    applied and the offset after the last complete line.
+    """
+    try:
+        with open(log, "rb") as fh:
+            fh.seek(offset)
+            chunk = fh.read()
+    except FileNotFoundError:
+        return 0, 0
+    complete = chunk[: chunk.rfind(b"\n") + 1]
+    if len(complete) < len(chunk):                  # torn final append
+        print(f"⚠️  Ignoring truncated last delta in {log}")
+    n = 0
+    for line in complete.splitlines():
+        if line.strip():
+            _apply(doc, json.loads(line))
+            n += 1
+    return n, offset + len(complete)
+
+
+def _state_id(folder: Path) -> Tuple[int, int]:
+    """Identity of the current canonical file (replaced, never rewritten in place)."""
+    st = (folder / STATE_NAME).stat()
+    return st.st_ino, st.st_mtime_ns
+
+
+def _write_document(folder: Path, doc: Dict[str, Any]) -> None:
+    atomic_write_text(folder / STATE_NAME, json.dumps(doc, indent=4, ensure_ascii=False))
+
+
+# --------------------------------------------------------------------- #
+# Materialised views                                                    #
+# --------------------------------------------------------------------- #
+class _View:
+    __slots__ = ("folder", "doc", "pending", "offset", "state", "lock")
+
+    def __init__(self, folder: Path, lock: FileLock) -> None:
+        self.folder  = folder
+        self.lock    = lock                    # held for every access, see module docstring
+        self.doc: Dict[str, Any] = {}
+        self.pending = 0                       # deltas in the log, not yet compacted
+        self.offset  = 0                       # log bytes applied to `doc`
+        self.state: Tuple[int, int] | None = None
+
+    def reload(self) -> None:
+        fp = self.folder / STATE_NAME
+        if not fp.exists():
+            raise FileNotFoundError(f"{fp} does not exist.")
+        self.state = _state_id(self.folder)
+        self.doc = json.loads(fp.read_text(encoding="utf-8"))
+        self.pending, self.offset = _replay(self.doc, self.folder / LOG_NAME)
+
+    def sync(self) -> None:
+        """Catch up with writes made by other processes (lock held)."""
+        try:
+            current = _state_id(self.folder)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"{self.folder / STATE_NAME} does not exist.") from None
+        if current != self.state:
+            self.reload()                      # compacted / re-created elsewhere
+            return
+        n, self.offset = _replay(self.doc, self.folder / LOG_NAME, self.offset)
+        self.pending += n
+
+
+def _lock(folder: Path) -> FileLock:
+    return lock_for(folder / LOCK_NAME)
+
+
+_lock_views = threading.Lock()
+_views: Dict[Path, _View] = {}
+
+_wake = threading.Event()
+_compactor: threading.Thread | None = None
+
+# fn(folder, signature before, signature after) – compaction keeps the data, not the signature
+_compact_listeners: List[Callable[[Path, Tuple[float, int], Tuple[float, int]], None]] = []
+
+
+def _view(folder: Path) -> _View:
+    folder = folder.resolve()
+    v = _views.get(folder)
+    if v is not None:
+        return v
+    with _lock_views:
+        v = _views.get(folder)
+        if v is None:
+            if not (folder / STATE_NAME).exists():
+                raise FileNotFoundError(f"{folder / STATE_NAME} does not exist.")
+            v = _views[folder] = _View(folder, _lock(folder))
+    _ensure_compactor()
+    return v
+
+
+def _compact_view(v: _View) -> None:
+    with v.lock:
+        v.sync()
+        if not v.pending:
+            return
+        before = signature(v.folder)
+        _write_document(v.folder, v.doc)
+        # the document now contains every delta: start a fresh log
+        (v.folder / LOG_NAME).write_bytes(b"")
+        v.state, v.pending, v.offset = _state_id(v.folder), 0, 0
+        after = signature(v.folder)
+        for fn in list(_compact_listeners):
+            try:
+                fn(v.folder, before, after)
+            except Exception as exc:                # pragma: no cover
+                print(f"⚠️  Compaction listener failed ({v.folder.name}): {exc}")
+
+
+# --------------------------------------------------------------------- #
+# Background compaction                                                 #
+# --------------------------------------------------------------------- #
+def _compactor_loop() -> None:
+    while True:
+        _wake.wait(_COMPACT_INTERVAL)
+        _wake.clear()
+        try:
+            compact_all()
+        except Exception as exc:                    # pragma: no cover
+            print(f"⚠️  Game-state compaction failed: {exc}")
+
+
+def _ensure_compactor() -> None:
+    global _compactor
+    if _compactor is not None:
+        return
+    with _lock_views:
+        if _compactor is None:
+            _compactor = threading.Thread(target=_compactor_loop, name="game-state-compactor", daemon=True)
+            _compactor.start()
+            atexit.register(compact_all)
+
+
+# --------------------------------------------------------------------- #
+# Public API                                                            #
+# --------------------------------------------------------------------- #
+def exists(folder: Path) -> bool:
+    return (Path(folder) / STATE_NAME).is_file()
+
+
+def signature(folder: Path) -> Tuple[float, int]:
+    """Latest mtime and total size of the document and its log."""
+    mtime, size = 0.0, 0
+    for name in (STATE_NAME, LOG_NAME):
+        try:
+            st = (Path(folder) / name).stat()
+        except FileNotFoundError:
+            continue
+        mtime, size = max(mtime, st.st_mtime), size + st.st_size
+    return mtime, size
+
+
+def matches(root: Path) -> List[str]:
+    """Names of the sub-folders of *root* that hold a game-state document."""
+    return sorted(d.name for d in Path(root).iterdir() if d.is_dir() and exists(d))
+
+
+def lock(folder: Path) -> FileLock:
+    """
+    The cross-process lock of *folder*'s match, for read-modify-write
+    sequences spanning several calls (re-entrant: the calls take it again).
+    """
+    return _lock(Path(folder).resolve())
+
+
+def add_compact_listener(fn: Callable[[Path, Tuple[float, int], Tuple[float, int]], None]) -> None:
+    """
+    Call ``fn(folder, before, after)`` whenever compaction moves the
+    signature of *folder* without changing its document (lock held).
+    """
+    if fn not in _compact_listeners:
+        _compact_listeners.append(fn)
+
+
+def create(folder: Path, document: Dict[str, Any]) -> None:
+    """Write *document* as the canonical file and discard any previous log."""
+    folder = Path(folder).resolve()
+    folder.mkdir(parents=True, exist_ok=True)
+    v = _View(folder, _lock(folder))
+    with v.lock:
+        _write_document(folder, document)
+        (folder / LOG_NAME).unlink(missing_ok=True)
+        v.doc, v.state = copy.deepcopy(document), _state_id(folder)
+        with _lock_views:
+            _views[folder] = v
+    _ensure_compactor()
+
+
+def append(folder: Path, op: str, key: str, data: Any) -> None:
+    """Log one delta and apply it to the materialised view."""
+    if op not in _OPS:
+        raise ValueError(f"Unknown delta op '{op}'.")
+    v = _view(Path(folder))
+    delta = {"op": op, "key": key, "data": data}
+    line  = (json.dumps(delta, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+    with v.lock:
+        v.sync()
+        log = v.folder / LOG_NAME
+        with open(log, "ab") as fh:
+            if fh.tell() > v.offset:
+                fh.truncate(v.offset)           # cut a torn line left by a crash
+            fh.write(line)
+        _apply(v.doc, delta)
+        v.offset += len(line)
+        v.pending += 1
+        due = v.pending >= _COMPACT_EVERY
+    if due:
+        _wake.set()
+
+
+def read(folder: Path) -> Dict[str, Any]:
+    """
+    The current document of *folder* (a private copy).  Matches not yet
+    touched by this process are read from disk without being cached.
+    """
+    folder = Path(folder).resolve()
+    v = _views.get(folder)
+    if v is None:
+        v = _View(folder, _lock(folder))
+        with v.lock:                            # no compaction between document and log
+            v.reload()
+        return v.doc
+    with v.lock:
+        v.sync()
+        return copy.deepcopy(v.doc)
+
+
+def read_frames(folder: Path, select: Iterable[str] | Callable[[str], bool]) -> Dict[str, Any]:
+    """
+    ``{key: frame}`` copies of the ``live_game_info`` entries of *folder*
+    picked by *select* (keys, or a predicate on the key), in document
+    order.  Only those entries are copied: polling for a few new frames
+    does not pay for the whole match.
+    """
+    keep = select if callable(select) else set(select).__contains__
+    folder = Path(folder).resolve()
+    if folder not in _views:
+        live = read(folder).get("live_game_info", {})       # uncached: already a private copy
+        return {k: f for k, f in live.items() if keep(k)}
+    v = _views[folder]
+    with v.lock:
+        v.sync()
+        live = v.doc.get("live_game_info", {})
+        return {k: copy.deepcopy(f) for k, f in live.items() if keep(k)}
+
+
+def compact(folder: Path) -> None:
+    """Fold the log of *folder* into its canonical document now."""
+    v = _views.get(Path(folder).resolve())
+    if v is not None:
+        _compact_view(v)
+
+
+def compact_all() -> None:
+    for folder, v in list(_views.items()):
+        try:
+            _compact_view(v)
+        except FileNotFoundError:
+            # match folder deleted meanwhile: forget it
+            with _lock_views:
+                _views.pop(folder, None)
+
+
+__all__ = [
+    "LOCK_NAME",
+    "LOG_NAME",
+    "STATE_NAME",
+    "add_compact_listener",
+    "append",
+    "compact",
+    "compact_all",
+    "create",
+    "exists",
+    "lock",
+    "matches",
+    "read",
+    "signature",
+]
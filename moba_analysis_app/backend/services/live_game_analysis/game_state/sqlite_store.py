@@ -0,0 +1,597 @@
+"""
+services/live_game_analysis/game_state/sqlite_store.py
+======================================================
+
+SQLite storage backend for match timelines (``GAME_STATE_BACKEND=sqlite``).
+
+Loose ``game_state.json`` files force every query to read and parse whole
+matches.  This backend keeps the same documents in one database
+(``GAME_STATE_DB``, default *assets/db/game_state.sqlite*), normalised
+into:
+
+* ``matches``          – one row per match folder (``slug``), winner;
+* ``teams`` / ``draft``        – static draft info per team / role;
+* ``frames``           – one row per ``live_game_info`` key (``"MM:SS"``,
+  ``"startGame"``, ``"endGame"``, ``"winner"``) with its timer in seconds
+  and a JSON *skeleton* of whatever is not stored in the tables below;
+* ``team_snapshots``   – per (match, frame, team) ``TeamStats`` columns;
+* ``player_snapshots`` – per (match, frame, team, role) ``PlayerStats``
+  columns.
+
+Snapshot rows carry a ``mask`` of the keys that were present (a key set to
+``null`` is not the same as a missing key), an ``extra`` JSON object for
+keys outside the dataclasses and, when merges appended keys out of
+dataclass order, that ``key_order`` – so exporting a document gives back
+exactly what was stored, byte for byte.  Value columns are declared without a type: SQLite then
+keeps ints, floats and strings as given instead of coercing them.
+
+The database runs in WAL mode (readers never block the writer), every
+thread has its own connection, and snapshot merges run inside
+``BEGIN IMMEDIATE`` transactions.  Timers are indexed per match and across
+matches, so :func:`snapshot_range` and :func:`aggregate` are plain
+indexed SQL.
+
+The document-level functions mirror :mod:`snapshot_log` (same names and
+signatures, matches identified by their folder under *matches_history/*),
+so :mod:`game_state_service` can use either module unchanged.
+
+Public API
+----------
+``create(folder, document)`` / ``append(folder, op, key, data)``
+``read(folder) -> dict`` / ``exists(folder) -> bool`` / ``matches(root) -> list``
+``read_frames(folder, select) -> dict``          – selected ``live_game_info`` entries
+``signature(folder) -> (updated_at, None)``
+``compact(folder)`` / ``compact_all()``          – no-ops (nothing to fold)
+``add_compact_listener(fn)``                     – accepted, never called
+``lock(folder)``                                 – cross-process lock of a match
+``import_history(root) -> int`` / ``export_history(root) -> int``
+``snapshot_range(slug, start=None, end=None, *, team=None, role=None)``
+``aggregate(metric, how="avg", *, slugs=None, start=None, end=None, by=("team", "role"))``
+``DB_PATH``
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+from . import snapshot_log
+from .atomic_io import FileLock
+from .game_state import parse_timer
+
+# --------------------------------------------------------------------- #
+# Constants                                                             #
+# --------------------------------------------------------------------- #
+_BASE   = Path(__file__).resolve().parents[3]                   # …/backend
+DB_PATH = Path(os.getenv("GAME_STATE_DB", _BASE / "assets" / "db" / "game_state.sqlite"))
+
+_TEAMS = ("blue", "red")
+
+# column order == dataclass field order (PlayerStats / TeamStats)
+_PLAYER_FIELDS = ("health_pct", "mana_pct", "position", "kills", "deaths", "assists", "cs", "gold")
+_TEAM_FIELDS   = ("total_kills", "total_gold", "towers", "objectives")
+
+_METRICS = {f: "p" for f in _PLAYER_FIELDS if f != "position"} | {f: "t" for f in _TEAM_FIELDS}
+_AGGS    = ("avg", "min", "max", "sum", "count")
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS matches (
+    match_id   INTEGER PRIMARY KEY,
+    slug       TEXT NOT NULL UNIQUE,
+    winner     TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS teams (
+    match_id  INTEGER NOT NULL REFERENCES matches(match_id) ON DELETE CASCADE,
+    team      TEXT NOT NULL,
+    color     TEXT,
+    team_name TEXT,
+    PRIMARY KEY (match_id, team)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS draft (
+    match_id INTEGER NOT NULL REFERENCES matches(match_id) ON DELETE CASCADE,
+    team     TEXT NOT NULL,
+    role     TEXT NOT NULL,
+    champion TEXT,
+    PRIMARY KEY (match_id, team, role)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS frames (
+    match_id INTEGER NOT NULL REFERENCES matches(match_id) ON DELETE CASCADE,
+    frame    TEXT NOT NULL,
+    timer    INTEGER,                    -- seconds; NULL for startGame / endGame / winner
+    seq      INTEGER NOT NULL,           -- insertion order of the JSON keys
+    skeleton TEXT NOT NULL,
+    PRIMARY KEY (match_id, frame)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS team_snapshots (
+    match_id    INTEGER NOT NULL REFERENCES matches(match_id) ON DELETE CASCADE,
+    frame       TEXT NOT NULL,
+    timer       INTEGER,
+    team        TEXT NOT NULL,
+    has_players INTEGER NOT NULL,
+    has_stats   INTEGER NOT NULL,
+    {", ".join(_TEAM_FIELDS)},
+    mask        INTEGER NOT NULL,
+    extra       TEXT,
+    key_order   TEXT,
+    PRIMARY KEY (match_id, frame, team)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS player_snapshots (
+    match_id INTEGER NOT NULL REFERENCES matches(match_id) ON DELETE CASCADE,
+    frame    TEXT NOT NULL,
+    timer    INTEGER,
+    team     TEXT NOT NULL,
+    role     TEXT NOT NULL,
+    seq      INTEGER NOT NULL,
+    {", ".join(f for f in _PLAYER_FIELDS if f != "position")},
+    pos_x, pos_y,
+    mask     INTEGER NOT NULL,
+    extra    TEXT,
+    key_order TEXT,
+    PRIMARY KEY (match_id, frame, team, role)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_frames_timer  ON frames(match_id, timer);
+CREATE INDEX IF NOT EXISTS ix_team_timer    ON team_snapshots(match_id, timer);
+CREATE INDEX IF NOT EXISTS ix_player_timer  ON player_snapshots(match_id, timer);
+CREATE INDEX IF NOT EXISTS ix_player_xmatch ON player_snapshots(timer, team, role);
+"""
+
+# --------------------------------------------------------------------- #
+# Connection                                                            #
+# --------------------------------------------------------------------- #
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialised: set[Path] = set()
+
+
+def _conn() -> sqlite3.Connection:
+    """Per-thread autocommit connection (transactions are explicit)."""
+    conn = getattr(_local, "conn", None)
+    if conn is None or getattr(_local, "path", None) != DB_PATH:
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(DB_PATH, isolation_level=None, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        with _init_lock:
+            if DB_PATH not in _initialised:
+                conn.execute("PRAGMA journal_mode = WAL")
+                conn.executescript(_SCHEMA)
+                _initialised.add(DB_PATH)
+        _local.conn, _local.path = conn, DB_PATH
+    return conn
+
+
+class _Tx:
+    """``BEGIN IMMEDIATE`` … ``COMMIT`` / ``ROLLBACK`` on the thread's connection."""
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn = _conn()
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, *_: Any) -> None:
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+# --------------------------------------------------------------------- #
+# Document ⇄ rows                                                       #
+# --------------------------------------------------------------------- #
+def _split(
+    values: Dict[str, Any], fields: Sequence[str],
+) -> Tuple[List[Any], int, str | None, str | None]:
+    """
+    Dataclass-shaped dict → (column values, presence mask, extra JSON, key
+    order JSON).  The key order is only kept when merges appended fields
+    out of dataclass order.
+    """
+    cols, mask = [], 0
+    for bit, f in enumerate(fields):
+        if f in values:
+            mask |= 1 << bit
+        cols.append(values.get(f))
+    extra = {k: v for k, v in values.items() if k not in fields}
+    keys = list(values)
+    natural = [f for f in fields if f in values] + list(extra)
+    return (
+        cols,
+        mask,
+        json.dumps(extra, ensure_ascii=False) if extra else None,
+        json.dumps(keys, ensure_ascii=False) if keys != natural else None,
+    )
+
+
+def _join(
+    cols: Sequence[Any], mask: int, extra: str | None, key_order: str | None, fields: Sequence[str],
+) -> Dict[str, Any]:
+    out = {f: cols[bit] for bit, f in enumerate(fields) if mask >> bit & 1}
+    if extra:
+        out.update(json.loads(extra))
+    if key_order:
+        out = {k: out[k] for k in json.loads(key_order)}
+    return out
+
+
+def _is_table(obj: Any) -> bool:
+    """``players`` / ``stats`` go to the tables only when they are plain records."""
+    return isinstance(obj, dict) and all(isinstance(v, dict) for v in obj.values())
+
+
+def _write_frame(conn: sqlite3.Connection, mid: int, frame: str, seq: int, doc: Any) -> None:
+    timer = parse_timer(frame)
+    for table in ("frames", "team_snapshots", "player_snapshots"):
+        conn.execute(f"DELETE FROM {table} WHERE match_id = ? AND frame = ?", (mid, frame))
+
+    skeleton = copy.copy(doc) if isinstance(doc, dict) else doc
+    if isinstance(doc, dict):
+        for team in _TEAMS:
+            side = doc.get(team)
+            if not isinstance(side, dict):
+                continue
+            players, stats = side.get("players"), side.get("stats")
+            has_p = _is_table(players) if players is not None else False
+            has_s = isinstance(stats, dict)
+            if not (has_p or has_s):
+                continue
+            skeleton[team] = {k: v for k, v in side.items()
+                              if not (k == "players" and has_p) and not (k == "stats" and has_s)}
+
+            cols, mask, extra, order = _split(stats if has_s else {}, _TEAM_FIELDS)
+            conn.execute(
+                f"INSERT INTO team_snapshots VALUES ({', '.join('?' * (9 + len(_TEAM_FIELDS)))})",
+                (mid, frame, timer, team, int(has_p), int(has_s), *cols, mask, extra, order),
+            )
+            for i, (role, rec) in enumerate((players or {}).items() if has_p else ()):
+                cols, mask, extra, order = _split(rec, _PLAYER_FIELDS)
+                pos = cols.pop(2)
+                if pos is not None and not (isinstance(pos, list) and len(pos) == 2):
+                    # unusual position value: keep it verbatim in `extra`
+                    mask &= ~(1 << 2)
+                    extra = json.dumps({**json.loads(extra or "{}"), "position": pos}, ensure_ascii=False)
+                    order = json.dumps(list(rec), ensure_ascii=False)
+                    pos = None
+                px, py = pos if pos is not None else (None, None)
+                conn.execute(
+                    f"INSERT INTO player_snapshots VALUES ({', '.join('?' * (10 + len(_PLAYER_FIELDS)))})",
+                    (mid, frame, timer, team, role, i, *cols, px, py, mask, extra, order),
+                )
+
+    conn.execute(
+        "INSERT INTO frames VALUES (?, ?, ?, ?, ?)",
+        (mid, frame, timer, seq, json.dumps(skeleton, ensure_ascii=False)),
+    )
+
+
+def _read_frames(conn: sqlite3.Connection, mid: int, frame: str | None = None) -> Dict[str, Any]:
+    """``{frame: document}`` for one match (or one frame of it), in key order."""
+    where, args = ("match_id = ?", (mid,)) if frame is None else ("match_id = ? AND frame = ?", (mid, frame))
+    out: Dict[str, Any] = {
+        r["frame"]: json.loads(r["skeleton"])
+        for r in conn.execute(f"SELECT frame, skeleton FROM frames WHERE {where} ORDER BY seq", args)
+    }
+    for r in conn.execute(f"SELECT * FROM team_snapshots WHERE {where}", args):
+        side = out[r["frame"]].setdefault(r["team"], {})
+        if r["has_players"]:
+            side["players"] = {}
+        if r["has_stats"]:
+            cols = [r[f] for f in _TEAM_FIELDS]
+            side["stats"] = _join(cols, r["mask"], r["extra"], r["key_order"], _TEAM_FIELDS)
+    for r in conn.execute(f"SELECT * FROM player_snapshots WHERE {where} ORDER BY seq", args):
+        pos = [r["pos_x"], r["pos_y"]] if r["pos_x"] is not None else None
+        cols = [r[f] if f != "position" else pos for f in _PLAYER_FIELDS]
+        players = out[r["frame"]][r["team"]]["players"]
+        players[r["role"]] = _join(cols, r["mask"], r["extra"], r["key_order"], _PLAYER_FIELDS)
+
+    return out
+
+
+def _match_id(conn: sqlite3.Connection, slug: str) -> int | None:
+    row = conn.execute("SELECT match_id FROM matches WHERE slug = ?", (slug,)).fetchone()
+    return row[0] if row else None
+
+
+def _store_document(conn: sqlite3.Connection, slug: str, document: Dict[str, Any]) -> None:
+    conn.execute("DELETE FROM matches WHERE slug = ?", (slug,))
+    live = document.get("live_game_info", {})
+    winner = live.get("winner") if isinstance(live.get("winner"), str) else None
+    mid = conn.execute(
+        "INSERT INTO matches(slug, winner, updated_at) VALUES (?, ?, ?)", (slug, winner, time.time()),
+    ).lastrowid
+
+    for team in _TEAMS:
+        info = document.get("static_game_info", {}).get(team, {})
+        conn.execute(
+            "INSERT INTO teams VALUES (?, ?, ?, ?)",
+            (mid, team, info.get("color"), info.get("team_name")),
+        )
+        conn.executemany(
+            "INSERT INTO draft VALUES (?, ?, ?, ?)",
+            [(mid, team, role, champ) for role, champ in info.get("champions", {}).items()],
+        )
+    for seq, (frame, doc) in enumerate(live.items()):
+        _write_frame(conn, mid, frame, seq, doc)
+
+
+_ROLE_ORDER = ("TOP", "JUNGLE", "MID", "BOT", "SUPPORT")
+
+
+def _draft(conn: sqlite3.Connection, mid: int, team: str) -> Dict[str, Any]:
+    rows = {d["role"]: d["champion"] for d in conn.execute(
+        "SELECT role, champion FROM draft WHERE match_id = ? AND team = ?", (mid, team),
+    )}
+    ordered = {r: rows.pop(r) for r in _ROLE_ORDER if r in rows}
+    return {**ordered, **rows}
+
+
+def _load_document(conn: sqlite3.Connection, mid: int) -> Dict[str, Any]:
+    static: Dict[str, Any] = {}
+    for r in conn.execute("SELECT * FROM teams WHERE match_id = ? ORDER BY team = 'red'", (mid,)):
+        info: Dict[str, Any] = {}
+        if r["color"] is not None:
+            info["color"] = r["color"]
+        if r["team_name"] is not None:
+            info["team_name"] = r["team_name"]
+        info["champions"] = _draft(conn, mid, r["team"])
+        static[r["team"]] = info
+    return {"static_game_info": static, "live_game_info": _read_frames(conn, mid)}
+
+
+# --------------------------------------------------------------------- #
+# Document-level API (mirrors snapshot_log)                             #
+# --------------------------------------------------------------------- #
+def exists(folder: Path) -> bool:
+    return _match_id(_conn(), Path(folder).name) is not None
+
+
+def matches(root: Path) -> List[str]:
+    """Slugs of every stored match (*root* is accepted for symmetry)."""
+    return [r[0] for r in _conn().execute("SELECT slug FROM matches ORDER BY slug")]
+
+
+def signature(folder: Path) -> Tuple[float, None]:
+    """Time of the last write to the match (there is no per-match file size)."""
+    row = _conn().execute("SELECT updated_at FROM matches WHERE slug = ?", (Path(folder).name,)).fetchone()
+    return (row[0] if row else 0.0), None
+
+
+def create(folder: Path, document: Dict[str, Any]) -> None:
+    """Store *document* as match ``folder.name``, replacing any previous one."""
+    # visualisations still write to matches_history/<match>/results/
+    Path(folder).mkdir(parents=True, exist_ok=True)
+    with _Tx() as conn:
+        _store_document(conn, Path(folder).name, document)
+
+
+def append(folder: Path, op: str, key: str, data: Any) -> None:
+    """Deep-merge (``"merge"``) or replace (``"set"``) ``live_game_info[key]``."""
+    if op not in ("merge", "set"):
+        raise ValueError(f"Unknown delta op '{op}'.")
+    slug = Path(folder).name
+    with _Tx() as conn:
+        mid = _match_id(conn, slug)
+        if mid is None:
+            raise FileNotFoundError(f"Match '{slug}' is not stored.")
+        row = conn.execute(
+            "SELECT seq FROM frames WHERE match_id = ? AND frame = ?", (mid, key),
+        ).fetchone()
+        if row is None:
+            seq = conn.execute(
+                "SELECT COALESCE(MAX(seq) + 1, 0) FROM frames WHERE match_id = ?", (mid,),
+            ).fetchone()[0]
+            doc: Any = data
+        else:
+            seq = row[0]
+            doc = data
+            if op == "merge":
+                current = _read_frames(conn, mid, key)[key]
+                doc = snapshot_log._deep_merge(current if isinstance(current, dict) else {}, copy.deepcopy(data))
+        _write_frame(conn, mid, key, seq, doc)
+        if key == "winner":
+            conn.execute("UPDATE matches SET winner = ? WHERE match_id = ?",
+                         (doc if isinstance(doc, str) else None, mid))
+        conn.execute("UPDATE matches SET updated_at = ? WHERE match_id = ?", (time.time(), mid))
+
+
+def read(folder: Path) -> Dict[str, Any]:
+    conn = _conn()
+    mid = _match_id(conn, Path(folder).name)
+    if mid is None:
+        raise FileNotFoundError(f"Match '{Path(folder).name}' is not stored.")
+    conn.execute("BEGIN")                           # one consistent snapshot of the match
+    try:
+        return _load_document(conn, mid)
+    finally:
+        conn.execute("COMMIT")
+
+
+def read_frames(folder: Path, select: Iterable[str] | Callable[[str], bool]) -> Dict[str, Any]:
+    """Same as :func:`snapshot_log.read_frames`: only the selected frames are loaded."""
+    keep = select if callable(select) else set(select).__contains__
+    conn = _conn()
+    mid = _match_id(conn, Path(folder).name)
+    if mid is None:
+        raise FileNotFoundError(f"Match '{Path(folder).name}' is not stored.")
+    conn.execute("BEGIN")                           # one consistent snapshot of the match
+    try:
+        keys = [r["frame"] for r in conn.execute(
+            "SELECT frame FROM frames WHERE match_id = ? ORDER BY seq", (mid,)) if keep(r["frame"])]
+        out: Dict[str, Any] = {}
+        for key in keys:
+            out.update(_read_frames(conn, mid, key))
+        return out
+    finally:
+        conn.execute("COMMIT")
+
+
+def lock(folder: Path) -> FileLock:
+    """
+    Same per-match lock as :func:`snapshot_log.lock`: single statements are
+    serialised by SQLite, this covers read-modify-write sequences.
+    """
+    return snapshot_log.lock(folder)
+
+
+def add_compact_listener(fn: Callable[[Path, Tuple[float, None], Tuple[float, None]], None]) -> None:
+    """Accepted for symmetry with :mod:`snapshot_log`: signatures only move on writes here."""
+
+
+def compact(folder: Path) -> None:
+    """Nothing to fold: every write already lands in the tables."""
+
+
+def compact_all() -> None:
+    """Nothing to fold: every write already lands in the tables."""
+
+
+# --------------------------------------------------------------------- #
+# JSON import / export                                                  #
+# --------------------------------------------------------------------- #
+def import_history(root: Path) -> int:
+    """Store every ``<root>/<match>/game_state.json`` (log replayed); return the count."""
+    n = 0
+    for d in sorted(Path(root).iterdir()):
+        if d.is_dir() and snapshot_log.exists(d):
+            create(d, snapshot_log.read(d))
+            n += 1
+    return n
+
+
+def export_history(root: Path) -> int:
+    """Write every stored match as ``<root>/<slug>/game_state.json``; return the count."""
+    slugs = matches(Path(root))
+    for slug in slugs:
+        folder = Path(root) / slug
+        folder.mkdir(parents=True, exist_ok=True)
+        snapshot_log.create(folder, read(folder))
+    return len(slugs)
+
+
+# --------------------------------------------------------------------- #
+# Queries                                                               #
+# --------------------------------------------------------------------- #
+def _timer_clause(start: int | None, end: int | None, col: str = "timer") -> Tuple[str, List[Any]]:
+    sql, args = f" AND {col} IS NOT NULL", []
+    if start is not None:
+        sql += f" AND {col} >= ?"
+        args.append(int(start))
+    if end is not None:
+        sql += f" AND {col} <= ?"
+        args.append(int(end))
+    return sql, args
+
+
+def snapshot_range(
+    slug: str,
+    start: int | None = None,
+    end: int | None = None,
+    *,
+    team: str | None = None,
+    role: str | None = None,
+) -> List[Dict[str, Any]]:
+    """
+    Player rows of match *slug* with ``start <= timer <= end`` (seconds),
+    ordered by timer, team and role; optional *team* / *role* filters.
+    """
+    sql = (
+        "SELECT p.timer, p.frame, p.team, p.role, "
+        + ", ".join(f"p.{f}" for f in _PLAYER_FIELDS if f != "position")
+        + ", p.pos_x, p.pos_y FROM player_snapshots p JOIN matches m USING (match_id) "
+        "WHERE m.slug = ?"
+    )
+    clause, args = _timer_clause(start, end, "p.timer")
+    sql, args = sql + clause, [slug, *args]
+    for col, val in (("p.team", team), ("p.role", role)):
+        if val is not None:
+            sql += f" AND {col} = ?"
+            args.append(val)
+    sql += " ORDER BY p.timer, p.team, p.seq"
+    return [dict(r) for r in _conn().execute(sql, args)]
+
+
+def aggregate(
+    metric: str,
+    how: str = "avg",
+    *,
+    slugs: Iterable[str] | None = None,
+    start: int | None = None,
+    end: int | None = None,
+    by: Sequence[str] = ("team", "role"),
+) -> List[Dict[str, Any]]:
+    """
+    ``how`` (avg/min/max/sum/count) of *metric* across matches, grouped by
+    any of ``slug``, ``team``, ``role`` (player metrics only) and ``timer``.
+
+    ``aggregate("cs", "avg", start=600, end=600, by=("role",))`` → the mean
+    creep score per role at 10:00 over every stored match.
+    """
+    if metric not in _METRICS:
+        raise ValueError(f"Unknown metric '{metric}'; choose from {sorted(_METRICS)}.")
+    if how not in _AGGS:
+        raise ValueError(f"Unknown aggregate '{how}'; choose from {_AGGS}.")
+    table = "player_snapshots" if _METRICS[metric] == "p" else "team_snapshots"
+    allowed = {"slug": "m.slug", "team": "s.team", "timer": "s.timer"}
+    if table == "player_snapshots":
+        allowed["role"] = "s.role"
+    bad = [b for b in by if b not in allowed]
+    if bad:
+        raise ValueError(f"Cannot group {metric} by {bad}.")
+
+    cols = [f"{allowed[b]} AS {b}" for b in by]
+    sql = (
+        f"SELECT {', '.join(cols + [f'{how.upper()}(s.{metric}) AS value', 'COUNT(s.' + metric + ') AS n'])} "
+        f"FROM {table} s JOIN matches m USING (match_id) WHERE s.{metric} IS NOT NULL"
+    )
+    clause, args = _timer_clause(start, end, "s.timer")
+    sql += clause
+    if slugs is not None:
+        slugs = list(slugs)
+        sql += f" AND m.slug IN ({', '.join('?' * len(slugs))})"
+        args += slugs
+    if by:
+        sql += f" GROUP BY {', '.join(allowed[b] for b in by)} ORDER BY {', '.join(allowed[b] for b in by)}"
+    return [dict(r) for r in _conn().execute(sql, args)]
+
+
+# --------------------------------------------------------------------- #
+# CLI                                                                   #
+# --------------------------------------------------------------------- #
+def _main() -> None:
+    ap = argparse.ArgumentParser(description="Import / export game-state JSON ⇄ SQLite.")
+    ap.add_argument("action", choices=("import", "export"))
+    ap.add_argument("--root", type=Path, default=_BASE / "matches_history",
+                    help="matches_history folder (default: the backend's)")
+    args = ap.parse_args()
+
+    if args.action == "import":
+        print(f"✔ Imported {import_history(args.root)} match(es) into {DB_PATH}")
+    else:
+        print(f"✔ Exported {export_history(args.root)} match(es) to {args.root}")
+
+
+__all__ = [
+    "DB_PATH",
+    "add_compact_listener",
+    "aggregate",
+    "append",
+    "compact",
+    "compact_all",
+    "create",
+    "exists",
+    "export_history",
+    "import_history",
+    "lock",
+    "matches",
+    "read",
+    "signature",
+    "snapshot_range",
+]
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# services/live_game_analysis/main_game/hud_presence_service.py
+"""
+HUD-presence gate
+-----------------
+
+Broadcast VODs spend long stretches without the in-game HUD – replays,
+caster desk, draft, ads – and every one of those frames used to go through
+bar detection and the full HUD OCR for nothing.  :func:`detect_hud` is a
+cheap (~1 ms) classifier meant to run **before** those detectors.  It
+checks two fixed anchors of *main_overlay_rois.json*:
+
+1. **Minimap** (``mapRoi``) – the crop and the Summoner's Rift artwork
+   (*assets/images/Summoners_Rift_Map.png*) are shrunk to 48×48 grey
+   thumbnails and compared by normalised cross-correlation.  The live
+   minimap scores ~0.6 against the artwork; desk shots, drafts and ads stay
+   around 0.
+2. **Resource bars** (``team1/2ChampionsResourcesRoi``) – the share of
+   health-green pixels in the two side strips.  Checking both strips means
+   a fully dead team does not hide the HUD.
+
+The first anchor that fails gives the skip reason (``"no_minimap"``,
+``"no_resource_bars"``), so callers can keep per-reason metrics.
+
+Public API
+~~~~~~~~~~
+``detect_hud(frame, roi_template=None) -> HudCheck``
+``HudCheck``                 – verdict, skip reason and both anchor scores.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict
+
+import cv2
+import numpy as np
+
+from services.live_game_analysis.roi_compiler import get_roi_plan
+from services.live_game_analysis.main_game.resources_tracker.bars.health_detection_service import (
+    _LOWER_GREEN,
+    _UPPER_GREEN,
+)
+
+# --------------------------------------------------------------------- #
+# Paths & template                                                      #
+# --------------------------------------------------------------------- #
+_BACKEND_DIR  = Path(__file__).resolve().parents[3]
+_MAP_IMAGE    = _BACKEND_DIR / "assets" / "images" / "Summoners_Rift_Map.png"
+_ROI_TEMPLATE = "main_overlay_rois"
+
+_MAP_ROI  = "mapRoi"
+_BAR_ROIS = ("team1ChampionsResourcesRoi", "team2ChampionsResourcesRoi")
+
+# --------------------------------------------------------------------- #
+# Tunables                                                              #
+# --------------------------------------------------------------------- #
+_THUMB        = 48                     # px – side of the minimap thumbnails
+_MINIMAP_MIN  = 0.35                   # NCC   – live minimap ≈ 0.6, no HUD ≈ 0
+_BARS_MIN     = 0.01                   # ratio – green pixels in a side strip
+
+
+# --------------------------------------------------------------------- #
+# Result                                                                #
+# --------------------------------------------------------------------- #
+@dataclass(frozen=True)
+class HudCheck:
+    """Outcome of :func:`detect_hud`."""
+
+    present: bool
+    reason: str | None                 # first failed anchor, *None* when present
+    minimap: float                     # NCC against the minimap artwork
+    bars: float                        # green share of the fuller side strip
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "present": self.present,
+            "reason": self.reason,
+            "minimap": round(self.minimap, 3),
+            "bars": round(self.bars, 4),
+        }
+
+
+# --------------------------------------------------------------------- #
+# Anchors                                                               #
+# --------------------------------------------------------------------- #
+def _thumbnail(img: np.ndarray) -> np.ndarray:
+    """Zero-mean, unit-norm grey thumbnail (dot product = NCC)."""
+    small = cv2.resize(img, (_THUMB, _THUMB), interpolation=cv2.INTER_AREA)
+    grey  = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY).astype(np.float32)
+    grey -= grey.mean()
+    return grey / max(float(np.linalg.norm(grey)), 1e-6)
+
+
+@lru_cache(maxsize=1)
+def _map_reference() -> np.ndarray | None:
+    img = cv2.imread(str(_MAP_IMAGE))
+    if img is None:
+        print(f"⚠️  Minimap artwork not found ({_MAP_IMAGE}); HUD gate relies on the bars only.")
+        return None
+    return _thumbnail(img)
+
+
+def _minimap_score(crop: np.ndarray) -> float:
+    ref = _map_reference()
+    if ref is None or crop.size == 0:
+        return 1.0
+    return float((_thumbnail(crop) * ref).sum())
+
+
+def _bars_score(crop: np.ndarray) -> float:
+    if crop.size == 0:
+        return 0.0
+    hsv = cv2.cvtColor(crop, cv2.COLOR_BGR2HSV)
+    return cv2.countNonZero(cv2.inRange(hsv, _LOWER_GREEN, _UPPER_GREEN)) / (crop.shape[0] * crop.shape[1])
+
+
+# --------------------------------------------------------------------- #
+# Public classifier                                                     #
+# --------------------------------------------------------------------- #
+def detect_hud(
+    frame: np.ndarray,
+    roi_template: Dict[str, Any] | str | Path | None = None,
+) -> HudCheck:
+    """
+    Decide whether *frame* shows the in-game HUD.
+
+    Parameters
+    ----------
+    frame:
+        Full BGR broadcast frame.
+    roi_template:
+        Pre-parsed template dictionary, template name or JSON path; if *None*
+        the default *main_overlay_rois* plan is used.
+    """
+    if not isinstance(frame, np.ndarray):
+        raise TypeError("frame must be a numpy.ndarray")
+
+    fh, fw = frame.shape[:2]
+    plan = get_roi_plan(roi_template or _ROI_TEMPLATE, fw, fh)
+
+    minimap = _minimap_score(plan[_MAP_ROI].crop(frame))
+    if minimap < _MINIMAP_MIN:
+        return HudCheck(False, "no_minimap", minimap, 0.0)
+
+    bars = max(_bars_score(plan[key].crop(frame)) for key in _BAR_ROIS)
+    if bars < _BARS_MIN:
+        return HudCheck(False, "no_resource_bars", minimap, bars)
+
+    return HudCheck(True, None, minimap, bars)
+
+
+__all__ = ["HudCheck", "detect_hud"]
@@ -28,13 +28,14 @@ Public API
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
 import cv2
 import numpy as np
 
+from services.live_game_analysis.roi_compiler import get_roi_plan
+
 # --------------------------------------------------------------------- #
 # Paths & template                                                      #
 # --------------------------------------------------------------------- #
@@ -57,42 +58,10 @@ _ELONG_RATIO = 0.5                     # height/width ratio threshold
 
 _ROLE_ORDER = ["TOP", "JUNGLE", "MID", "BOT", "SUPPORT"]
 
-Coord = Tuple[float, float]
-
-
-# --------------------------------------------------------------------- #
-# Template helpers                                                      #
-# --------------------------------------------------------------------- #
-def _load_rois(custom: Path | None) -> tuple[dict[str, List[Coord]], tuple[int, int] | None]:
-    """Return ROIs as ``{"team1": [...], "team2": [...]}`` plus reference size."""
-    tpl_path = custom or _ROI_TEMPLATE
-    tpl = json.loads(Path(tpl_path).read_text(encoding="utf-8"))
-    return {
-        "team1": tpl["team1ChampionsResourcesRoi"],
-        "team2": tpl["team2ChampionsResourcesRoi"],
-    }, tpl.get("reference_size")
-
-
-def _scale_pts(
-    pts: List[Coord],
-    fw: int,
-    fh: int,
-    ref: tuple[int, int] | None,
-) -> List[Tuple[int, int]]:
-    """Normalised → absolute px, reference-based → scaled, absolute → unchanged."""
-    if all(0.0 <= x <= 1.0 and 0.0 <= y <= 1.0 for x, y in pts):
-        return [(int(x * fw), int(y * fh)) for x, y in pts]
-
-    if ref:
-        rw, rh = ref
-        return [(int(x * fw / rw), int(y * fh / rh)) for x, y in pts]
-
-    return [(int(x), int(y)) for x, y in pts]
-
-
-def _bbox(pts: List[Tuple[int, int]]) -> Tuple[int, int, int, int]:
-    xs, ys = zip(*pts)
-    return min(xs), min(ys), max(xs), max(ys)
+_TEAM_ROIS = {
+    "blue": "team1ChampionsResourcesRoi",
+    "red":  "team2ChampionsResourcesRoi",
+}
 
 
 # --------------------------------------------------------------------- #
@@ -115,7 +84,7 @@ def _green_runs(crop: np.ndarray) -> List[Tuple[int, int, int, int]]:
 # --------------------------------------------------------------------- #
 def detect_health_bars(
     frame: np.ndarray,
-    roi_template: Dict[str, Any] | None = None,
+    roi_template: Dict[str, Any] | str | Path | None = None,
 ) -> Dict[str, Dict[str, float | None]]:
     """
     Parameters
@@ -123,8 +92,9 @@ def detect_health_bars(
     frame:
         Full RGB/BGR broadcast frame.
     roi_template:
-        Pre-parsed template dictionary; if *None* the default JSON on disk is
-        loaded.
+        Pre-parsed template dictionary, template name or JSON path; if *None*
+        the default *main_overlay_rois* plan (compiled once per resolution)
+        is used.
 
     Returns
     -------
@@ -136,22 +106,13 @@ def detect_health_bars(
         raise TypeError("frame must be a numpy.ndarray")
 
     fh, fw = frame.shape[:2]
-    tpl, ref = (
-        _load_rois(Path(roi_template))            # type: ignore[arg-type]
-        if isinstance(roi_template, (str, Path))
-        else _load_rois(None)
-        if roi_template is None
-        else (roi_template, roi_template.get("reference_size"))
-    )
-
-    scaled = {k: _scale_pts(v, fw, fh, ref) for k, v in tpl.items()}
-    boxes = {k: _bbox(v) for k, v in scaled.items()}
+    plan = get_roi_plan(roi_template or _ROI_TEMPLATE, fw, fh)
 
     detected: Dict[str, List[Tuple[int, int, int, int]]] = {"blue": [], "red": []}
-    for idx, (k, (x0, y0, x1, y1)) in enumerate(boxes.items(), 1):
-        key = "blue" if idx == 1 else "red"
-        rects = _green_runs(frame[y0:y1, x0:x1])
-        detected[key] = [(x + x0, y + y0, w, h) for x, y, w, h in rects]
+    for team, key in _TEAM_ROIS.items():
+        box = plan[key]
+        rects = _green_runs(box.crop(frame))
+        detected[team] = [(x + box.x0, y + box.y0, w, h) for x, y, w, h in rects]
 
     out: Dict[str, Dict[str, float | None]] = {"blue": {}, "red": {}}
     for team in ("blue", "red"):
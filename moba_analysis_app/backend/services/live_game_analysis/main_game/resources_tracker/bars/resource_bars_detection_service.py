@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+# services/live_game_analysis/main_game/resources_tracker/bars/resource_bars_detection_service.py
+"""
+Fused health + mana bar detector
+--------------------------------
+
+Single-pass replacement for running :mod:`health_detection_service` and
+:mod:`mana_detection_service` back to back on the same frame.
+
+Both detectors crop the very same ``team1/2ChampionsResourcesRoi`` strips;
+this module visits each strip **once**:
+
+1. One BGR → HSV conversion per strip, shared by the *green* (health) and
+   *blue* (mana) thresholds – the ranges of the individual detectors.
+2. One OPEN→CLOSE morphology pass over the stacked two-channel mask.
+3. Bar widths come from the **column projection** of each blob rather than
+   its bounding-box width: every column counts in proportion to how lit it
+   is relative to the fullest column, and columns below half coverage are
+   ignored.  The result is sub-pixel and does not jump with a stray pixel
+   or an anti-aliased end cap.
+
+Blobs are still separated with ``findContours``: a pure row projection
+merges bars with the same-row portrait pixels that share their colour.
+
+Batch mode
+~~~~~~~~~~
+Every step above works on a *stack* of strips: the ``(N, H, W, 3)`` crops
+are laid out as one tall image with ``_SEP`` blank rows between strips, so
+HSV conversion, thresholding, morphology and contour search are one OpenCV
+call each for the whole batch, and the column projections of all bars are
+gathered from a single integral image.  A 3-row gap is enough for the 3×3
+OPEN→CLOSE never to bridge two strips.  The single-frame detector is the
+``N = 1`` case.
+
+Without a calibration, percentages follow the historical convention: the
+widest bar of each team is *100 %* and bars are assigned to roles
+top-to-bottom.  Passing a per-match :class:`BarCalibration` switches to
+fixed per-player slots and a cached full-bar width, so one dead player or
+a fully damaged team no longer skews the other readings.
+
+Public API
+~~~~~~~~~~
+``detect_resource_bars(frame: np.ndarray,
+                       roi_template: dict | None = None,
+                       calibration: BarCalibration | None = None) -> dict``
+``detect_resource_bars_batch(crops: np.ndarray) -> dict[str, np.ndarray]``
+``detect_health_bars_batch`` / ``detect_mana_bars_batch``
+``stack_team_strips(frames, team, roi_template=None) -> np.ndarray``
+``BarCalibration``                     – per-match slot / full-width cache.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from services.live_game_analysis.roi_compiler import get_roi_plan
+from services.live_game_analysis.main_game.resources_tracker.bars.health_detection_service import (
+    _LOWER_GREEN,
+    _UPPER_GREEN,
+)
+from services.live_game_analysis.main_game.resources_tracker.bars.mana_detection_service import (
+    _LOWER_BLUE,
+    _UPPER_BLUE,
+)
+
+# --------------------------------------------------------------------- #
+# Paths & template                                                      #
+# --------------------------------------------------------------------- #
+_ROI_TEMPLATE = "main_overlay_rois"
+
+_TEAM_ROIS = {
+    "blue": "team1ChampionsResourcesRoi",
+    "red":  "team2ChampionsResourcesRoi",
+}
+
+# --------------------------------------------------------------------- #
+# Tunables                                                              #
+# --------------------------------------------------------------------- #
+_AREA_MIN     = 300                    # px²   – minimum bar area
+_ELONG_RATIO  = 0.5                    # height/width ratio threshold
+_MIN_COL_COV  = 0.5                    # column coverage counted in the width
+
+_ROLE_ORDER = ["TOP", "JUNGLE", "MID", "BOT", "SUPPORT"]
+
+_SEP = 3                               # blank rows between stacked strips
+
+_FULL_FRAMES  = 25                     # strips sampled before the full width freezes
+_FULL_PCTL    = 80                     # percentile of per-strip widest bars taken as full
+_PITCH_TOL    = 0.25                   # slack (in slots) when fitting centres to the pitch
+
+_KERNEL = np.ones((3, 3), np.uint8)
+
+Bars = Tuple[np.ndarray, np.ndarray, np.ndarray]    # (strip, y_centre, width)
+_NO_BARS: Bars = (np.empty(0, np.intp), np.empty(0), np.empty(0))
+
+
+# --------------------------------------------------------------------- #
+# Colour classification                                                 #
+# --------------------------------------------------------------------- #
+def _classify(crops: np.ndarray) -> np.ndarray:
+    """
+    ``(N, H, W, 3)`` BGR strips → one tall ``(N·(H+_SEP), W, 2)`` cleaned
+    mask (channel 0 green, channel 1 blue) with blank rows between strips.
+    """
+    n, h, w = crops.shape[:3]
+    hsv = cv2.cvtColor(np.ascontiguousarray(crops).reshape(n * h, w, 3), cv2.COLOR_BGR2HSV)
+
+    mask = np.zeros((n, h + _SEP, w, 2), np.uint8)
+    mask[:, :h, :, 0] = cv2.inRange(hsv, _LOWER_GREEN, _UPPER_GREEN).reshape(n, h, w)
+    mask[:, :h, :, 1] = cv2.inRange(hsv, _LOWER_BLUE, _UPPER_BLUE).reshape(n, h, w)
+    mask = mask.reshape(n * (h + _SEP), w, 2)
+
+    # morphology runs once over both channels and every strip
+    mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN,  _KERNEL)
+    return cv2.morphologyEx(mask, cv2.MORPH_CLOSE, _KERNEL)
+
+
+# --------------------------------------------------------------------- #
+# Measurement                                                           #
+# --------------------------------------------------------------------- #
+def _measure(mask: np.ndarray, n: int) -> Bars:
+    """
+    Every bar found in a tall single-colour *mask* of *n* stacked strips.
+
+    Returns ``(strip, y_centre, width)`` arrays sorted by strip and then
+    top-to-bottom; ``y_centre`` is relative to the strip.
+    """
+    period = mask.shape[0] // n
+    cnts, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not cnts:
+        return _NO_BARS
+
+    area = np.array([cv2.contourArea(c) for c in cnts])
+    x, y, w, h = np.array([cv2.boundingRect(c) for c in cnts]).T
+    keep = (area > _AREA_MIN) & (h < _ELONG_RATIO * w)
+    if not keep.any():
+        return _NO_BARS
+    x, y, w, h = x[keep], y[keep], w[keep], h[keep]
+
+    # column projection of every bar at once, read off one integral image:
+    # band[i, c] = lit pixels of bar i's rows left of column c
+    cols = mask.shape[1]
+    ii = cv2.integral(mask)
+    band = ii[y + h] - ii[y]
+    span = x[:, None] + np.arange(w.max())
+    inside = span < (x + w)[:, None]
+    span = np.minimum(span, cols - 1)
+    proj = np.where(
+        inside,
+        np.take_along_axis(band, span + 1, axis=1) - np.take_along_axis(band, span, axis=1),
+        0,
+    )
+
+    # sub-pixel width: every column counts relative to the fullest one
+    cover = proj / proj.max(axis=1, keepdims=True)
+    widths = np.where(cover >= _MIN_COL_COV, cover, 0.0).sum(axis=1)
+
+    strip = y // period
+    order = np.lexsort((y, strip))
+    centre = (y + h / 2) - strip * period
+    return strip[order], centre[order], widths[order]
+
+
+def _by_rank(bars: Bars, n: int) -> np.ndarray:
+    """Legacy assignment: the k-th bar from the top of a strip is role *k*."""
+    strip, _, widths = bars
+    out = np.full((n, len(_ROLE_ORDER)), np.nan)
+    rank = np.arange(strip.size) - np.searchsorted(strip, strip)
+    sel = rank < len(_ROLE_ORDER)
+    out[strip[sel], rank[sel]] = widths[sel]
+    return out
+
+
+def _by_slot(bars: Bars, n: int, edges: np.ndarray) -> np.ndarray:
+    """Slot-anchored assignment: a bar belongs to the slot holding its centre."""
+    strip, centre, widths = bars
+    out = np.full((n, len(_ROLE_ORDER)), -np.inf)
+    slot = np.searchsorted(edges, centre, side="right") - 1
+    sel = (slot >= 0) & (slot < len(_ROLE_ORDER))
+    np.maximum.at(out, (strip[sel], slot[sel]), widths[sel])
+    out[np.isneginf(out)] = np.nan
+    return out
+
+
+def _to_percentages(widths: np.ndarray, full: float | None = None) -> np.ndarray:
+    """
+    Express *widths* relative to the calibrated *full* width or, without
+    one, to the widest bar of each row (*NaN* stays *NaN*).
+    """
+    if full:
+        with np.errstate(invalid="ignore"):
+            return np.round(np.minimum(widths / full, 1.0) * 100, 1)
+    ref = np.where(np.isnan(widths), -np.inf, widths).max(axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.round(widths / np.where(ref > 0, ref, np.nan) * 100, 1)
+
+
+# --------------------------------------------------------------------- #
+# Per-match calibration                                                 #
+# --------------------------------------------------------------------- #
+def _fit_slots(centre: np.ndarray, height: int) -> np.ndarray | None:
+    """
+    Slot edges from the bar centres of **one** strip, even a partial one.
+
+    The five slots share one pitch, roughly ``height / 5``: consecutive
+    centres are a whole number of pitches apart, which gives the measured
+    pitch, and the only placement of five slots that stays inside the
+    strip tells which slot each bar is in.  *None* when the centres do not
+    fit a regular layout or leave the placement ambiguous.
+    """
+    n_slots = len(_ROLE_ORDER)
+    if centre.size < 2:
+        return None
+    steps = np.diff(centre) / (height / n_slots)
+    k = np.rint(steps)
+    if np.any(k < 1) or np.any(np.abs(steps - k) > _PITCH_TOL):
+        return None
+    pitch = float((centre[-1] - centre[0]) / k.sum())
+    rel = np.concatenate(([0], np.cumsum(k))).astype(int)      # slots after the first bar
+    fits = [
+        first for first in range(n_slots - rel[-1])
+        if centre[0] - first * pitch >= 0
+        and centre[0] + (n_slots - 1 - first) * pitch <= height
+    ]
+    if len(fits) != 1:
+        return None
+    slots = centre[0] + (np.arange(n_slots) - fits[0]) * pitch
+    edges = np.concatenate(([slots[0] - pitch / 2], (slots[:-1] + slots[1:]) / 2, [slots[-1] + pitch / 2]))
+    return np.clip(edges, 0, height)
+
+
+@dataclass
+class _TeamCalibration:
+    shape: Tuple[int, int]                              # strip (height, width)
+    edges: np.ndarray | None = None                     # 6 slot edges (strip y)
+    samples: Dict[str, List[float]] = field(default_factory=lambda: {"health": [], "mana": []})
+    full: Dict[str, float] = field(default_factory=lambda: {"health": 0.0, "mana": 0.0})
+    frozen: Dict[str, bool] = field(default_factory=lambda: {"health": False, "mana": False})
+
+    def learn(self, bars: Dict[str, Bars]) -> None:
+        """Fix the slot layout on the first strip that pins it; sample the full widths."""
+        if self.edges is None:
+            strip, centre, _ = bars["health"]
+            for i in np.unique(strip):
+                self.edges = _fit_slots(centre[strip == i], self.shape[0])
+                if self.edges is not None:
+                    break
+        for kind, (strip, _, widths) in bars.items():
+            if self.frozen[kind] or not widths.size:
+                continue
+            # widest bar of every strip: at least one player is usually full
+            widest = np.full(strip.max() + 1, -np.inf)
+            np.maximum.at(widest, strip, widths)
+            samples = self.samples[kind]
+            samples.extend(widest[np.isfinite(widest)].tolist())
+            self.full[kind] = float(np.percentile(samples, _FULL_PCTL))
+            if len(samples) >= _FULL_FRAMES:
+                self.frozen[kind] = True
+                samples.clear()
+
+
+class BarCalibration:
+    """
+    Slot layout and full-bar widths of one match, learnt from its frames.
+
+    * **Slots** – the first frame whose health bars pin the layout fixes
+      five horizontal bands; from then on every bar is assigned to the
+      band holding its centre, so a dead player leaves only their own slot
+      empty instead of shifting everyone below.  Two bars are enough: the
+      slots share a known pitch (see :func:`_fit_slots`).
+    * **Full width** – the ``_FULL_PCTL``-th percentile of the widest bar
+      of each strip, frozen after ``_FULL_FRAMES`` strips.  One oversized
+      blob (ability glow, a neighbouring bar merged in) cannot inflate it,
+      and percentages no longer drift when the whole team is damaged.
+
+    Until a team's slots are known its bars fall back to top-to-bottom
+    order.  A different strip size (resolution change) restarts that team's
+    calibration.  Instances are shared across worker threads and lock
+    internally.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._teams: Dict[str, _TeamCalibration] = {}
+
+    def _update(
+        self, team: str, shape: Tuple[int, int], bars: Dict[str, Bars],
+    ) -> Tuple[np.ndarray | None, Dict[str, float]]:
+        with self._lock:
+            tc = self._teams.get(team)
+            if tc is None or tc.shape != shape:
+                tc = self._teams[team] = _TeamCalibration(shape)
+            tc.learn(bars)
+            return tc.edges, dict(tc.full)
+
+    def is_calibrated(self, team: str) -> bool:
+        """*True* once *team*'s slot layout has been fixed."""
+        with self._lock:
+            tc = self._teams.get(team)
+            return tc is not None and tc.edges is not None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._teams.clear()
+
+
+# --------------------------------------------------------------------- #
+# Public detectors                                                      #
+# --------------------------------------------------------------------- #
+def detect_resource_bars_batch(
+    crops: np.ndarray,
+    calibration: BarCalibration | None = None,
+    team: str = "blue",
+) -> Dict[str, np.ndarray]:
+    """
+    Batch variant for offline backfills.
+
+    Parameters
+    ----------
+    crops:
+        ``(N, H, W, 3)`` stack of the *same* team resources-ROI cropped from
+        N frames (see :func:`stack_team_strips`).
+    calibration:
+        Match calibration to learn from and measure against; *None* keeps
+        the per-frame widest-bar / top-to-bottom convention.
+    team:
+        Which team *crops* belong to (only used with *calibration*).
+
+    Returns
+    -------
+    dict
+        ``{"health": (N, 5), "mana": (N, 5)}`` float arrays of percentages
+        in role order; *NaN* marks a missing bar.
+    """
+    if not isinstance(crops, np.ndarray) or crops.ndim != 4 or crops.shape[-1] != 3:
+        raise TypeError("crops must be a numpy.ndarray of shape (N, H, W, 3)")
+
+    n = crops.shape[0]
+    if n == 0:
+        empty = np.empty((0, len(_ROLE_ORDER)))
+        return {"health": empty, "mana": empty.copy()}
+
+    mask = _classify(crops)
+    bars = {
+        kind: _measure(np.ascontiguousarray(mask[..., ch]), n)
+        for ch, kind in enumerate(("health", "mana"))
+    }
+    if calibration is None:
+        return {kind: _to_percentages(_by_rank(b, n)) for kind, b in bars.items()}
+
+    edges, full = calibration._update(team, crops.shape[1:3], bars)
+    return {
+        kind: _to_percentages(_by_rank(b, n) if edges is None else _by_slot(b, n, edges), full[kind])
+        for kind, b in bars.items()
+    }
+
+
+def detect_health_bars_batch(crops: np.ndarray, **kwargs: Any) -> np.ndarray:
+    """``(N, H, W, 3)`` team strips → ``(N, 5)`` health percentages."""
+    return detect_resource_bars_batch(crops, **kwargs)["health"]
+
+
+def detect_mana_bars_batch(crops: np.ndarray, **kwargs: Any) -> np.ndarray:
+    """``(N, H, W, 3)`` team strips → ``(N, 5)`` mana percentages."""
+    return detect_resource_bars_batch(crops, **kwargs)["mana"]
+
+
+def stack_team_strips(
+    frames: Sequence[np.ndarray],
+    team: str,
+    roi_template: Dict[str, Any] | str | Path | None = None,
+) -> np.ndarray:
+    """
+    Crop *team*'s (``"blue"`` / ``"red"``) resources-ROI from equally sized
+    *frames* and stack the crops into an ``(N, H, W, 3)`` array.
+    """
+    if not frames:
+        raise ValueError("frames must not be empty")
+    fh, fw = frames[0].shape[:2]
+    box = get_roi_plan(roi_template or _ROI_TEMPLATE, fw, fh)[_TEAM_ROIS[team]]
+    return np.stack([box.crop(f) for f in frames])
+
+
+def detect_resource_bars(
+    frame: np.ndarray,
+    roi_template: Dict[str, Any] | str | Path | None = None,
+    calibration: BarCalibration | None = None,
+) -> Dict[str, Dict[str, Dict[str, float | None]]]:
+    """
+    Parameters
+    ----------
+    frame:
+        Full BGR broadcast frame.
+    roi_template:
+        Pre-parsed template dictionary, template name or JSON path; if *None*
+        the default *main_overlay_rois* plan is used.
+    calibration:
+        Per-match :class:`BarCalibration`; enables slot-anchored roles and
+        percentages of the calibrated full width.
+
+    Returns
+    -------
+    dict
+        ``{"health": {"blue": {"TOP": 100.0, …}, "red": {…}},
+        "mana": {…}}`` – the same per-resource structure returned by
+        ``detect_health_bars`` / ``detect_mana_bars``.
+    """
+    if not isinstance(frame, np.ndarray):
+        raise TypeError("frame must be a numpy.ndarray")
+
+    fh, fw = frame.shape[:2]
+    plan = get_roi_plan(roi_template or _ROI_TEMPLATE, fw, fh)
+
+    out: Dict[str, Dict[str, Dict[str, float | None]]] = {"health": {}, "mana": {}}
+    for team, key in _TEAM_ROIS.items():
+        res = detect_resource_bars_batch(plan[key].crop(frame)[None], calibration, team)
+        for kind, pct in res.items():
+            out[kind][team] = {
+                role: None if np.isnan(v) else float(v)
+                for role, v in zip(_ROLE_ORDER, pct[0])
+            }
+    return out
+
+
+__all__ = [
+    "BarCalibration",
+    "detect_resource_bars",
+    "detect_resource_bars_batch",
+    "detect_health_bars_batch",
+    "detect_mana_bars_batch",
+    "stack_team_strips",
+]
@@ -20,15 +20,17 @@ backend/services/live_game_analysis/roi_templates/ocr_main_hud_rois.json
 """
 from __future__ import annotations
 
-import json
 import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Tuple
+from typing import Any, Callable, Collection, Dict, List, Tuple
 
 import cv2
 import numpy as np
 import pytesseract
 
+from services.live_game_analysis.roi_compiler import RoiPlan, get_roi_plan
+
 # ───────────────────── Paths ─────────────────────
 _BACKEND_DIR = Path(__file__).resolve().parents[5]
 _ROI_TEMPLATE = (
@@ -40,37 +42,26 @@ _ROI_TEMPLATE = (
 )
 
 # ─────────────────── Types ───────────────────────
-Coord      = Tuple[float, float]
 BinFun     = Callable[[np.ndarray], np.ndarray]
 ParseFun   = Callable[[str], Any]
 
 # ────────────── ROI helpers ──────────────────────
-def _load_rois(path: Path | None) -> Dict[str, Any]:
-    tpl_path = Path(path) if path else _ROI_TEMPLATE
-    return json.loads(tpl_path.read_text(encoding="utf-8"))
-
-
-def _scale_pts(
-    pts: List[Coord],
-    fw: int,
-    fh: int,
-    ref: Tuple[int, int] | None,
-) -> List[Tuple[int, int]]:
-    """Normalised → absolute, reference-based → scaled, absolute → unchanged."""
-    if ref:
-        rw, rh = ref
-        sx, sy = fw / rw, fh / rh
-        return [(int(x * sx), int(y * sy)) for x, y in pts]
-
-    if all(0.0 <= x <= 1.0 and 0.0 <= y <= 1.0 for x, y in pts):
-        return [(int(x * fw), int(y * fh)) for x, y in pts]
-
-    return [(int(x), int(y)) for x, y in pts]
+_CREEPS_PAD = 6          # px – creep-score boxes are tight, widen a little
 
 
-def _bbox(pts: List[Tuple[int, int]]) -> Tuple[int, int, int, int]:
-    xs, ys = zip(*pts)
-    return min(xs), min(ys), max(xs), max(ys)
+@lru_cache(maxsize=16)
+def _crop_plan(plan: RoiPlan) -> Tuple[Tuple[str, Tuple[slice, slice]], ...]:
+    """Per-key crop index for *plan*, creep boxes widened; computed once per plan."""
+    fw = plan.frame_size[0]
+    out: List[Tuple[str, Tuple[slice, slice]]] = []
+    for key, box in plan.items:
+        if key.endswith("creeps"):
+            ys, _ = box.index
+            xs = slice(max(0, box.x0 - _CREEPS_PAD), min(fw, box.x1 + _CREEPS_PAD))
+            out.append((key, (ys, xs)))
+        else:
+            out.append((key, box.index))
+    return tuple(out)
 
 # ────────────── Binarisers ───────────────────────
 def _bin_white(img: np.ndarray) -> np.ndarray:
@@ -127,6 +118,7 @@ def _rule_for(key: str) -> Tuple[BinFun, str, ParseFun]:
 def process_main_hud_stats(
     frame: np.ndarray,
     roi_template: Dict[str, Any] | None = None,
+    skip: Collection[str] = (),
 ) -> Dict[str, Dict[str, Any]]:
     """
     Extract every numeric/text field present in the main HUD.
@@ -136,7 +128,11 @@ def process_main_hud_stats(
     frame
         Broadcast frame in BGR.
     roi_template
-        Optional in-memory template; if *None*, the default JSON is used.
+        Optional in-memory template; if *None*, the default JSON is used
+        (compiled once per resolution and shared with the bar detectors).
+    skip
+        ROI keys that must not be OCR-ed (e.g. ``{"time"}`` when the worker
+        already knows the game timer); they are absent from the result.
 
     Returns
     -------
@@ -146,23 +142,15 @@ def process_main_hud_stats(
     if not isinstance(frame, np.ndarray):
         raise TypeError("frame must be a numpy.ndarray (BGR)")
 
-    tpl = roi_template or _load_rois(None)
-    ref = tpl.get("reference_size")
     fh, fw = frame.shape[:2]
+    plan = get_roi_plan(roi_template or _ROI_TEMPLATE, fw, fh)
 
     out: Dict[str, Dict[str, Any]] = {}
-    for key, pts in tpl.items():
-        if key == "reference_size":
+    for key, index in _crop_plan(plan):
+        if key in skip:
             continue
 
-        x0, y0, x1, y1 = _bbox(_scale_pts(pts, fw, fh, ref))
-
-        # Creep score boxes are tight – widen a little
-        if key.endswith("creeps"):
-            x0 = max(0, x0 - 6)
-            x1 = min(fw, x1 + 6)
-
-        crop = frame[y0:y1, x0:x1]
+        crop = frame[index]
 
         bin_fn, wl, parser = _rule_for(key)
         raw = _ocr(bin_fn(crop), wl)
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# services/live_game_analysis/main_game/resources_tracker/stats/timer_mapping_service.py
+"""
+Video-time → game-timer mapper
+------------------------------
+
+Once a handful of OCR reads of the HUD clock agree with each other, the
+in-game timer is a *piecewise-linear* function of the video position: it
+advances one second per second of footage and only jumps on pauses,
+replays or editing cuts.
+
+:class:`GameTimerMapper` fits that function incrementally so the worker
+can derive the snapshot key **without** running OCR on the ``time`` ROI.
+The clock is re-read only when
+
+* no confirmed segment covers the requested video position,
+* ``verify_every`` frames have been predicted since the last check, or
+* a discontinuity was observed (or signalled through
+  :meth:`GameTimerMapper.mark_cut`) and no trusted segment has agreed
+  with a later read yet.
+
+Every OCR read is fed back through :meth:`GameTimerMapper.observe`; a read
+that disagrees with the prediction by more than ``tolerance`` seconds opens
+a new segment, which in turn needs ``min_anchors`` consistent reads before
+it is trusted.
+
+Public API
+~~~~~~~~~~
+``GameTimerMapper``            – per-match mapper.
+``parse_timer(text) -> int``   – ``"MM:SS"`` → seconds.
+``format_timer(secs) -> str``  – seconds → ``"MM:SS"``.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+# --------------------------------------------------------------------- #
+# Tunables                                                              #
+# --------------------------------------------------------------------- #
+_MIN_ANCHORS   = 3        # consistent reads needed to trust a segment
+_VERIFY_EVERY  = 10       # predicted frames between two OCR checks
+_TOLERANCE_S   = 2.0      # max |prediction − OCR| before declaring a cut
+_MAX_GAP_S     = 90.0     # never extrapolate further than this from an anchor
+_MIN_SLOPE_SPAN = 30.0    # video span (s) required before fitting the slope
+_FIT_WINDOW    = 8        # most recent anchors used by the least-squares fit
+
+Anchor = Tuple[float, int]          # (video seconds, game seconds)
+
+
+# --------------------------------------------------------------------- #
+# Timer helpers                                                         #
+# --------------------------------------------------------------------- #
+def parse_timer(text: str) -> Optional[int]:
+    """``"12:34"`` → ``754``; *None* when *text* is not a ``MM:SS`` string."""
+    m = re.fullmatch(r"(\d{1,2}):(\d{2})", text.strip()) if isinstance(text, str) else None
+    return int(m[1]) * 60 + int(m[2]) if m else None
+
+
+def format_timer(secs: int) -> str:
+    """``754`` → ``"12:34"``."""
+    return f"{secs // 60:02d}:{secs % 60:02d}"
+
+
+# --------------------------------------------------------------------- #
+# Segment model                                                         #
+# --------------------------------------------------------------------- #
+@dataclass
+class _Segment:
+    """One continuous stretch of gameplay: ``game = slope · video + intercept``."""
+
+    anchors: List[Anchor] = field(default_factory=list)
+    slope: float = 1.0
+    intercept: float = 0.0
+
+    @property
+    def v_min(self) -> float:
+        return self.anchors[0][0]
+
+    @property
+    def v_max(self) -> float:
+        return self.anchors[-1][0]
+
+    def covers(self, video_t: float, max_gap: float) -> bool:
+        return self.v_min - max_gap <= video_t <= self.v_max + max_gap
+
+    def distance(self, video_t: float) -> float:
+        """Distance (video seconds) from *video_t* to the nearest anchor."""
+        return min(abs(v - video_t) for v, _ in self.anchors)
+
+    def predict(self, video_t: float) -> float:
+        return self.slope * video_t + self.intercept
+
+    def add(self, video_t: float, game_s: int) -> None:
+        self.anchors.append((video_t, game_s))
+        self.anchors.sort(key=lambda a: a[0])
+        self._refit()
+
+    def _refit(self) -> None:
+        """Least-squares line over the most recent anchors (slope 1 if too short)."""
+        pts = self.anchors[-_FIT_WINDOW:]
+        n = len(pts)
+        span = pts[-1][0] - pts[0][0]
+        slope = 1.0
+        if n >= 2 and span >= _MIN_SLOPE_SPAN:
+            mv = sum(v for v, _ in pts) / n
+            mg = sum(g for _, g in pts) / n
+            var = sum((v - mv) ** 2 for v, _ in pts)
+            slope = sum((v - mv) * (g - mg) for v, g in pts) / var
+        # The HUD floors the clock – shift by half a second to centre the fit
+        self.slope = slope
+        self.intercept = sum(g + 0.5 - slope * v for v, g in pts) / n
+
+
+# --------------------------------------------------------------------- #
+# Public mapper                                                         #
+# --------------------------------------------------------------------- #
+class GameTimerMapper:
+    """
+    Incremental, per-match mapping from video seconds to game seconds.
+
+    The object is not thread-safe; the worker only touches it from the
+    event-loop thread.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_anchors: int = _MIN_ANCHORS,
+        verify_every: int = _VERIFY_EVERY,
+        tolerance: float = _TOLERANCE_S,
+        max_gap: float = _MAX_GAP_S,
+    ) -> None:
+        self.min_anchors = min_anchors
+        self.verify_every = verify_every
+        self.tolerance = tolerance
+        self.max_gap = max_gap
+
+        self._segments: List[_Segment] = []
+        self._since_verify = 0
+        self._cut_pending = False
+
+    # ------------------------------------------------------------------ #
+    # Internal                                                           #
+    # ------------------------------------------------------------------ #
+    def _confirmed_for(self, video_t: float) -> Optional[_Segment]:
+        """Closest confirmed segment (by nearest anchor) covering *video_t*."""
+        cands = [
+            s for s in self._segments
+            if len(s.anchors) >= self.min_anchors and s.covers(video_t, self.max_gap)
+        ]
+        return min(cands, key=lambda s: s.distance(video_t), default=None)
+
+    # ------------------------------------------------------------------ #
+    # Public API                                                         #
+    # ------------------------------------------------------------------ #
+    def needs_ocr(self, video_t: float) -> bool:
+        """Return *True* when the caller should read the HUD clock for *video_t*."""
+        if self._cut_pending or self._since_verify >= self.verify_every:
+            return True
+        return self._confirmed_for(video_t) is None
+
+    def predict(self, video_t: float) -> Optional[int]:
+        """
+        Game seconds shown at *video_t*, or *None* if no confirmed segment
+        covers that position.  Each successful prediction counts towards the
+        next forced verification.
+        """
+        seg = self._confirmed_for(video_t)
+        if seg is None:
+            return None
+        secs = math.floor(seg.predict(video_t))
+        if secs < 0:
+            return None
+        self._since_verify += 1
+        return secs
+
+    def observe(self, video_t: float, game_s: int) -> bool:
+        """
+        Feed one OCR-confirmed read.
+
+        Returns *False* if the read contradicts every segment covering
+        *video_t* (pause, replay or cut detected) and therefore opened a new
+        one; *True* otherwise.
+        """
+        self._since_verify = 0
+
+        covering = sorted(
+            (s for s in self._segments if s.covers(video_t, self.max_gap)),
+            key=lambda s: (len(s.anchors) < self.min_anchors, s.distance(video_t)),
+        )
+        for seg in covering:
+            if abs(seg.predict(video_t) - (game_s + 0.5)) <= self.tolerance:
+                seg.add(video_t, game_s)
+                # keep verifying until the matching segment is trusted
+                self._cut_pending = len(seg.anchors) < self.min_anchors
+                return True
+
+        fresh = _Segment()
+        fresh.add(video_t, game_s)
+        self._segments.append(fresh)
+        self._cut_pending = True
+        return not covering
+
+    def mark_cut(self) -> None:
+        """Force OCR verification until a trusted segment agrees again (e.g. scene change)."""
+        self._cut_pending = True
+
+
+__all__ = ["GameTimerMapper", "parse_timer", "format_timer"]
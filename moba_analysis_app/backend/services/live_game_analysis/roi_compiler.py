@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# services/live_game_analysis/roi_compiler.py
+"""
+ROI compiler
+------------
+
+Turns the polygon templates stored in *roi_templates/*.json* into
+immutable, per-resolution **crop plans**: every ROI is reduced once to its
+bounding box and a ready-to-use ``(slice_y, slice_x)`` index, so detectors
+can crop with ``frame[plan[key].index]`` and nothing else.
+
+Plans are cached by ``(template file, frame width, frame height)`` and
+shared by every detector in the process.  A cached plan is reused until
+the template file's modification time changes, in which case it is
+transparently re-read and recompiled; steady-state frames therefore do no
+file I/O and no JSON parsing.
+
+Coordinate conventions (identical to the original per-detector helpers):
+
+* normalised  (all points in ``0 – 1``) → multiplied by the frame size;
+* reference   (``reference_size`` key)  → scaled to the frame size;
+* absolute    (anything else)           → used unchanged.
+
+Public API
+~~~~~~~~~~
+``get_roi_plan(template, frame_w, frame_h) -> RoiPlan``
+``load_template(template) -> dict``
+``ROI_ROOT``
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Tuple
+
+import numpy as np
+
+# --------------------------------------------------------------------- #
+# Paths                                                                 #
+# --------------------------------------------------------------------- #
+ROI_ROOT = Path(__file__).resolve().parent / "roi_templates"
+
+Coord = Tuple[float, float]
+TemplateRef = str | Path | Mapping[str, Any]
+
+
+# --------------------------------------------------------------------- #
+# Plan objects                                                          #
+# --------------------------------------------------------------------- #
+@dataclass(frozen=True)
+class RoiBox:
+    """Absolute, frame-clamped bounding box plus its numpy index."""
+
+    x0: int
+    y0: int
+    x1: int
+    y1: int
+    index: Tuple[slice, slice] = field(init=False, repr=False, compare=False, hash=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "index", (slice(self.y0, self.y1), slice(self.x0, self.x1)))
+
+    @property
+    def bbox(self) -> Tuple[int, int, int, int]:
+        return self.x0, self.y0, self.x1, self.y1
+
+    def crop(self, frame: np.ndarray) -> np.ndarray:
+        """Return the (view) sub-array of *frame* covered by this box."""
+        return frame[self.index]
+
+
+@dataclass(frozen=True)
+class RoiPlan:
+    """Every ROI of one template compiled for one frame resolution."""
+
+    template: str
+    frame_size: Tuple[int, int]                     # (width, height)
+    items: Tuple[Tuple[str, RoiBox], ...]
+    _lookup: Mapping[str, RoiBox] = field(init=False, repr=False, compare=False, hash=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_lookup", MappingProxyType(dict(self.items)))
+
+    def __getitem__(self, key: str) -> RoiBox:
+        return self._lookup[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._lookup
+
+    def keys(self) -> Tuple[str, ...]:
+        return tuple(k for k, _ in self.items)
+
+
+# --------------------------------------------------------------------- #
+# Compilation                                                           #
+# --------------------------------------------------------------------- #
+def _scale_pts(
+    pts: List[Coord],
+    fw: int,
+    fh: int,
+    ref: Tuple[int, int] | None,
+) -> List[Tuple[int, int]]:
+    """Normalised → absolute px, reference-based → scaled, absolute → unchanged."""
+    if all(0.0 <= x <= 1.0 and 0.0 <= y <= 1.0 for x, y in pts):
+        return [(int(x * fw), int(y * fh)) for x, y in pts]
+
+    if ref:
+        rw, rh = ref
+        return [(int(x * fw / rw), int(y * fh / rh)) for x, y in pts]
+
+    return [(int(x), int(y)) for x, y in pts]
+
+
+def _compile(name: str, tpl: Mapping[str, Any], fw: int, fh: int) -> RoiPlan:
+    ref = tpl.get("reference_size")
+    items: List[Tuple[str, RoiBox]] = []
+    for key, pts in tpl.items():
+        if key == "reference_size":
+            continue
+        xs, ys = zip(*_scale_pts(pts, fw, fh, ref))
+        items.append((key, RoiBox(
+            max(0, min(xs)), max(0, min(ys)),
+            min(fw, max(xs)), min(fh, max(ys)),
+        )))
+    return RoiPlan(name, (fw, fh), tuple(items))
+
+
+# --------------------------------------------------------------------- #
+# Cache                                                                 #
+# --------------------------------------------------------------------- #
+_lock = threading.Lock()
+_templates: Dict[Path, Tuple[int, Dict[str, Any]]] = {}           # path → (mtime, json)
+_plans: Dict[Tuple[Path, int, int], Tuple[int, RoiPlan]] = {}       # key  → (mtime, plan)
+
+
+def _resolve(template: str | Path) -> Path:
+    """``"main_overlay_rois"`` → *roi_templates/main_overlay_rois.json*; paths pass through."""
+    p = Path(template)
+    if p.suffix == "" and p.parent == Path("."):
+        p = ROI_ROOT / f"{p.name}.json"
+    return p.resolve()
+
+
+def _template_at(path: Path) -> Tuple[int, Dict[str, Any]]:
+    mtime = path.stat().st_mtime_ns
+    cached = _templates.get(path)
+    if cached and cached[0] == mtime:
+        return cached
+    entry = (mtime, json.loads(path.read_text(encoding="utf-8")))
+    with _lock:
+        _templates[path] = entry
+    return entry
+
+
+def load_template(template: str | Path) -> Dict[str, Any]:
+    """
+    Parsed JSON of *template* (name inside ``ROI_ROOT`` or explicit path),
+    re-read only when the file changes.  Treat the result as read-only.
+    """
+    return _template_at(_resolve(template))[1]
+
+
+def get_roi_plan(template: TemplateRef, frame_w: int, frame_h: int) -> RoiPlan:
+    """
+    Return the compiled :class:`RoiPlan` for *template* at ``frame_w × frame_h``.
+
+    *template* may be a template name (``"ocr_main_hud_rois"``), a path to a
+    JSON file, or an already-parsed mapping.  Mappings are compiled on the
+    fly (no file I/O involved); file-backed plans are cached.
+    """
+    if isinstance(template, Mapping):
+        return _compile("<inline>", template, frame_w, frame_h)
+
+    path = _resolve(template)
+    mtime, tpl = _template_at(path)
+    key = (path, frame_w, frame_h)
+    cached = _plans.get(key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    plan = _compile(path.stem, tpl, frame_w, frame_h)
+    with _lock:
+        _plans[key] = (mtime, plan)
+    return plan
+
+
+__all__ = ["ROI_ROOT", "RoiBox", "RoiPlan", "get_roi_plan", "load_template"]
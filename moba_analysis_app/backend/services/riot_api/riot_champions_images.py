@@ -24,8 +24,6 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any
 
-import requests
-
 from .riot_versions import get_latest_version
 
 # --------------------------------------------------------------------------- #
@@ -51,6 +49,8 @@ def _download(url: str, dest: Path) -> bool:
     if dest.exists():
         return False
 
+    import requests                      # deferred: only needed on the network path
+
     dest.parent.mkdir(parents=True, exist_ok=True)
     response = requests.get(url, timeout=15)
     response.raise_for_status()
@@ -72,6 +72,8 @@ def download_all_images(version: str) -> int:
     int
         Number of files newly downloaded.
     """
+    import requests
+
     meta_url = f"https://ddragon.leagueoflegends.com/cdn/{version}/data/en_US/champion.json"
     champs   = requests.get(meta_url, timeout=15).json()["data"]
 
@@ -22,21 +22,29 @@ Public helpers
 --------------
 * :func:`get_versions` – full list (newest first).
 * :func:`get_latest_version` – single call, always `version_id = 0`.
+* :func:`get_cached_latest_version` – same, from the local DB only (no network);
+  remembered until the DB file changes, so hot paths may call it freely.
+
+Every connection is closed on exit (``with sqlite3.connect(...)`` alone only
+commits).
 """
 
 from __future__ import annotations
 
 import sqlite3
+import threading
+from contextlib import closing
 from pathlib import Path
-from typing import List
-
-import requests
+from typing import List, Tuple
 
 # ─────────────────────────── Paths / constants ────────────────────────────
 _URL   = "https://ddragon.leagueoflegends.com/api/versions.json"
 _DB    = Path(__file__).resolve().parents[2] / "assets" / "db" / "moba_analysis.sqlite"
 _TABLE = "versions"
 
+_cached_lock = threading.Lock()
+_cached: Tuple[Tuple[int, int], str | None] | None = None     # ((mtime_ns, size), version)
+
 # ───────────────────────────── DB helpers ─────────────────────────────────
 def _create_table(conn: sqlite3.Connection) -> None:
     conn.execute(
@@ -53,7 +61,7 @@ def _upsert(versions: List[str]) -> int:
     Insert **all** versions keeping both columns unique & in-sync.
     Return the net amount of *new* rows.
     """
-    with sqlite3.connect(_DB) as conn:
+    with closing(sqlite3.connect(_DB)) as conn, conn:
         _create_table(conn)
 
         rows = [(idx, v) for idx, v in enumerate(versions)]
@@ -75,6 +83,8 @@ def fetch_versions() -> List[str]:
     Pull the *raw* JSON list from the Riot CDN (newest → oldest).  Network
     errors propagate as :class:`requests.HTTPError`.
     """
+    import requests                      # deferred: only needed on the network path
+
     r = requests.get(_URL, timeout=15)
     r.raise_for_status()
     return r.json()
@@ -87,7 +97,7 @@ def get_versions() -> List[str]:
     if inserted:
         print(f"✔ Versions inserted/updated: {inserted}")
 
-    with sqlite3.connect(_DB) as conn:
+    with closing(sqlite3.connect(_DB)) as conn, conn:
         conn.row_factory = sqlite3.Row
         rows = conn.execute(
             f"SELECT version FROM {_TABLE} ORDER BY version_id"
@@ -100,7 +110,7 @@ def get_latest_version() -> str:
     Convenience helper ⇒ value where ``version_id = 0`` (always the newest).
     """
     _upsert(fetch_versions())  # keep cache fresh
-    with sqlite3.connect(_DB) as conn:
+    with closing(sqlite3.connect(_DB)) as conn, conn:
         row = conn.execute(
             f"SELECT version FROM {_TABLE} WHERE version_id = 0"
         ).fetchone()
@@ -110,6 +120,37 @@ def get_latest_version() -> str:
 
     return row["version"]
 
+def get_cached_latest_version() -> str | None:
+    """
+    Newest patch already stored locally, **without** touching the network.
+    Returns *None* when the DB or the table does not exist yet.
+
+    The answer is kept until the DB file's modification time or size
+    changes, so repeated calls cost one ``stat`` instead of a connection.
+    """
+    global _cached
+    try:
+        st = _DB.stat()
+    except OSError:
+        return None
+    stamp = (st.st_mtime_ns, st.st_size)
+    hit = _cached
+    if hit is not None and hit[0] == stamp:
+        return hit[1]
+
+    with _cached_lock:
+        if _cached is not None and _cached[0] == stamp:
+            return _cached[1]
+        try:
+            with closing(sqlite3.connect(_DB)) as conn:
+                row = conn.execute(
+                    f"SELECT version FROM {_TABLE} WHERE version_id = 0"
+                ).fetchone()
+        except sqlite3.Error:
+            return None                 # not cached: the table may appear later
+        _cached = (stamp, row[0] if row else None)
+        return _cached[1]
+
 def save_versions(versions: List[str]) -> int:
     """
     Upsert an *already-downloaded* list of patch strings into the DB.
@@ -154,19 +154,32 @@ class _AnalysisHistoryScreenState extends State<AnalysisHistoryScreen> {
     }
 
     if (_selectedCategory == null || _selectedCategory == 'game_state') {
-      final jsonPretty =
-          const JsonEncoder.withIndent('  ').convert(matches[_selectedSlug]);
-      return Padding(
-        padding: const EdgeInsets.all(16),
-        child: Scrollbar(
-          thumbVisibility: true,
-          child: SingleChildScrollView(
-            child: SelectableText(
-              jsonPretty,
-              style: const TextStyle(fontFamily: 'RobotoMono', fontSize: 13),
+      // `matches` sólo trae resúmenes: el timeline se pide al seleccionar
+      return FutureBuilder<Map<String, dynamic>>(
+        key: ValueKey(_selectedSlug),
+        future: DBService.instance.getGameState(_selectedSlug!),
+        builder: (context, snap) {
+          if (snap.connectionState != ConnectionState.done) {
+            return const Center(child: CircularProgressIndicator());
+          }
+          if (snap.hasError) {
+            return Center(child: Text('❌ ${snap.error}'));
+          }
+          final jsonPretty =
+              const JsonEncoder.withIndent('  ').convert(snap.data);
+          return Padding(
+            padding: const EdgeInsets.all(16),
+            child: Scrollbar(
+              thumbVisibility: true,
+              child: SingleChildScrollView(
+                child: SelectableText(
+                  jsonPretty,
+                  style: const TextStyle(fontFamily: 'RobotoMono', fontSize: 13),
+                ),
+              ),
             ),
-          ),
-        ),
+          );
+        },
       );
     }
 
@@ -16,6 +16,7 @@ class DBService {
   final Map<String, List<Map<String, dynamic>>> _rowsCache = {};
   List<String>? _championNamesCache;
   Map<String, dynamic>? _allGameStatesCache;
+  final Map<String, Map<String, dynamic>> _gameStateCache = {};
 
   /* ─────────── tablas auxiliares ─────────── */
   Future<List<String>> getTableNames() async => _tables;
@@ -106,18 +107,44 @@ class DBService {
   }
 
   /* ─────────── game-state helpers ─────────── */
+  /// Resúmenes de todas las partidas (`slug → resumen`), página a página.
   Future<Map<String, dynamic>> getAllGameStates({bool forceRefresh = false}) async {
     if (!forceRefresh && _allGameStatesCache != null) {
       return _allGameStatesCache!;
     }
-    final res = await http.get(Uri.parse('$_apiBase/api/game_state/all'));
+    final states = <String, dynamic>{};
+    for (var page = 1;; page++) {
+      final res = await http.get(
+          Uri.parse('$_apiBase/api/game_state/all?page=$page&page_size=500'));
+      if (res.statusCode != 200) {
+        throw Exception('Backend ${res.statusCode}: ${res.body}');
+      }
+      final decoded = jsonDecode(res.body) as Map<String, dynamic>;
+      states.addAll(decoded['matches'] as Map<String, dynamic>);
+      if (states.length >= (decoded['total'] as int) ||
+          (decoded['matches'] as Map).isEmpty) break;
+    }
+    _allGameStatesCache = states;
+    _gameStateCache.clear();
+    return states;
+  }
+
+  /// Game state completo de una partida, pedido sólo al seleccionarla.
+  Future<Map<String, dynamic>> getGameState(String matchSlug,
+      {bool forceRefresh = false}) async {
+    if (!forceRefresh && _gameStateCache.containsKey(matchSlug)) {
+      return _gameStateCache[matchSlug]!;
+    }
+    final uri = Uri.parse(
+        '$_apiBase/api/game_state/${Uri.encodeComponent(matchSlug)}');
+    final res = await http.get(uri);
     if (res.statusCode != 200) {
       throw Exception('Backend ${res.statusCode}: ${res.body}');
     }
     final decoded = jsonDecode(res.body) as Map<String, dynamic>;
-    final states = decoded['matches'] as Map<String, dynamic>;
-    _allGameStatesCache = states;
-    return states;
+    final state = decoded['game_state'] as Map<String, dynamic>;
+    _gameStateCache[matchSlug] = state;
+    return state;
   }
 
   /* ─────────── análisis completo ─────────── */